@@ -27,8 +27,8 @@ PORTFOLIO_PROJECTS = [
         "status": "completed",
         "client": "StyleHub",
         "duration": "3 months",
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
     }
 ]
 
@@ -51,8 +51,8 @@ SERVICES_DATA = [
         "price": "$5000 - $50000",
         "active": True,
         "order": 1,
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
     }
 ]
 
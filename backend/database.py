@@ -1,9 +1,14 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from dotenv import load_dotenv
 import os
 import logging
 from pathlib import Path
 from urllib.parse import quote_plus
+from utils.dates import type_registry
+from utils.metrics import mongo_event_listeners
+from utils.slow_queries import SLOW_QUERY_LOG_ENABLED, slow_query_log
+from utils.tracing import configure_tracing
 
 # ---------------- LOGGING ----------------
 logging.basicConfig(level=logging.INFO)
@@ -46,12 +51,19 @@ def build_safe_mongo_uri(uri: str) -> str:
 SAFE_MONGODB_URI = build_safe_mongo_uri(MONGODB_URI)
 
 # ---------------- CONNECTION ----------------
+# Tracing registers its pymongo listener globally, so before the client exists
+configure_tracing()
+
 try:
     logger.info("🔗 Connecting to MongoDB...")
     client = AsyncIOMotorClient(
         SAFE_MONGODB_URI,
         serverSelectionTimeoutMS=5000,
         connectTimeoutMS=10000,
+        # Store datetime.date values as native BSON dates
+        type_registry=type_registry,
+        # Command latency and pool checkout wait metrics, slow-query log
+        event_listeners=mongo_event_listeners() + ([slow_query_log.listener] if SLOW_QUERY_LOG_ENABLED else []),
     )
     db = client[DB_NAME]
     logger.info(f"✅ MongoDB connected | DB: {DB_NAME}")
@@ -78,10 +90,128 @@ testimonials_collection = db["testimonials"]
 newsletter_collection = db["newsletter"]
 pricing_collection = db["pricing"]
 analytics_collection = db["analytics"]
+# Unique-visitor sketches and the daily visitor-id salts (utils/visitors.py)
+analytics_visitors_collection = db["analytics_visitors"]
+analytics_salts_collection = db["analytics_salts"]
+# Daily top pages / referrers / campaigns (utils/top_k.py)
+analytics_top_collection = db["analytics_top"]
+# Days of raw events written to archive files (utils/analytics_store.py)
+analytics_archives_collection = db["analytics_archives"]
+# Parquet export jobs (utils/parquet_export.py)
+exports_collection = db["exports"]
 clients_collection = db["clients"]
 client_projects_collection = db["client_projects"]
 bookings_collection = db["bookings"]
 booking_settings_collection = db["booking_settings"]
+rate_limits_collection = db["rate_limits"]
+
+# ---------------- INDEXES ----------------
+async def ensure_unique_index(collection, keys):
+    """
+    Create a unique index on keys (a field name or a list of (field,
+    direction) pairs). Earlier releases created some of these as plain
+    indexes, which is replaced. If existing data has duplicates the plain
+    index is kept and an error logged: the upserts relying on uniqueness
+    then may match either copy until
+    scripts/maintenance/dedupe_unique_keys.py has merged them.
+    """
+    key_spec = [(keys, 1)] if isinstance(keys, str) else list(keys)
+    try:
+        await collection.create_index(key_spec, unique=True)
+        return
+    except DuplicateKeyError:
+        pass
+    except OperationFailure as e:
+        if e.code not in (85, 86):  # IndexOptionsConflict, IndexKeySpecsConflict
+            raise
+        for name, info in (await collection.index_information()).items():
+            if list(info["key"]) == key_spec and not info.get("unique"):
+                await collection.drop_index(name)
+        try:
+            await collection.create_index(key_spec, unique=True)
+            return
+        except DuplicateKeyError:
+            pass
+    fields = ", ".join(field for field, _ in key_spec)
+    logger.error(
+        f"❌ Duplicate {collection.name} ({fields}) values; unique index not created and writes may update "
+        f"either copy. Run scripts/maintenance/dedupe_unique_keys.py"
+    )
+    await collection.create_index(key_spec)
+
+# Unique keys that single-round-trip upserts and find_one_and_update rely on
+UNIQUE_KEYS = [
+    (newsletter_collection, "email"),
+    (conversations_collection, "customer_email"),
+    (conversations_collection, "id"),
+    (contacts_collection, "id"),
+    (bookings_collection, "id"),
+    (settings_collection, "id"),
+    (content_collection, "id"),
+    (page_content_collection, [("page", 1), ("section", 1)]),
+    (blogs_collection, "slug"),
+]
+
+async def ensure_indexes():
+    """
+    Create the secondary indexes used by lookups and admin search.
+    create_index is idempotent, so this is safe to run on every startup.
+    """
+    await clients_collection.create_index("name")
+    await clients_collection.create_index("email")
+    await clients_collection.create_index("company")
+    await client_projects_collection.create_index("name")
+    await client_projects_collection.create_index("client_id")
+    await bookings_collection.create_index("name")
+    await bookings_collection.create_index("email")
+    await contacts_collection.create_index("name")
+    await contacts_collection.create_index("email")
+    await conversations_collection.create_index("customer_name")
+    for collection, keys in UNIQUE_KEYS:
+        await ensure_unique_index(collection, keys)
+    # Date-range queries (admin lists, dashboards, analytics windows)
+    await contacts_collection.create_index([("created_at", -1)])
+    await newsletter_collection.create_index([("created_at", -1)])
+    await clients_collection.create_index([("created_at", -1)])
+    await bookings_collection.create_index([("preferred_date", 1), ("status", 1)])
+    await bookings_collection.create_index([("created_at", -1)])
+    await conversations_collection.create_index([("last_message_at", -1)])
+    await client_projects_collection.create_index([("last_activity_at", -1)])
+    # analytics (raw events) indexes: utils/analytics_store.ensure_analytics_collection
+    await analytics_visitors_collection.create_index([("name", 1), ("day", 1)])
+    await analytics_visitors_collection.create_index([("day", 1)])
+    await analytics_top_collection.create_index([("name", 1), ("day", 1)])
+    # A salt is only useful on its own day; deleting it unlinks that day's visitor ids
+    await analytics_salts_collection.create_index("created_at", expireAfterSeconds=2 * 24 * 3600)
+    # Keyset pagination: default sort keys plus the id tie-breaker (utils/pagination.py)
+    await contacts_collection.create_index([("created_at", -1), ("id", -1)])
+    await newsletter_collection.create_index([("created_at", -1), ("id", -1)])
+    await clients_collection.create_index([("created_at", -1), ("id", -1)])
+    await bookings_collection.create_index([("created_at", -1), ("id", -1)])
+    await bookings_collection.create_index([("status", 1), ("preferred_date", 1), ("id", 1)])
+    await blogs_collection.create_index([("status", 1), ("created_at", -1), ("id", -1)])
+    await projects_collection.create_index([("created_at", -1), ("id", -1)])
+    await testimonials_collection.create_index([("status", 1), ("created_at", -1), ("id", -1)])
+    await testimonials_collection.create_index([("client_id", 1), ("created_at", -1), ("id", -1)])
+    await storage_collection.create_index([("created_at", -1), ("id", -1)])
+    await notes_collection.create_index([("updated_at", -1), ("id", -1)])
+    # Incremental sitemap/feed refresh (utils/site_feeds.py)
+    await blogs_collection.create_index([("updated_at", 1)])
+    await projects_collection.create_index([("updated_at", 1)])
+    await services_collection.create_index([("updated_at", 1)])
+    # Popularity sorts (utils/view_counters.py)
+    for field in ("views", "trending"):
+        await blogs_collection.create_index([("status", 1), (field, -1), ("id", -1)])
+        await projects_collection.create_index([(field, -1), ("id", -1)])
+    # One running Parquet export at a time, across workers
+    await ensure_unique_index(exports_collection, "id")
+    await exports_collection.create_index(
+        "status", unique=True, partialFilterExpression={"status": "running"}, name="one_running_export"
+    )
+    await exports_collection.create_index([("started_at", -1)])
+    # Shared rate-limit buckets expire once idle long enough to be full again
+    await rate_limits_collection.create_index("expires_at", expireAfterSeconds=0)
+    logger.info("✅ MongoDB indexes ensured")
 
 # ---------------- CLEAN SHUTDOWN ----------------
 async def close_db_connection():
@@ -0,0 +1,422 @@
+"""
+Pure ASGI middleware.
+
+These wrap the ASGI callable directly instead of going through
+BaseHTTPMiddleware, so there is no extra task or memory stream per request
+and streaming responses pass straight through.
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.metrics import HTTP_IN_PROGRESS, HTTP_REQUEST_DURATION, HTTP_REQUESTS, METRICS_ENABLED
+from utils.request_context import current_scope
+from utils.loop_monitor import BlockingCallError, loop_monitor
+from utils.profiling import (
+    PROFILING_ENABLED, RequestProfiler, new_profile_id, profile_store, requested_format, resolve_format
+)
+from datetime import datetime
+import asyncio
+import os
+import time
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", 1024))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", 4))
+COMPRESSION_ZSTD_LEVEL = int(os.environ.get("COMPRESSION_ZSTD_LEVEL", 3))
+
+# Content types worth compressing; images, archives and the like are skipped
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class ProxyHeaderMiddleware:
+    """Apply X-Forwarded-Proto / X-Forwarded-Host from the reverse proxy"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] in ("http", "websocket"):
+            headers = Headers(scope=scope)
+
+            forwarded_proto = headers.get("x-forwarded-proto")
+            if forwarded_proto:
+                scope["scheme"] = forwarded_proto
+
+            forwarded_host = headers.get("x-forwarded-host")
+            if forwarded_host:
+                scope["server"] = (forwarded_host, None)
+
+        await self.app(scope, receive, send)
+
+
+class RequestContextMiddleware:
+    """Exposes the request scope to code without a Request (utils/request_context.py)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Request count, latency and in-flight metrics. Requests are labelled by
+    the matched route template (e.g. /api/admin/client-projects/{project_id}),
+    never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, template).observe(elapsed)
+
+
+class LoopMonitorMiddleware:
+    """
+    Lets the event-loop monitor name the request that blocked the loop and,
+    in strict mode, fails requests that blocked it for too long.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not loop_monitor.running:
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        loop_monitor.track_request(task, scope)
+        if loop_monitor.strict is None:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                loop_monitor.finish_request(task)
+            return
+
+        # Strict mode holds the response back until the handler is done, so
+        # a request over the limit can still be turned into a 500
+        messages = []
+
+        async def hold(message: Message):
+            messages.append(message)
+
+        try:
+            await self.app(scope, receive, hold)
+        finally:
+            blocked = loop_monitor.finish_request(task)
+
+        if blocked is not None:
+            route = scope.get("route")
+            # Nothing has been sent, so Starlette's error middleware answers 500
+            raise BlockingCallError(
+                f"{scope['method']} {getattr(route, 'path', scope['path'])} blocked the event loop "
+                f"for {blocked * 1000:.0f}ms (limit {loop_monitor.strict * 1000:.0f}ms)"
+            )
+        for message in messages:
+            await send(message)
+
+
+class ProfilingMiddleware:
+    """
+    Runs a single request under a profiler when a super admin asks for it
+    (see utils/profiling.py). Unflagged requests only pay for a header scan.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # pyinstrument and cProfile both allow one active profiler per thread
+        self.busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        requested = requested_format(scope)
+        if requested is None:
+            await self.app(scope, receive, send)
+            return
+
+        admin = await self.authorize(scope)
+        if admin is None or self.busy:
+            # Not a super admin (or another profile is running): serve the
+            # request as if no flag was sent
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        profiler = RequestProfiler(resolve_format(requested))
+        status_code = 500
+
+        async def send_with_profile_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        self.busy = True
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            self.busy = False
+            route = scope.get("route")
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "admin": admin.get("username"),
+                "created_at": datetime.utcnow().isoformat()
+            }
+            await asyncio.to_thread(profile_store.save, profile_id, meta, profiler)
+
+    async def authorize(self, scope: Scope):
+        from fastapi import HTTPException
+        from auth.admin_auth import require_super_admin
+
+        try:
+            return await require_super_admin(Headers(scope=scope).get("authorization"))
+        except HTTPException:
+            return None
+
+
+class GzipEncoder:
+    def __init__(self):
+        self.compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Server preference when the client accepts several encodings equally
+ENCODERS = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+
+
+def negotiate_encoding(accept_encoding: str):
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in ENCODERS:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Negotiated zstd / brotli / gzip response compression.
+
+    Bodies below `minimum_size` are sent untouched. Streaming responses are
+    compressed chunk by chunk and flushed as they go, so clients still see
+    data as soon as the handler produces it.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Message = None
+        self.encoder = None
+        self.passthrough = False
+        self.started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the headers back until we know how big the body is
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            self.start_message = message
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(self.start_message)
+                await self.send(message)
+                self.passthrough = True
+                return
+
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                # The compressed representation is no longer byte-identical
+                headers["ETag"] = "W/" + headers["etag"]
+            self.encoder = ENCODERS[self.encoding]()
+
+            if not more_body:
+                compressed = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self.send(self.start_message)
+
+        if more_body:
+            chunk = self.encoder.compress(body) + self.encoder.flush()
+            if chunk:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+        else:
+            await self.send({
+                "type": "http.response.body",
+                "body": self.encoder.compress(body) + self.encoder.finish()
+            })
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 class Blog(BaseModel):
@@ -17,6 +17,15 @@ class Blog(BaseModel):
     seo_description: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Derived when the post is written (utils/blog_processing.py)
+    rendered_content: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    keywords: List[str] = []
+    related: List[Dict[str, Any]] = []
+    # Maintained by utils/view_counters.py
+    views: int = 0
+    trending: float = 0.0
     
     class Config:
         json_schema_extra = {
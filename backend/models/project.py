@@ -22,6 +22,9 @@ class Project(BaseModel):
     project_duration: Optional[str] = None
     team_size: Optional[str] = None
     key_features: Optional[List[str]] = []
+    # Maintained by utils/view_counters.py
+    views: int = 0
+    trending: float = 0.0
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
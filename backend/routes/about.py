@@ -39,7 +39,7 @@ async def update_about_content(
         
         # Prepare update data - properly handle nested objects
         content_dict = content.model_dump(exclude_unset=False)
-        content_dict['updated_at'] = datetime.utcnow().isoformat()
+        content_dict['updated_at'] = datetime.utcnow()
         content_dict['updated_by'] = current_admin['username']
         
         # Ensure values and achievements are properly formatted with unique IDs
@@ -204,6 +204,6 @@ def get_default_about_content() -> AboutContentResponse:
         cta_description="Let's collaborate to bring your vision to life. Get in touch today and let's build something amazing together.",
         cta_button_text="Get In Touch",
         cta_button_link="/contact",
-        updated_at=datetime.utcnow().isoformat(),
+        updated_at=datetime.utcnow(),
         updated_by="system"
     )
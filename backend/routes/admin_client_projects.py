@@ -1,11 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Query
 from typing import List
 from schemas.client_project import (
     ClientProjectCreate, ClientProjectUpdate, ClientProjectResponse, 
-    FileUploadResponse, ProjectFileResponse, MilestoneCreate, MilestoneUpdate,
+    FileUploadResponse, MilestoneCreate, MilestoneUpdate,
     MilestoneResponse, TaskCreate, TaskUpdate, TaskResponse, CommentCreate,
     CommentResponse, TeamMemberAdd, TeamMemberResponse, BudgetUpdate,
-    BudgetResponse, ActivityResponse, ChatMessageCreate, ChatMessageResponse
+    BudgetResponse, ChatMessageCreate, ChatMessageResponse
 )
 from database import client_projects_collection, clients_collection, admins_collection
 from auth.admin_auth import get_current_admin
@@ -13,7 +13,11 @@ from models.client_project import (
     ClientProject, ProjectFile, ProjectMilestone, ProjectTask,
     ProjectComment, ProjectActivity, TeamMember, Budget, ChatMessage
 )
+from utils.responses import trusted_response
+from utils.dates import to_iso, to_date_str
+from utils.tracing import traced
 from utils.currency_converter import get_all_currencies, convert_currency, format_currency, get_currency_info
+from utils.revenue_report import revenue_report
 from datetime import datetime
 import os
 import uuid
@@ -25,6 +29,7 @@ router = APIRouter(prefix="/admin/client-projects", tags=["admin-client-projects
 UPLOAD_DIR = "/app/backend/uploads/client_projects"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+@traced("client_projects.log_activity")
 def log_activity(project_id: str, action: str, description: str, user_id: str, user_name: str, metadata=None):
     """Helper function to log activity"""
     activity = ProjectActivity(
@@ -36,9 +41,13 @@ def log_activity(project_id: str, action: str, description: str, user_id: str, u
     )
     return activity.model_dump()
 
-def convert_project_to_response(project_doc) -> ClientProjectResponse:
-    """Helper function to convert project document to response"""
-    return ClientProjectResponse(
+@traced("client_projects.project_response_dict")
+def project_response_dict(project_doc) -> dict:
+    """
+    Project document as a plain dict shaped like ClientProjectResponse, for
+    trusted_response() or for validating with convert_project_to_response().
+    """
+    return dict(
         id=project_doc['id'],
         name=project_doc['name'],
         client_id=project_doc['client_id'],
@@ -46,88 +55,88 @@ def convert_project_to_response(project_doc) -> ClientProjectResponse:
         status=project_doc['status'],
         priority=project_doc.get('priority', 'medium'),
         progress=project_doc['progress'],
-        start_date=str(project_doc['start_date']) if project_doc.get('start_date') else None,
-        expected_delivery=str(project_doc['expected_delivery']) if project_doc.get('expected_delivery') else None,
-        actual_delivery=str(project_doc['actual_delivery']) if project_doc.get('actual_delivery') else None,
+        start_date=to_date_str(project_doc.get('start_date')),
+        expected_delivery=to_date_str(project_doc.get('expected_delivery')),
+        actual_delivery=to_date_str(project_doc.get('actual_delivery')),
         notes=project_doc.get('notes'),
         milestones=[
-            MilestoneResponse(
+            dict(
                 id=m['id'],
                 title=m['title'],
                 description=m.get('description'),
-                due_date=str(m['due_date']) if m.get('due_date') else None,
+                due_date=to_date_str(m.get('due_date')),
                 status=m['status'],
-                completion_date=m.get('completion_date'),
+                completion_date=to_iso(m.get('completion_date')),
                 order=m.get('order', 0),
-                created_at=m.get('created_at', datetime.utcnow().isoformat()) if isinstance(m.get('created_at'), str) else (m.get('created_at').isoformat() if m.get('created_at') else datetime.utcnow().isoformat())
+                created_at=to_iso(m.get('created_at') or datetime.utcnow())
             ) for m in project_doc.get('milestones', [])
         ],
         tasks=[
-            TaskResponse(
+            dict(
                 id=t['id'],
                 title=t['title'],
                 description=t.get('description'),
                 status=t['status'],
                 priority=t.get('priority', 'medium'),
                 assigned_to=t.get('assigned_to'),
-                due_date=str(t['due_date']) if t.get('due_date') else None,
-                completed_at=t.get('completed_at'),
+                due_date=to_date_str(t.get('due_date')),
+                completed_at=to_iso(t.get('completed_at')),
                 milestone_id=t.get('milestone_id'),
-                created_at=t.get('created_at', datetime.utcnow().isoformat()) if isinstance(t.get('created_at'), str) else (t.get('created_at').isoformat() if t.get('created_at') else datetime.utcnow().isoformat())
+                created_at=to_iso(t.get('created_at') or datetime.utcnow())
             ) for t in project_doc.get('tasks', [])
         ],
         files=[
-            ProjectFileResponse(
+            dict(
                 id=f['id'],
                 filename=f['filename'],
                 file_path=f.get('file_path', ''),
-                uploaded_at=f.get('uploaded_at', datetime.utcnow().isoformat()) if isinstance(f.get('uploaded_at'), str) else (f.get('uploaded_at').isoformat() if f.get('uploaded_at') else datetime.utcnow().isoformat()),
+                uploaded_at=to_iso(f.get('uploaded_at') or datetime.utcnow()),
                 uploaded_by=f.get('uploaded_by', 'system'),
                 file_size=f.get('file_size', 0),
                 file_type=f.get('file_type')
             ) for f in project_doc.get('files', [])
         ],
         comments=[
-            CommentResponse(
+            dict(
                 id=c['id'],
                 user_id=c['user_id'],
                 user_name=c['user_name'],
                 user_type=c['user_type'],
                 message=c['message'],
-                created_at=c['created_at'] if isinstance(c['created_at'], str) else c['created_at'].isoformat()
+                created_at=to_iso(c['created_at'])
             ) for c in project_doc.get('comments', [])
         ],
         chat_messages=[
-            ChatMessageResponse(
+            dict(
                 id=cm['id'],
                 sender_id=cm['sender_id'],
                 sender_name=cm['sender_name'],
                 sender_type=cm['sender_type'],
                 message=cm['message'],
                 read=cm.get('read', False),
-                created_at=cm['created_at'] if isinstance(cm['created_at'], str) else cm['created_at'].isoformat()
+                created_at=to_iso(cm['created_at'])
             ) for cm in project_doc.get('chat_messages', [])
         ],
         activity_log=[
-            ActivityResponse(
+            dict(
                 id=a['id'],
                 action=a['action'],
                 description=a['description'],
                 user_id=a['user_id'],
                 user_name=a['user_name'],
-                timestamp=a['timestamp'] if isinstance(a['timestamp'], str) else a['timestamp'].isoformat(),
+                timestamp=to_iso(a['timestamp']),
                 metadata=a.get('metadata')
             ) for a in project_doc.get('activity_log', [])
         ],
         team_members=[
-            TeamMemberResponse(
+            dict(
                 admin_id=tm['admin_id'],
                 admin_name=tm['admin_name'],
                 role=tm.get('role'),
-                added_at=tm['added_at'] if isinstance(tm['added_at'], str) else tm['added_at'].isoformat()
+                added_at=to_iso(tm['added_at'])
             ) for tm in project_doc.get('team_members', [])
         ],
-        budget=BudgetResponse(
+        budget=dict(
             total_amount=project_doc.get('budget', {}).get('total_amount', 0.0),
             currency=project_doc.get('budget', {}).get('currency', 'USD'),
             paid_amount=project_doc.get('budget', {}).get('paid_amount', 0.0),
@@ -135,18 +144,36 @@ def convert_project_to_response(project_doc) -> ClientProjectResponse:
             payment_terms=project_doc.get('budget', {}).get('payment_terms')
         ) if project_doc.get('budget') else None,
         tags=project_doc.get('tags', []),
-        created_at=project_doc['created_at'] if isinstance(project_doc['created_at'], str) else project_doc['created_at'].isoformat(),
-        updated_at=project_doc.get('updated_at'),
-        last_activity_at=project_doc.get('last_activity_at')
+        created_at=to_iso(project_doc['created_at']),
+        updated_at=to_iso(project_doc.get('updated_at')),
+        last_activity_at=to_iso(project_doc.get('last_activity_at'))
     )
 
+def convert_project_to_response(project_doc) -> ClientProjectResponse:
+    """Helper function to convert project document to a validated response"""
+    return ClientProjectResponse(**project_response_dict(project_doc))
+
 @router.get("/", response_model=List[ClientProjectResponse])
 async def get_all_projects(admin = Depends(get_current_admin)):
     """Get all client projects (Admin only)"""
     projects = []
     async for project_doc in client_projects_collection.find():
-        projects.append(convert_project_to_response(project_doc))
-    return projects
+        projects.append(project_response_dict(project_doc))
+    return trusted_response(projects)
+
+@router.get("/reports/revenue")
+async def get_revenue_report(
+    currency: str = Query("INR", description="Currency to report in"),
+    admin = Depends(get_current_admin)
+):
+    """Budget totals across all projects in one currency, by status, client, month and currency (Admin only)"""
+    currency = currency.upper()
+    if get_currency_info(currency) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown currency: {currency}"
+        )
+    return await revenue_report(currency)
 
 @router.get("/{project_id}", response_model=ClientProjectResponse)
 async def get_project(project_id: str, admin = Depends(get_current_admin)):
@@ -159,7 +186,7 @@ async def get_project(project_id: str, admin = Depends(get_current_admin)):
             detail="Project not found"
         )
     
-    return convert_project_to_response(project_doc)
+    return trusted_response(project_response_dict(project_doc))
 
 @router.post("/", response_model=ClientProjectResponse)
 async def create_project(project_data: ClientProjectCreate, admin = Depends(get_current_admin)):
@@ -199,18 +226,6 @@ async def create_project(project_data: ClientProjectCreate, admin = Depends(get_
     project.last_activity_at = datetime.utcnow()
     
     project_dict = project.model_dump()
-    project_dict['created_at'] = project_dict['created_at'].isoformat()
-    project_dict['last_activity_at'] = project_dict['last_activity_at'].isoformat()
-    if project_dict['start_date']:
-        project_dict['start_date'] = project_dict['start_date'].isoformat()
-    if project_dict['expected_delivery']:
-        project_dict['expected_delivery'] = project_dict['expected_delivery'].isoformat()
-    
-    # Convert nested objects
-    project_dict['activity_log'] = [
-        {**a, 'timestamp': a['timestamp'].isoformat() if isinstance(a['timestamp'], datetime) else a['timestamp']}
-        for a in project_dict['activity_log']
-    ]
     
     await client_projects_collection.insert_one(project_dict)
     
@@ -263,15 +278,15 @@ async def update_project(project_id: str, project_data: ClientProjectUpdate, adm
         changes.append(f"Progress updated to {project_data.progress}%")
     
     if project_data.start_date is not None:
-        update_data['start_date'] = project_data.start_date.isoformat()
+        update_data['start_date'] = project_data.start_date
         changes.append("Start date updated")
     
     if project_data.expected_delivery is not None:
-        update_data['expected_delivery'] = project_data.expected_delivery.isoformat()
+        update_data['expected_delivery'] = project_data.expected_delivery
         changes.append("Expected delivery date updated")
     
     if project_data.actual_delivery is not None:
-        update_data['actual_delivery'] = project_data.actual_delivery.isoformat()
+        update_data['actual_delivery'] = project_data.actual_delivery
         changes.append("Actual delivery date set")
     
     if project_data.notes is not None:
@@ -282,8 +297,8 @@ async def update_project(project_id: str, project_data: ClientProjectUpdate, adm
         update_data['tags'] = project_data.tags
         changes.append("Tags updated")
     
-    update_data['updated_at'] = datetime.utcnow().isoformat()
-    update_data['last_activity_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
+    update_data['last_activity_at'] = datetime.utcnow()
     
     # Add activity log
     if changes:
@@ -294,7 +309,6 @@ async def update_project(project_id: str, project_data: ClientProjectUpdate, adm
             admin["id"],
             admin.get("username", "Admin")
         )
-        activity['timestamp'] = activity['timestamp'].isoformat()
         await client_projects_collection.update_one(
             {"id": project_id},
             {"$push": {"activity_log": activity}}
@@ -346,9 +360,6 @@ async def add_milestone(project_id: str, milestone_data: MilestoneCreate, admin
     
     milestone = ProjectMilestone(**milestone_data.model_dump())
     milestone_dict = milestone.model_dump()
-    milestone_dict['created_at'] = milestone_dict['created_at'].isoformat()
-    if milestone_dict.get('due_date'):
-        milestone_dict['due_date'] = milestone_dict['due_date'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -358,7 +369,6 @@ async def add_milestone(project_id: str, milestone_data: MilestoneCreate, admin
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -367,7 +377,7 @@ async def add_milestone(project_id: str, milestone_data: MilestoneCreate, admin
                 "milestones": milestone_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -397,11 +407,11 @@ async def update_milestone(
             if milestone_data.description is not None:
                 milestones[idx]['description'] = milestone_data.description
             if milestone_data.due_date is not None:
-                milestones[idx]['due_date'] = milestone_data.due_date.isoformat()
+                milestones[idx]['due_date'] = milestone_data.due_date
             if milestone_data.status is not None:
                 milestones[idx]['status'] = milestone_data.status
                 if milestone_data.status == "completed":
-                    milestones[idx]['completion_date'] = datetime.utcnow().isoformat()
+                    milestones[idx]['completion_date'] = datetime.utcnow()
             if milestone_data.order is not None:
                 milestones[idx]['order'] = milestone_data.order
             break
@@ -417,14 +427,13 @@ async def update_milestone(
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
         {
             "$set": {
                 "milestones": milestones,
-                "last_activity_at": datetime.utcnow().isoformat()
+                "last_activity_at": datetime.utcnow()
             },
             "$push": {"activity_log": activity}
         }
@@ -444,14 +453,13 @@ async def delete_milestone(project_id: str, milestone_id: str, admin = Depends(g
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     result = await client_projects_collection.update_one(
         {"id": project_id},
         {
             "$pull": {"milestones": {"id": milestone_id}},
             "$push": {"activity_log": activity},
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -473,9 +481,6 @@ async def add_task(project_id: str, task_data: TaskCreate, admin = Depends(get_c
     
     task = ProjectTask(**task_data.model_dump())
     task_dict = task.model_dump()
-    task_dict['created_at'] = task_dict['created_at'].isoformat()
-    if task_dict.get('due_date'):
-        task_dict['due_date'] = task_dict['due_date'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -485,7 +490,6 @@ async def add_task(project_id: str, task_data: TaskCreate, admin = Depends(get_c
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -494,7 +498,7 @@ async def add_task(project_id: str, task_data: TaskCreate, admin = Depends(get_c
                 "tasks": task_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -525,13 +529,13 @@ async def update_task(
             if task_data.status is not None:
                 tasks[idx]['status'] = task_data.status
                 if task_data.status == "completed":
-                    tasks[idx]['completed_at'] = datetime.utcnow().isoformat()
+                    tasks[idx]['completed_at'] = datetime.utcnow()
             if task_data.priority is not None:
                 tasks[idx]['priority'] = task_data.priority
             if task_data.assigned_to is not None:
                 tasks[idx]['assigned_to'] = task_data.assigned_to
             if task_data.due_date is not None:
-                tasks[idx]['due_date'] = task_data.due_date.isoformat()
+                tasks[idx]['due_date'] = task_data.due_date
             if task_data.milestone_id is not None:
                 tasks[idx]['milestone_id'] = task_data.milestone_id
             break
@@ -547,14 +551,13 @@ async def update_task(
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
         {
             "$set": {
                 "tasks": tasks,
-                "last_activity_at": datetime.utcnow().isoformat()
+                "last_activity_at": datetime.utcnow()
             },
             "$push": {"activity_log": activity}
         }
@@ -572,14 +575,13 @@ async def delete_task(project_id: str, task_id: str, admin = Depends(get_current
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     result = await client_projects_collection.update_one(
         {"id": project_id},
         {
             "$pull": {"tasks": {"id": task_id}},
             "$push": {"activity_log": activity},
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -607,7 +609,6 @@ async def add_comment(project_id: str, comment_data: CommentCreate, admin = Depe
     )
     
     comment_dict = comment.model_dump()
-    comment_dict['created_at'] = comment_dict['created_at'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -617,7 +618,6 @@ async def add_comment(project_id: str, comment_data: CommentCreate, admin = Depe
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -626,7 +626,7 @@ async def add_comment(project_id: str, comment_data: CommentCreate, admin = Depe
                 "comments": comment_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -639,7 +639,7 @@ async def delete_comment(project_id: str, comment_id: str, admin = Depends(get_c
         {"id": project_id},
         {
             "$pull": {"comments": {"id": comment_id}},
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -661,7 +661,6 @@ async def add_team_member(project_id: str, member_data: TeamMemberAdd, admin = D
     
     member = TeamMember(**member_data.model_dump())
     member_dict = member.model_dump()
-    member_dict['added_at'] = member_dict['added_at'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -671,7 +670,6 @@ async def add_team_member(project_id: str, member_data: TeamMemberAdd, admin = D
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -680,7 +678,7 @@ async def add_team_member(project_id: str, member_data: TeamMemberAdd, admin = D
                 "team_members": member_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -693,7 +691,7 @@ async def remove_team_member(project_id: str, admin_id: str, admin = Depends(get
         {"id": project_id},
         {
             "$pull": {"team_members": {"admin_id": admin_id}},
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -738,14 +736,13 @@ async def update_budget(project_id: str, budget_data: BudgetUpdate, admin = Depe
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
         {
             "$set": {
                 "budget": current_budget,
-                "last_activity_at": datetime.utcnow().isoformat()
+                "last_activity_at": datetime.utcnow()
             },
             "$push": {"activity_log": activity}
         }
@@ -805,7 +802,6 @@ async def upload_project_file(
     )
     
     file_dict = project_file.model_dump()
-    file_dict['uploaded_at'] = file_dict['uploaded_at'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -815,7 +811,6 @@ async def upload_project_file(
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     # Add file to project
     await client_projects_collection.update_one(
@@ -825,7 +820,7 @@ async def upload_project_file(
                 "files": file_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -881,7 +876,6 @@ async def delete_project_file(
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     # Remove file from project
     await client_projects_collection.update_one(
@@ -889,7 +883,7 @@ async def delete_project_file(
         {
             "$pull": {"files": {"id": file_id}},
             "$push": {"activity_log": activity},
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -915,7 +909,6 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, ad
     )
     
     message_dict = chat_message.model_dump()
-    message_dict['created_at'] = message_dict['created_at'].isoformat()
     
     # Add activity log
     activity = log_activity(
@@ -925,7 +918,6 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, ad
         admin["id"],
         admin.get("username", "Admin")
     )
-    activity['timestamp'] = activity['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -934,7 +926,7 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, ad
                 "chat_messages": message_dict,
                 "activity_log": activity
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -969,7 +961,7 @@ async def get_chat_messages(project_id: str, admin = Depends(get_current_admin))
             sender_type=cm['sender_type'],
             message=cm['message'],
             read=cm.get('read', False),
-            created_at=cm['created_at'] if isinstance(cm['created_at'], str) else cm['created_at'].isoformat()
+            created_at=to_iso(cm['created_at'])
         ) for cm in chat_messages
     ]
 
@@ -1,29 +1,37 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 from schemas.client import ClientCreate, ClientUpdate, ClientResponse
 from database import clients_collection
 from auth.password import hash_password
 from auth.admin_auth import get_current_admin
 from models.client import Client
+from utils.dates import to_iso
+from utils.pagination import PageRequest, paginate
 from datetime import datetime
 
 router = APIRouter(prefix="/admin/clients", tags=["admin-clients"])
 
 @router.get("/", response_model=List[ClientResponse])
-async def get_all_clients(admin = Depends(get_current_admin)):
+async def get_all_clients(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        ClientResponse,
+        sortable=("created_at", "name", "email", "company"),
+        default_limit=1000
+    )),
+    admin = Depends(get_current_admin)
+):
     """Get all clients (Admin only)"""
-    clients = []
-    async for client_doc in clients_collection.find():
-        clients.append(ClientResponse(
-            id=client_doc['id'],
-            name=client_doc['name'],
-            email=client_doc['email'],
-            company=client_doc.get('company'),
-            phone=client_doc.get('phone'),
-            is_active=client_doc.get('is_active', True),  # Default to True if not set
-            created_at=client_doc['created_at'] if isinstance(client_doc['created_at'], str) else client_doc['created_at'].isoformat()
-        ))
-    return clients
+    clients = await page.fetch(clients_collection, {})
+    return page.respond(response, clients, lambda client_doc: ClientResponse(
+        id=client_doc['id'],
+        name=client_doc['name'],
+        email=client_doc['email'],
+        company=client_doc.get('company'),
+        phone=client_doc.get('phone'),
+        is_active=client_doc.get('is_active', True),  # Default to True if not set
+        created_at=to_iso(client_doc['created_at'])
+    ))
 
 @router.get("/{client_id}", response_model=ClientResponse)
 async def get_client(client_id: str, admin = Depends(get_current_admin)):
@@ -43,7 +51,7 @@ async def get_client(client_id: str, admin = Depends(get_current_admin)):
         company=client_doc.get('company'),
         phone=client_doc.get('phone'),
         is_active=client_doc.get('is_active', True),  # Default to True if not set
-        created_at=client_doc['created_at'] if isinstance(client_doc['created_at'], str) else client_doc['created_at'].isoformat()
+        created_at=to_iso(client_doc['created_at'])
     )
 
 @router.post("/", response_model=ClientResponse)
@@ -69,7 +77,6 @@ async def create_client(client_data: ClientCreate, admin = Depends(get_current_a
     )
     
     client_dict = client.model_dump()
-    client_dict['created_at'] = client_dict['created_at'].isoformat()
     
     await clients_collection.insert_one(client_dict)
     
@@ -116,7 +123,7 @@ async def update_client(client_id: str, client_data: ClientUpdate, admin = Depen
     if client_data.is_active is not None:
         update_data['is_active'] = client_data.is_active
     
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
     await clients_collection.update_one(
         {"id": client_id},
@@ -133,7 +140,7 @@ async def update_client(client_id: str, client_data: ClientUpdate, admin = Depen
         company=updated_client.get('company'),
         phone=updated_client.get('phone'),
         is_active=updated_client.get('is_active', True),  # Default to True if not set
-        created_at=updated_client['created_at'] if isinstance(updated_client['created_at'], str) else updated_client['created_at'].isoformat()
+        created_at=to_iso(updated_client['created_at'])
     )
 
 @router.delete("/{client_id}")
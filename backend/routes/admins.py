@@ -103,7 +103,6 @@ async def initialize_super_admin():
     )
     
     admin_dict = admin.model_dump()
-    admin_dict['created_at'] = admin_dict['created_at'].isoformat()
     
     await admins_collection.insert_one(admin_dict)
     
@@ -195,7 +194,6 @@ async def create_admin(
     )
     
     admin_dict = admin.model_dump()
-    admin_dict['created_at'] = admin_dict['created_at'].isoformat()
     admin_dict['permissions'] = admin_dict['permissions'].model_dump() if hasattr(admin_dict['permissions'], 'model_dump') else admin_dict['permissions']
     
     await admins_collection.insert_one(admin_dict)
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import Optional
-from datetime import datetime, timedelta
-import uuid
+from datetime import date, datetime, timedelta
+from urllib.parse import urlparse
 import logging
 
 from database import analytics_collection
@@ -10,27 +10,62 @@ from schemas.analytics import (
     AnalyticsEventResponse,
     AnalyticsSummary,
     PageViewStats,
-    BlogViewStats
+    BlogViewStats,
+    TopItem,
+    TopItemsResponse,
+    UniqueVisitorStats
 )
 from auth.admin_auth import get_current_admin
+from utils.rate_limit import rate_limit, get_client_ip
+from utils.metrics import ANALYTICS_INSERTS_IN_PROGRESS
+from utils.analytics_store import event_field, stored_event
+from utils.top_k import DIMENSIONS, PERIODS, record as record_top, referrer_host, top_items
+from utils.view_counters import view_counters
+from utils.visitors import ALL_PAGES, add_visitor, unique_visitors, visitor_id
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 logger = logging.getLogger(__name__)
 
-@router.post("/event", status_code=201)
-async def track_event(event: AnalyticsEventCreate):
+@router.post("/event", status_code=201, dependencies=[Depends(rate_limit("analytics"))])
+async def track_event(event: AnalyticsEventCreate, request: Request):
     """Track an analytics event - public endpoint, fails silently"""
     try:
+        now = datetime.utcnow()
+        visitor = await visitor_id(get_client_ip(request), request.headers.get("user-agent", ""), now)
         event_data = {
-            "_id": str(uuid.uuid4()),
             "event_type": event.event_type,
+            "visitor_id": visitor,
             "page_name": event.page_name,
             "blog_id": event.blog_id,
             "blog_title": event.blog_title,
-            "timestamp": datetime.utcnow()
+            "project_id": event.project_id,
+            "referrer": referrer_host(event.referrer, urlparse(request.headers.get("origin", "")).hostname),
+            "utm_source": event.utm_source,
+            "utm_medium": event.utm_medium,
+            "utm_campaign": event.utm_campaign,
+            "timestamp": now
         }
         
-        await analytics_collection.insert_one(event_data)
+        add_visitor(visitor, event.page_name if event.event_type == "page_view" else None, now)
+        
+        # Top pages / referrers / campaigns
+        if event.event_type == "page_view":
+            record_top("page", event.page_name, now)
+        record_top("referrer", event_data["referrer"], now)
+        for dimension in ("utm_source", "utm_medium", "utm_campaign"):
+            record_top(dimension, (event_data[dimension] or "").lower(), now)
+        
+        # Popularity counters on the blog / project documents
+        if event.event_type == "blog_view":
+            view_counters.record("blogs", event.blog_id)
+        elif event.event_type == "project_view":
+            view_counters.record("projects", event.project_id)
+        
+        ANALYTICS_INSERTS_IN_PROGRESS.inc()
+        try:
+            await analytics_collection.insert_one(stored_event(event_data))
+        finally:
+            ANALYTICS_INSERTS_IN_PROGRESS.dec()
         return {"status": "success", "message": "Event tracked"}
     except Exception as e:
         # Fail silently - don't block user actions
@@ -62,47 +97,47 @@ async def get_analytics_summary(
         # Get total page views
         total_page_views = await analytics_collection.count_documents({
             **date_filter,
-            "event_type": "page_view"
+            event_field("event_type"): "page_view"
         })
         
         # Get contact submissions
         contact_submissions = await analytics_collection.count_documents({
             **date_filter,
-            "event_type": "contact_submission"
+            event_field("event_type"): "contact_submission"
         })
         
         # Get calculator usage
         calculator_opened = await analytics_collection.count_documents({
             **date_filter,
-            "event_type": "calculator_opened"
+            event_field("event_type"): "calculator_opened"
         })
         
         calculator_estimates = await analytics_collection.count_documents({
             **date_filter,
-            "event_type": "calculator_estimate"
+            event_field("event_type"): "calculator_estimate"
         })
         
-        # Get page views by page
-        page_views_pipeline = [
-            {"$match": {**date_filter, "event_type": "page_view"}},
-            {"$group": {
-                "_id": "$page_name",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
+        # Page views by page, referrers and campaigns from the daily top-K summaries
+        top_period = period if period in PERIODS else "7days"
+        top_pages = await top_items("page", top_period, limit=50)
+        top_referrers = await top_items("referrer", top_period)
+        top_campaigns = await top_items("utm_campaign", top_period)
         
-        page_views_cursor = analytics_collection.aggregate(page_views_pipeline)
-        page_views_list = await page_views_cursor.to_list(length=None)
+        # Unique visitors from the daily sketches
+        visitors = await unique_visitors(start_date.date(), now.date())
         
         page_views_by_page = [
-            PageViewStats(page_name=item["_id"], count=item["count"])
-            for item in page_views_list if item["_id"]
+            PageViewStats(
+                page_name=item["key"],
+                count=item["count"],
+                unique_visitors=visitors.get(item["key"], {}).get("unique_visitors")
+            )
+            for item in top_pages
         ]
         
         # Get blog views
         blog_views_pipeline = [
-            {"$match": {**date_filter, "event_type": "blog_view"}},
+            {"$match": {**date_filter, event_field("event_type"): "blog_view"}},
             {"$group": {
                 "_id": {"blog_id": "$blog_id", "blog_title": "$blog_title"},
                 "count": {"$sum": 1}
@@ -130,9 +165,51 @@ async def get_analytics_summary(
             calculator_estimates=calculator_estimates,
             page_views_by_page=page_views_by_page,
             blog_views=blog_views,
+            unique_visitors=visitors.get(ALL_PAGES, {}).get("unique_visitors", 0),
+            top_referrers=[TopItem(**item) for item in top_referrers],
+            top_campaigns=[TopItem(**item) for item in top_campaigns],
             period=period
         )
         
     except Exception as e:
         logger.error(f"Error fetching analytics summary: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/visitors", response_model=UniqueVisitorStats)
+async def get_unique_visitors(
+    start: date,
+    end: Optional[date] = None,
+    page: str = Query(ALL_PAGES, description="page_name, or * for the whole site"),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """Approximate unique visitors between two UTC days, inclusive - admin only"""
+    end = end or datetime.utcnow().date()
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days > 366:
+        raise HTTPException(status_code=400, detail="Date range is limited to one year")
+    
+    stats = (await unique_visitors(start, end, [page])).get(page, {})
+    return UniqueVisitorStats(
+        start=start,
+        end=end,
+        page=page,
+        unique_visitors=stats.get("unique_visitors", 0),
+        daily=stats.get("days", {})
+    )
+
+@router.get("/top", response_model=TopItemsResponse)
+async def get_top_items(
+    dimension: str = Query("page", description=", ".join(DIMENSIONS)),
+    period: str = Query("7days", description=", ".join(PERIODS)),
+    limit: int = Query(10, ge=1, le=100),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """Top pages, referrers or UTM values over a period - admin only"""
+    if dimension not in DIMENSIONS:
+        raise HTTPException(status_code=400, detail=f"dimension must be one of: {', '.join(DIMENSIONS)}")
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of: {', '.join(PERIODS)}")
+    
+    items = await top_items(dimension, period, limit)
+    return TopItemsResponse(dimension=dimension, period=period, items=[TopItem(**item) for item in items])
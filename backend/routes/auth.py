@@ -27,7 +27,6 @@ async def register(user_data: UserCreate):
     )
     
     user_dict = user.model_dump()
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
     
     await users_collection.insert_one(user_dict)
     
@@ -1,46 +1,101 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
-from schemas.blog import BlogCreate, BlogUpdate, BlogResponse
+from schemas.blog import BlogCreate, BlogUpdate, BlogResponse, BlogCard, BlogDetailResponse
 from database import blogs_collection
 from utils import serialize_document, create_slug
+from utils.blog_processing import CARD_FIELDS, process_blog, related_posts
+from utils.cache import LocalCache
 from models import Blog
 from datetime import datetime
+from pymongo import UpdateOne
 from auth.admin_auth import get_current_admin
+from utils.pagination import PageRequest, paginate
 
 router = APIRouter(prefix="/blogs", tags=["blogs"])
 
+# Published post pages by slug; any blog write clears it, since a write can
+# change other posts' related lists too
+blog_cache = LocalCache("blogs")
+
+CARD_PROJECTION = {field: 1 for field in BlogCard.model_fields}
+
+
+async def rebuild_related_index():
+    """Recompute every published post's related cards, then drop cached pages"""
+    posts = await blogs_collection.find(
+        {"status": "published"},
+        {"_id": 0, "tags": 1, "keywords": 1, **{field: 1 for field in CARD_FIELDS}}
+    ).to_list(length=None)
+    index = related_posts(posts)
+    if index:
+        await blogs_collection.bulk_write([
+            UpdateOne({"id": post_id}, {"$set": {"related": cards}})
+            for post_id, cards in index.items()
+        ], ordered=False)
+    blog_cache.invalidate()
+
+
+async def ensure_blog_processing():
+    """Process posts saved before publish-time processing existed (startup)"""
+    operations = []
+    async for blog in blogs_collection.find({"rendered_content": None}):
+        operations.append(UpdateOne({"id": blog["id"]}, {"$set": process_blog(blog)}))
+    if operations:
+        await blogs_collection.bulk_write(operations, ordered=False)
+    await rebuild_related_index()
+
+
+async def _load_published_blog(slug: str):
+    blog = await blogs_collection.find_one({"slug": slug, "status": "published"})
+    if not blog:
+        return None
+    post = serialize_document(blog)
+    post["content"] = blog.get("rendered_content") or process_blog(blog)["rendered_content"]
+    return post
+
 # ====================================
 # PUBLIC ROUTES
 # ====================================
 
-@router.get("/", response_model=List[BlogResponse])
-async def get_published_blogs():
-    """Get all published blogs (public endpoint)"""
-    cursor = blogs_collection.find({"status": "published"}).sort("created_at", -1)
-    blogs = await cursor.to_list(length=100)
-    return [serialize_document(blog) for blog in blogs]
+@router.get("/", response_model=List[BlogCard])
+async def get_published_blogs(
+    response: Response,
+    page: PageRequest = Depends(paginate(BlogCard, sortable=("created_at", "title", "views", "trending")))
+):
+    """Get published blogs as list cards, without their bodies (public endpoint)
+
+    sort=-views for the most read posts, sort=-trending for the most read lately
+    """
+    blogs = await page.fetch(blogs_collection, {"status": "published"}, CARD_PROJECTION)
+    return page.respond(response, blogs, serialize_document)
 
-@router.get("/{slug}", response_model=BlogResponse)
+@router.get("/{slug}", response_model=BlogDetailResponse)
 async def get_blog_by_slug(slug: str):
-    """Get a single published blog by slug (public endpoint)"""
-    blog = await blogs_collection.find_one({"slug": slug, "status": "published"})
+    """Get a single published blog by slug, rendered, with related posts (public endpoint)"""
+    blog = await blog_cache.get_or_load(slug, lambda: _load_published_blog(slug))
     if not blog:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Blog not found"
         )
-    return serialize_document(blog)
+    return blog
 
 # ====================================
 # ADMIN ROUTES (Protected)
 # ====================================
 
 @router.get("/admin/all", response_model=List[BlogResponse])
-async def get_all_blogs(current_admin: dict = Depends(get_current_admin)):
+async def get_all_blogs(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        BlogResponse,
+        sortable=("created_at", "updated_at", "title", "status", "views", "trending")
+    )),
+    current_admin: dict = Depends(get_current_admin)
+):
     """Get all blogs including drafts (admin only)"""
-    cursor = blogs_collection.find().sort("created_at", -1)
-    blogs = await cursor.to_list(length=100)
-    return [serialize_document(blog) for blog in blogs]
+    blogs = await page.fetch(blogs_collection, {})
+    return page.respond(response, blogs, serialize_document)
 
 @router.post("/admin/create", response_model=BlogResponse)
 async def create_blog(blog_data: BlogCreate, current_admin: dict = Depends(get_current_admin)):
@@ -59,10 +114,10 @@ async def create_blog(blog_data: BlogCreate, current_admin: dict = Depends(get_c
     
     blog = Blog(**blog_data.model_dump())
     doc = blog.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
+    doc.update(process_blog(doc))
     
     await blogs_collection.insert_one(doc)
+    await rebuild_related_index()
     return serialize_document(doc)
 
 @router.put("/admin/{blog_id}", response_model=BlogResponse)
@@ -95,15 +150,16 @@ async def update_blog(blog_id: str, blog_data: BlogUpdate, current_admin: dict =
                 detail="A blog with this slug already exists"
             )
     
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
+    update_data.update(process_blog({**existing, **update_data}))
     
     await blogs_collection.update_one(
         {"id": blog_id},
         {"$set": update_data}
     )
+    await rebuild_related_index()
     
-    updated_blog = await blogs_collection.find_one({"id": blog_id})
-    return serialize_document(updated_blog)
+    return serialize_document({**existing, **update_data})
 
 @router.delete("/admin/{blog_id}")
 async def delete_blog(blog_id: str, current_admin: dict = Depends(get_current_admin)):
@@ -114,4 +170,5 @@ async def delete_blog(blog_id: str, current_admin: dict = Depends(get_current_ad
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Blog not found"
         )
+    await rebuild_related_index()
     return {"message": "Blog deleted successfully"}
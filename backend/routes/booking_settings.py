@@ -41,7 +41,7 @@ async def create_booking_settings(
     # Check if settings already exist
     existing = await booking_settings_collection.find_one({})
     
-    now = get_ist_now().isoformat()
+    now = get_ist_now()
     
     settings_data = {
         "available_days": settings.available_days,
@@ -79,7 +79,7 @@ async def update_booking_settings(
     if not existing:
         raise HTTPException(status_code=404, detail="Settings not found")
     
-    update_data = {"updated_at": get_ist_now().isoformat()}
+    update_data = {"updated_at": get_ist_now()}
     
     if settings_update.available_days is not None:
         update_data["available_days"] = settings_update.available_days
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import uuid
 import pytz
+from pymongo import ReturnDocument
 from database import bookings_collection, booking_settings_collection
 from schemas.booking import BookingCreate, BookingUpdate, BookingResponse, AvailableSlot
 from auth.admin_auth import get_current_admin
+from utils.rate_limit import rate_limit
+from utils.dates import to_datetime, date_equals, date_range_filter
+from utils.tracing import traced
+from utils.pagination import PageRequest, paginate
+from utils.booking_analytics import booking_report
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
@@ -21,6 +27,7 @@ def get_ist_datetime(date_str: str, time_str: str = "00:00"):
     dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
     return IST.localize(dt)
 
+@traced("booking.check_slot_availability")
 async def check_slot_availability(date: str, time_slot: str) -> dict:
     """Check if a time slot is available on a given date"""
     # Get booking settings
@@ -53,7 +60,7 @@ async def check_slot_availability(date: str, time_slot: str) -> dict:
     
     # Check existing bookings for this slot
     existing_bookings = await bookings_collection.count_documents({
-        "preferred_date": date,
+        "preferred_date": date_equals(date),
         "preferred_time_slot": time_slot,
         "status": {"$in": ["pending", "confirmed"]}
     })
@@ -74,6 +81,7 @@ async def check_slot_availability(date: str, time_slot: str) -> dict:
 # PUBLIC ENDPOINTS
 
 @router.get("/available-slots", response_model=List[AvailableSlot])
+@traced("booking.get_available_slots")
 async def get_available_slots(start_date: str, days: int = 14):
     """
     Get available time slots for the next N days
@@ -117,7 +125,7 @@ async def get_available_slots(start_date: str, days: int = 14):
     
     return available_slots
 
-@router.post("/", response_model=BookingResponse)
+@router.post("/", response_model=BookingResponse, dependencies=[Depends(rate_limit("bookings"))])
 async def create_booking(booking: BookingCreate):
     """Create a new booking (PUBLIC)"""
     # Validate slot availability
@@ -137,7 +145,7 @@ async def create_booking(booking: BookingCreate):
     meeting_type = settings.get("meeting_type", "Google Meet") if settings else "Google Meet"
     
     # Create booking
-    now = get_ist_now().isoformat()
+    now = get_ist_now()
     booking_id = str(uuid.uuid4())
     
     booking_data = {
@@ -145,7 +153,7 @@ async def create_booking(booking: BookingCreate):
         "name": booking.name,
         "email": booking.email,
         "phone": booking.phone,
-        "preferred_date": booking.preferred_date,
+        "preferred_date": to_datetime(booking.preferred_date),
         "preferred_time_slot": booking.preferred_time_slot,
         "message": booking.message,
         "status": "pending",
@@ -180,8 +188,14 @@ async def check_availability(date: str, time_slot: str):
 
 @router.get("/admin/all", response_model=List[BookingResponse])
 async def get_all_bookings(
+    response: Response,
     status: Optional[str] = None,
     date: Optional[str] = None,
+    page: PageRequest = Depends(paginate(
+        BookingResponse,
+        sortable=("created_at", "preferred_date", "name", "status"),
+        default_limit=1000
+    )),
     _: dict = Depends(get_current_admin)
 ):
     """Get all bookings (ADMIN)"""
@@ -191,22 +205,31 @@ async def get_all_bookings(
         query["status"] = status
     
     if date:
-        query["preferred_date"] = date
+        query["preferred_date"] = date_equals(date)
     
-    bookings = await bookings_collection.find(query).sort("created_at", -1).to_list(1000)
-    return bookings
+    bookings = await page.fetch(bookings_collection, query)
+    return page.respond(response, bookings, lambda booking: booking)
 
 @router.get("/admin/upcoming", response_model=List[BookingResponse])
-async def get_upcoming_bookings(_: dict = Depends(get_current_admin)):
+async def get_upcoming_bookings(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        BookingResponse,
+        sortable=("preferred_date", "created_at"),
+        default_sort="preferred_date",
+        default_limit=1000
+    )),
+    _: dict = Depends(get_current_admin)
+):
     """Get upcoming confirmed bookings (ADMIN)"""
     today = get_ist_now().strftime("%Y-%m-%d")
     
-    bookings = await bookings_collection.find({
+    bookings = await page.fetch(bookings_collection, {
         "status": "confirmed",
-        "preferred_date": {"$gte": today}
-    }).sort("preferred_date", 1).to_list(1000)
+        **date_range_filter("preferred_date", gte=today)
+    })
     
-    return bookings
+    return page.respond(response, bookings, lambda booking: booking)
 
 @router.get("/admin/{booking_id}", response_model=BookingResponse)
 async def get_booking(booking_id: str, _: dict = Depends(get_current_admin)):
@@ -223,22 +246,13 @@ async def update_booking(
     _: dict = Depends(get_current_admin)
 ):
     """Update a booking (ADMIN)"""
-    booking = await bookings_collection.find_one({"id": booking_id})
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    
+    now = get_ist_now()
     update_data = {
-        "updated_at": get_ist_now().isoformat()
+        "updated_at": now
     }
     
     if booking_update.status:
         update_data["status"] = booking_update.status
-        
-        if booking_update.status == "confirmed" and not booking.get("confirmed_at"):
-            update_data["confirmed_at"] = get_ist_now().isoformat()
-        
-        if booking_update.status == "cancelled" and not booking.get("cancelled_at"):
-            update_data["cancelled_at"] = get_ist_now().isoformat()
     
     if booking_update.meeting_link is not None:
         update_data["meeting_link"] = booking_update.meeting_link
@@ -246,12 +260,22 @@ async def update_booking(
     if booking_update.admin_notes is not None:
         update_data["admin_notes"] = booking_update.admin_notes
     
-    await bookings_collection.update_one(
+    # An update pipeline, so confirmed_at/cancelled_at are only stamped the
+    # first time without reading the booking first; $literal keeps admin
+    # text starting with "$" from being read as a field path
+    stage = {field: {"$literal": value} for field, value in update_data.items()}
+    if booking_update.status == "confirmed":
+        stage["confirmed_at"] = {"$ifNull": ["$confirmed_at", now]}
+    if booking_update.status == "cancelled":
+        stage["cancelled_at"] = {"$ifNull": ["$cancelled_at", now]}
+    
+    updated_booking = await bookings_collection.find_one_and_update(
         {"id": booking_id},
-        {"$set": update_data}
+        [{"$set": stage}],
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_booking = await bookings_collection.find_one({"id": booking_id})
+    if not updated_booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
     return updated_booking
 
 @router.delete("/admin/{booking_id}")
@@ -273,7 +297,7 @@ async def get_booking_stats(_: dict = Depends(get_current_admin)):
     today = get_ist_now().strftime("%Y-%m-%d")
     upcoming = await bookings_collection.count_documents({
         "status": "confirmed",
-        "preferred_date": {"$gte": today}
+        **date_range_filter("preferred_date", gte=today)
     })
     
     return {
@@ -283,3 +307,18 @@ async def get_booking_stats(_: dict = Depends(get_current_admin)):
         "cancelled": cancelled,
         "upcoming": upcoming
     }
+
+@router.get("/admin/stats/report")
+async def get_booking_report(
+    start: Optional[date] = Query(None, description="First preferred date (default: 90 days ago)"),
+    end: Optional[date] = Query(None, description="Last preferred date (default: today)"),
+    _: dict = Depends(get_current_admin)
+):
+    """Weekday x slot demand, lead times, conversion and utilization for a date range (ADMIN)"""
+    end = end or get_ist_now().date()
+    start = start or end - timedelta(days=89)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days > 731:
+        raise HTTPException(status_code=400, detail="Date range is limited to two years")
+    return await booking_report(start, end)
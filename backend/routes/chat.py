@@ -4,13 +4,15 @@ from schemas.chat import ChatMessageCreate, ChatReply
 from database import conversations_collection
 from auth.admin_auth import get_current_admin, check_permission
 from models.chat import Conversation, ChatMessage
+from utils.rate_limit import rate_limit
 from datetime import datetime
+from pymongo import ReturnDocument
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-@router.post("/messages")
+@router.post("/messages", dependencies=[Depends(rate_limit("chat_messages"))])
 async def create_message(message_data: ChatMessageCreate):
     """Create new customer message (public endpoint for chat widget)"""
     try:
@@ -34,55 +36,38 @@ async def create_message(message_data: ChatMessageCreate):
                 detail="Message too long (max 1000 characters)"
             )
         
-        # Find existing conversation by email
-        conversation = await conversations_collection.find_one({
-            "customer_email": message_data.customer_email
-        })
-        
         # Create new message
         new_message = ChatMessage(
             sender="customer",
             message=message_data.message.strip(),
             read=False
         )
+        new_conversation = Conversation(
+            customer_name=message_data.customer_name,
+            customer_email=message_data.customer_email,
+            customer_phone=message_data.customer_phone or ""
+        )
+        
+        # Append to the conversation for this email, starting one if there
+        # is none; the document as it was before says which happened
+        conversation = await conversations_collection.find_one_and_update(
+            {"customer_email": message_data.customer_email},
+            {
+                "$push": {"messages": new_message.model_dump()},
+                "$inc": {"unread_count": 1},
+                "$set": {"last_message_at": datetime.utcnow()},
+                "$setOnInsert": new_conversation.model_dump(
+                    include={"id", "customer_name", "customer_phone", "created_at"}
+                )
+            },
+            projection={"_id": 0, "id": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
         
         if conversation:
-            # Add message to existing conversation
-            message_dict = new_message.model_dump()
-            message_dict['timestamp'] = message_dict['timestamp'].isoformat()
-            
-            await conversations_collection.update_one(
-                {"id": conversation['id']},
-                {
-                    "$push": {"messages": message_dict},
-                    "$inc": {"unread_count": 1},
-                    "$set": {"last_message_at": datetime.utcnow().isoformat()}
-                }
-            )
             return {"success": True, "id": conversation['id'], "message": "Message sent successfully"}
-        else:
-            # Create new conversation
-            new_conversation = Conversation(
-                customer_name=message_data.customer_name,
-                customer_email=message_data.customer_email,
-                customer_phone=message_data.customer_phone or "",
-                messages=[new_message],
-                unread_count=1
-            )
-            
-            conv_dict = new_conversation.model_dump()
-            conv_dict['created_at'] = conv_dict['created_at'].isoformat()
-            conv_dict['last_message_at'] = conv_dict['last_message_at'].isoformat()
-            
-            # Convert messages to dict
-            conv_dict['messages'] = []
-            for msg in new_conversation.messages:
-                msg_dict = msg.model_dump()
-                msg_dict['timestamp'] = msg_dict['timestamp'].isoformat()
-                conv_dict['messages'].append(msg_dict)
-            
-            await conversations_collection.insert_one(conv_dict)
-            return {"success": True, "id": new_conversation.id, "message": "Conversation started successfully"}
+        return {"success": True, "id": new_conversation.id, "message": "Conversation started successfully"}
     
     except HTTPException:
         raise
@@ -251,13 +236,6 @@ async def send_reply(
             detail="Access denied"
         )
     
-    conversation = await conversations_collection.find_one({"id": conversation_id})
-    if not conversation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Conversation not found"
-        )
-    
     # Create admin reply message
     reply_message = ChatMessage(
         sender="admin",
@@ -266,18 +244,20 @@ async def send_reply(
     )
     
     reply_dict = reply_message.model_dump()
-    reply_dict['timestamp'] = reply_dict['timestamp'].isoformat()
     
-    await conversations_collection.update_one(
+    updated_conv = await conversations_collection.find_one_and_update(
         {"id": conversation_id},
         {
             "$push": {"messages": reply_dict},
-            "$set": {"last_message_at": datetime.utcnow().isoformat()}
-        }
+            "$set": {"last_message_at": datetime.utcnow()}
+        },
+        return_document=ReturnDocument.AFTER
     )
-    
-    # Get updated conversation
-    updated_conv = await conversations_collection.find_one({"id": conversation_id})
+    if not updated_conv:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
     
     return {
         "success": True,
@@ -4,6 +4,7 @@ from database import clients_collection
 from auth.password import verify_password
 from auth.jwt import create_access_token
 from auth.client_auth import get_current_client
+from utils.dates import to_iso
 from datetime import datetime
 
 router = APIRouter(prefix="/client/auth", tags=["client-auth"])
@@ -52,7 +53,7 @@ async def client_login(credentials: ClientLogin):
             company=client_doc.get('company'),
             phone=client_doc.get('phone'),
             is_active=client_doc['is_active'],
-            created_at=client_doc['created_at'] if isinstance(client_doc['created_at'], str) else client_doc['created_at'].isoformat()
+            created_at=to_iso(client_doc['created_at'])
         )
     )
 
@@ -74,7 +75,7 @@ async def get_client_profile(client = Depends(get_current_client)):
         company=client_doc.get('company'),
         phone=client_doc.get('phone'),
         is_active=client_doc['is_active'],
-        created_at=client_doc['created_at'] if isinstance(client_doc['created_at'], str) else client_doc['created_at'].isoformat()
+        created_at=to_iso(client_doc['created_at'])
     )
 
 @router.post("/logout")
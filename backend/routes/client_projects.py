@@ -3,33 +3,27 @@ from fastapi.responses import FileResponse
 from typing import List
 from schemas.client_project import (
     ClientProjectResponse, CommentCreate, CommentResponse,
-    MilestoneResponse, TaskResponse, ProjectFileResponse,
-    ActivityResponse, TeamMemberResponse, BudgetResponse,
     ChatMessageCreate, ChatMessageResponse
 )
 from database import client_projects_collection
 from auth.client_auth import get_current_client
 from models.client_project import ProjectComment, ProjectActivity
 from models.client_project import ChatMessage
+from utils.responses import trusted_response
+from utils.dates import to_iso, to_date_str
+from utils.tracing import traced
 from datetime import datetime
 import os
 
 router = APIRouter(prefix="/client/projects", tags=["client-projects"])
 
-def convert_project_to_response(project_doc) -> ClientProjectResponse:
-    """Helper function to convert project document to response"""
-    from datetime import datetime
-    
-    # Helper function to safely get datetime string
-    def get_datetime_str(obj, key, default=None):
-        val = obj.get(key)
-        if not val:
-            return default
-        if isinstance(val, str):
-            return val
-        return val.isoformat()
-    
-    return ClientProjectResponse(
+@traced("client_portal.project_response_dict")
+def project_response_dict(project_doc) -> dict:
+    """
+    Project document as a plain dict shaped like ClientProjectResponse;
+    return it through trusted_response().
+    """
+    return dict(
         id=project_doc['id'],
         name=project_doc['name'],
         client_id=project_doc['client_id'],
@@ -37,88 +31,88 @@ def convert_project_to_response(project_doc) -> ClientProjectResponse:
         status=project_doc['status'],
         priority=project_doc.get('priority', 'medium'),
         progress=project_doc['progress'],
-        start_date=str(project_doc['start_date']) if project_doc.get('start_date') else None,
-        expected_delivery=str(project_doc['expected_delivery']) if project_doc.get('expected_delivery') else None,
-        actual_delivery=str(project_doc['actual_delivery']) if project_doc.get('actual_delivery') else None,
+        start_date=to_date_str(project_doc.get('start_date')),
+        expected_delivery=to_date_str(project_doc.get('expected_delivery')),
+        actual_delivery=to_date_str(project_doc.get('actual_delivery')),
         notes=project_doc.get('notes'),
         milestones=[
-            MilestoneResponse(
+            dict(
                 id=m.get('id', str(i)),
                 title=m.get('title', ''),
                 description=m.get('description'),
-                due_date=str(m['due_date']) if m.get('due_date') else None,
+                due_date=to_date_str(m.get('due_date')),
                 status=m.get('status', 'pending'),
-                completion_date=m.get('completion_date'),
+                completion_date=to_iso(m.get('completion_date')),
                 order=m.get('order', 0),
-                created_at=get_datetime_str(m, 'created_at', datetime.utcnow().isoformat())
+                created_at=to_iso(m.get('created_at') or datetime.utcnow())
             ) for i, m in enumerate(project_doc.get('milestones', []))
         ],
         tasks=[
-            TaskResponse(
+            dict(
                 id=t.get('id', str(i)),
                 title=t.get('title', ''),
                 description=t.get('description'),
                 status=t.get('status', 'todo'),
                 priority=t.get('priority', 'medium'),
                 assigned_to=t.get('assigned_to'),
-                due_date=str(t['due_date']) if t.get('due_date') else None,
-                completed_at=t.get('completed_at'),
+                due_date=to_date_str(t.get('due_date')),
+                completed_at=to_iso(t.get('completed_at')),
                 milestone_id=t.get('milestone_id'),
-                created_at=get_datetime_str(t, 'created_at', datetime.utcnow().isoformat())
+                created_at=to_iso(t.get('created_at') or datetime.utcnow())
             ) for i, t in enumerate(project_doc.get('tasks', []))
         ],
         files=[
-            ProjectFileResponse(
+            dict(
                 id=f.get('id', str(i)),
                 filename=f.get('filename', 'file'),
                 file_path=f.get('file_path', ''),
-                uploaded_at=get_datetime_str(f, 'uploaded_at', datetime.utcnow().isoformat()),
+                uploaded_at=to_iso(f.get('uploaded_at') or datetime.utcnow()),
                 uploaded_by=f.get('uploaded_by', 'system'),
                 file_size=f.get('file_size', 0),
                 file_type=f.get('file_type')
             ) for i, f in enumerate(project_doc.get('files', []))
         ],
         comments=[
-            CommentResponse(
+            dict(
                 id=c.get('id', str(i)),
                 user_id=c.get('user_id', ''),
                 user_name=c.get('user_name', 'User'),
                 user_type=c.get('user_type', 'client'),
                 message=c.get('message', ''),
-                created_at=get_datetime_str(c, 'created_at', datetime.utcnow().isoformat())
+                created_at=to_iso(c.get('created_at') or datetime.utcnow())
             ) for i, c in enumerate(project_doc.get('comments', []))
         ],
         chat_messages=[
-            ChatMessageResponse(
+            dict(
                 id=cm.get('id', str(i)),
                 sender_id=cm.get('sender_id', ''),
                 sender_name=cm.get('sender_name', 'User'),
                 sender_type=cm.get('sender_type', 'client'),
                 message=cm.get('message', ''),
                 read=cm.get('read', False),
-                created_at=get_datetime_str(cm, 'created_at', datetime.utcnow().isoformat())
+                created_at=to_iso(cm.get('created_at') or datetime.utcnow())
             ) for i, cm in enumerate(project_doc.get('chat_messages', []))
         ],
         activity_log=[
-            ActivityResponse(
+            dict(
                 id=a.get('id', str(i)),
                 action=a.get('action', 'unknown'),
                 description=a.get('description', ''),
                 user_id=a.get('user_id', ''),
                 user_name=a.get('user_name', 'System'),
-                timestamp=get_datetime_str(a, 'timestamp', datetime.utcnow().isoformat()),
+                timestamp=to_iso(a.get('timestamp') or datetime.utcnow()),
                 metadata=a.get('metadata')
             ) for i, a in enumerate(project_doc.get('activity_log', []))
         ],
         team_members=[
-            TeamMemberResponse(
+            dict(
                 admin_id=tm.get('admin_id', ''),
                 admin_name=tm.get('admin_name', 'Admin'),
                 role=tm.get('role'),
-                added_at=get_datetime_str(tm, 'added_at', datetime.utcnow().isoformat())
+                added_at=to_iso(tm.get('added_at') or datetime.utcnow())
             ) for tm in project_doc.get('team_members', [])
         ],
-        budget=BudgetResponse(
+        budget=dict(
             total_amount=project_doc.get('budget', {}).get('total_amount', 0.0),
             currency=project_doc.get('budget', {}).get('currency', 'USD'),
             paid_amount=project_doc.get('budget', {}).get('paid_amount', 0.0),
@@ -126,9 +120,9 @@ def convert_project_to_response(project_doc) -> ClientProjectResponse:
             payment_terms=project_doc.get('budget', {}).get('payment_terms')
         ) if project_doc.get('budget') else None,
         tags=project_doc.get('tags', []),
-        created_at=get_datetime_str(project_doc, 'created_at', datetime.utcnow().isoformat()),
-        updated_at=project_doc.get('updated_at'),
-        last_activity_at=project_doc.get('last_activity_at')
+        created_at=to_iso(project_doc.get('created_at') or datetime.utcnow()),
+        updated_at=to_iso(project_doc.get('updated_at')),
+        last_activity_at=to_iso(project_doc.get('last_activity_at'))
     )
 
 @router.get("/", response_model=List[ClientProjectResponse])
@@ -136,8 +130,8 @@ async def get_my_projects(client = Depends(get_current_client)):
     """Get all projects assigned to the current client"""
     projects = []
     async for project_doc in client_projects_collection.find({"client_id": client["id"]}):
-        projects.append(convert_project_to_response(project_doc))
-    return projects
+        projects.append(project_response_dict(project_doc))
+    return trusted_response(projects)
 
 @router.get("/{project_id}", response_model=ClientProjectResponse)
 async def get_project(project_id: str, client = Depends(get_current_client)):
@@ -153,7 +147,7 @@ async def get_project(project_id: str, client = Depends(get_current_client)):
             detail="Project not found or not assigned to you"
         )
     
-    return convert_project_to_response(project_doc)
+    return trusted_response(project_response_dict(project_doc))
 
 @router.post("/{project_id}/comments", response_model=CommentResponse)
 async def add_comment(project_id: str, comment_data: CommentCreate, client = Depends(get_current_client)):
@@ -177,7 +171,6 @@ async def add_comment(project_id: str, comment_data: CommentCreate, client = Dep
     )
     
     comment_dict = comment.model_dump()
-    comment_dict['created_at'] = comment_dict['created_at'].isoformat()
     
     # Add activity log
     activity = ProjectActivity(
@@ -187,7 +180,6 @@ async def add_comment(project_id: str, comment_data: CommentCreate, client = Dep
         user_name=client.get("name", "Client")
     )
     activity_dict = activity.model_dump()
-    activity_dict['timestamp'] = activity_dict['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -196,7 +188,7 @@ async def add_comment(project_id: str, comment_data: CommentCreate, client = Dep
                 "comments": comment_dict,
                 "activity_log": activity_dict
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -275,7 +267,6 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, cl
     )
     
     message_dict = chat_message.model_dump()
-    message_dict['created_at'] = message_dict['created_at'].isoformat()
     
     # Add activity log
     activity = ProjectActivity(
@@ -285,7 +276,6 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, cl
         user_name=client.get("name", "Client")
     )
     activity_dict = activity.model_dump()
-    activity_dict['timestamp'] = activity_dict['timestamp'].isoformat()
     
     await client_projects_collection.update_one(
         {"id": project_id},
@@ -294,7 +284,7 @@ async def send_chat_message(project_id: str, message_data: ChatMessageCreate, cl
                 "chat_messages": message_dict,
                 "activity_log": activity_dict
             },
-            "$set": {"last_activity_at": datetime.utcnow().isoformat()}
+            "$set": {"last_activity_at": datetime.utcnow()}
         }
     )
     
@@ -336,7 +326,7 @@ async def get_chat_messages(project_id: str, client = Depends(get_current_client
             sender_type=cm['sender_type'],
             message=cm['message'],
             read=cm.get('read', False),
-            created_at=cm['created_at'] if isinstance(cm['created_at'], str) else cm['created_at'].isoformat()
+            created_at=to_iso(cm['created_at'])
         ) for cm in chat_messages
     ]
 
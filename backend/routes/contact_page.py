@@ -48,7 +48,7 @@ async def update_contact_page(
                 existing[key] = value
         
         # Add metadata
-        existing['updated_at'] = datetime.utcnow().isoformat()
+        existing['updated_at'] = datetime.utcnow()
         existing['updated_by'] = current_admin.get('username', 'admin')
         
         # Ensure id exists
@@ -73,7 +73,7 @@ async def reset_contact_page(current_admin: dict = Depends(get_current_admin)):
     """Reset contact page to default content (admin only)"""
     try:
         default_content = get_default_contact_content()
-        default_content['updated_at'] = datetime.utcnow().isoformat()
+        default_content['updated_at'] = datetime.utcnow()
         default_content['updated_by'] = current_admin.get('username', 'admin')
         
         await contact_page_collection.delete_many({})
@@ -1,29 +1,37 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 from schemas.contact import ContactCreate, ContactResponse, ContactUpdate
 from database import contacts_collection
 from utils import serialize_document
 from models import ContactSubmission
+from utils.rate_limit import rate_limit
+from utils.pagination import PageRequest, paginate
 from datetime import datetime
+from pymongo import ReturnDocument
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
-@router.post("/", response_model=ContactResponse)
+@router.post("/", response_model=ContactResponse, dependencies=[Depends(rate_limit("contacts"))])
 async def create_contact(contact_data: ContactCreate):
     """Create a new contact submission (public endpoint)"""
     contact = ContactSubmission(**contact_data.model_dump())
     doc = contact.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await contacts_collection.insert_one(doc)
     return serialize_document(doc)
 
 @router.get("/admin/all", response_model=List[ContactResponse])
-async def get_all_contacts():
+async def get_all_contacts(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        ContactResponse,
+        sortable=("created_at", "name", "email"),
+        default_limit=1000
+    ))
+):
     """Get all contact submissions (admin only)"""
-    cursor = contacts_collection.find().sort("created_at", -1)
-    contacts = await cursor.to_list(length=1000)
-    return [serialize_document(contact) for contact in contacts]
+    contacts = await page.fetch(contacts_collection, {})
+    return page.respond(response, contacts, serialize_document)
 
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(contact_id: str):
@@ -39,39 +47,33 @@ async def get_contact(contact_id: str):
 @router.patch("/{contact_id}/read", response_model=ContactResponse)
 async def mark_contact_read(contact_id: str, update_data: ContactUpdate):
     """Mark a contact as read/unread"""
-    existing = await contacts_collection.find_one({"id": contact_id})
-    if not existing:
+    updated_contact = await contacts_collection.find_one_and_update(
+        {"id": contact_id},
+        {"$set": {"read": update_data.read}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contact not found"
         )
-    
-    await contacts_collection.update_one(
-        {"id": contact_id},
-        {"$set": {"read": update_data.read}}
-    )
-    
-    updated_contact = await contacts_collection.find_one({"id": contact_id})
     return serialize_document(updated_contact)
 
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(contact_id: str, contact_data: ContactCreate):
     """Update a contact submission"""
-    existing = await contacts_collection.find_one({"id": contact_id})
-    if not existing:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Contact not found"
-        )
-    
     update_dict = contact_data.model_dump(exclude_unset=True)
     
-    await contacts_collection.update_one(
+    updated_contact = await contacts_collection.find_one_and_update(
         {"id": contact_id},
-        {"$set": update_dict}
+        {"$set": update_dict},
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_contact = await contacts_collection.find_one({"id": contact_id})
+    if not updated_contact:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contact not found"
+        )
     return serialize_document(updated_contact)
 
 @router.delete("/{contact_id}")
@@ -4,46 +4,45 @@ from database import content_collection
 from utils import serialize_document
 from models.content import WebsiteContent
 from datetime import datetime
+from pymongo import ReturnDocument
 
 router = APIRouter(prefix="/content", tags=["content"])
 
+CONTENT_ID = "website_content"
+
+
+def _default_content(exclude=()) -> dict:
+    """Default content fields, for $setOnInsert when the document is created"""
+    return WebsiteContent(id=CONTENT_ID).model_dump(exclude={"id", *exclude})
+
 @router.get("/", response_model=ContentResponse)
 async def get_content():
     """Get website content"""
-    content = await content_collection.find_one({"id": "website_content"})
+    content = await content_collection.find_one({"id": CONTENT_ID})
     
     if not content:
-        # Create default content if not exists
-        default_content = WebsiteContent(id="website_content")
-        doc = default_content.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        await content_collection.insert_one(doc)
-        return serialize_document(doc)
+        # Create default content if not exists; an upsert, so concurrent
+        # first requests cannot insert it twice
+        content = await content_collection.find_one_and_update(
+            {"id": CONTENT_ID},
+            {"$setOnInsert": _default_content()},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
     
     return serialize_document(content)
 
 @router.put("/", response_model=ContentResponse)
 async def update_content(content_data: ContentUpdate):
     """Update website content"""
-    # Check if content exists
-    existing = await content_collection.find_one({"id": "website_content"})
-    
-    if not existing:
-        # Create new if doesn't exist
-        default_content = WebsiteContent(id="website_content")
-        doc = default_content.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        await content_collection.insert_one(doc)
-        existing = doc
-    
-    # Update only provided fields
+    # Update only provided fields, creating the default content if it doesn't exist
     update_data = content_data.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
-    await content_collection.update_one(
-        {"id": "website_content"},
-        {"$set": update_data}
+    updated_content = await content_collection.find_one_and_update(
+        {"id": CONTENT_ID},
+        {"$set": update_data, "$setOnInsert": _default_content(exclude=update_data)},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_content = await content_collection.find_one({"id": "website_content"})
     return serialize_document(updated_content)
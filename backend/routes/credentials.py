@@ -42,8 +42,6 @@ async def get_all_credentials(
     for cred in credentials:
         if not show_full:
             cred["value"] = mask_credential_value(cred["value"])
-        cred["created_at"] = cred["created_at"].isoformat()
-        cred["updated_at"] = cred["updated_at"].isoformat()
     
     return credentials
 
@@ -68,9 +66,6 @@ async def get_credential(
     if not show_full:
         credential["value"] = mask_credential_value(credential["value"])
     
-    credential["created_at"] = credential["created_at"].isoformat()
-    credential["updated_at"] = credential["updated_at"].isoformat()
-    
     return credential
 
 @router.post("/", response_model=CredentialResponse)
@@ -104,11 +99,7 @@ async def create_credential(
     # Update environment variable (runtime only - won't persist across restarts)
     os.environ[credential_data.key] = credential_data.value
     
-    result = new_credential.dict()
-    result["created_at"] = result["created_at"].isoformat()
-    result["updated_at"] = result["updated_at"].isoformat()
-    
-    return result
+    return new_credential.dict()
 
 @router.put("/{credential_id}", response_model=CredentialResponse)
 async def update_credential(
@@ -143,9 +134,6 @@ async def update_credential(
     
     # Fetch updated credential
     updated_credential = await credentials_collection.find_one({"id": credential_id})
-    updated_credential["created_at"] = updated_credential["created_at"].isoformat()
-    updated_credential["updated_at"] = updated_credential["updated_at"].isoformat()
-    
     return updated_credential
 
 @router.delete("/{credential_id}")
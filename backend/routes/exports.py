@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from auth.admin_auth import require_super_admin
+from database import exports_collection
+from schemas.export import ExportCreate
+from utils.dates import to_iso
+from utils.parquet_export import DATASETS, bundle_path, parquet_exporter, pa
+import asyncio
+
+router = APIRouter(prefix="/admin/exports", tags=["admin-exports"])
+
+def _job_response(job: dict) -> dict:
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "datasets": job.get("datasets", []),
+        "requested_by": job.get("requested_by"),
+        "rows": job.get("rows", {}),
+        "files": job.get("files", []),
+        "error": job.get("error"),
+        "started_at": to_iso(job.get("started_at")),
+        "finished_at": to_iso(job.get("finished_at"))
+    }
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def start_export(body: ExportCreate, admin = Depends(require_super_admin)):
+    """Start an incremental Parquet export of the given datasets (Super admin only)"""
+    if pa is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Parquet export needs pyarrow installed on the server"
+        )
+    names = body.datasets or list(DATASETS)
+    unknown = [name for name in names if name not in DATASETS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown datasets: {', '.join(unknown)}. Available: {', '.join(DATASETS)}"
+        )
+    job = await parquet_exporter.start_job(list(dict.fromkeys(names)), admin["username"])
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="An export is already running")
+    return _job_response(job)
+
+@router.get("/")
+async def list_exports(limit: int = Query(20, ge=1, le=100), admin = Depends(require_super_admin)):
+    """Recent export jobs, newest first (Super admin only)"""
+    jobs = await exports_collection.find({}, {"_id": 0}).sort("started_at", -1).limit(limit).to_list(limit)
+    return {"exports": [_job_response(job) for job in jobs]}
+
+@router.get("/{job_id}")
+async def get_export(job_id: str, admin = Depends(require_super_admin)):
+    """Status of an export job (Super admin only)"""
+    job = await exports_collection.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    return _job_response(job)
+
+@router.get("/{job_id}/download")
+async def download_export(job_id: str, admin = Depends(require_super_admin)):
+    """Zip of the Parquet partitions a finished export wrote (Super admin only)"""
+    job = await exports_collection.find_one({"id": job_id}, {"_id": 0, "status": 1})
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Export is {job['status']}")
+    path = bundle_path(job_id)
+    if not await asyncio.to_thread(path.exists):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export file no longer exists")
+    return FileResponse(path, media_type="application/zip", filename=path.name)
@@ -0,0 +1,79 @@
+"""
+Sitemap and blog feeds for crawlers and feed readers.
+
+    GET /sitemap.xml               sitemap index
+    GET /sitemaps/{name}.xml       one sitemap file (pages-1, blogs-N, projects-N)
+    GET /feeds/rss.xml, /feeds/atom.xml   newest published posts
+
+All of them are served from the snapshot in utils/site_feeds.py with an
+ETag and Last-Modified; If-None-Match (or, without it, If-Modified-Since)
+that still matches gets a 304. Point robots.txt at /api/sitemap.xml.
+"""
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from utils.site_feeds import FeedDocument, site_feeds
+
+router = APIRouter(tags=["feeds"])
+
+
+def _not_modified(request: Request, document: FeedDocument) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or document.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return document.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _send(request: Request, document: FeedDocument) -> Response:
+    headers = {
+        "ETag": document.etag,
+        "Last-Modified": format_datetime(document.last_modified, usegmt=True),
+        "Cache-Control": "public, no-cache",
+    }
+    if _not_modified(request, document):
+        return Response(status_code=304, headers=headers)
+    return Response(document.body, media_type=document.media_type, headers=headers)
+
+
+async def invalidate_site_feeds(request: Request):
+    """Router dependency: refresh the sitemap and feeds after a write on a source router"""
+    try:
+        yield
+    finally:
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            site_feeds.mark_stale()
+
+
+@router.get("/sitemap.xml")
+async def get_sitemap_index(request: Request):
+    feeds = await site_feeds.current()
+    # The sitemap files live next to this one, under the same public base
+    base_url = str(request.url).rsplit("/", 1)[0]
+    return _send(request, feeds.sitemap_index(base_url))
+
+
+@router.get("/sitemaps/{name}.xml")
+async def get_sitemap(name: str, request: Request):
+    feeds = await site_feeds.current()
+    document = feeds.documents.get(name)
+    if document is None or name in ("rss", "atom"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sitemap not found")
+    return _send(request, document)
+
+
+@router.get("/feeds/rss.xml")
+async def get_rss_feed(request: Request):
+    feeds = await site_feeds.current()
+    return _send(request, feeds.documents["rss"])
+
+
+@router.get("/feeds/atom.xml")
+async def get_atom_feed(request: Request):
+    feeds = await site_feeds.current()
+    return _send(request, feeds.documents["atom"])
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, status
+from fastapi.responses import Response
+from typing import Optional
+from auth.admin_auth import require_super_admin
+from utils.metrics import METRICS_ENABLED, render_metrics
+import hmac
+import os
+
+router = APIRouter(tags=["metrics"])
+
+# Static bearer token for the Prometheus scraper; super admins can always read
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+async def require_metrics_access(authorization: Optional[str] = Header(None)):
+    """Allow the scraper's METRICS_TOKEN, otherwise require a super admin"""
+    if METRICS_TOKEN and authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token.strip(), METRICS_TOKEN):
+            return
+    await require_super_admin(authorization)
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def get_metrics():
+    """Prometheus exposition of every worker's metrics"""
+    if not METRICS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metrics are disabled"
+        )
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
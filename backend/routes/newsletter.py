@@ -1,19 +1,36 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 from schemas.newsletter import NewsletterSubscribe, NewsletterResponse, NewsletterUpdate
 from database import newsletter_collection
 from utils import serialize_document
 from models.newsletter import NewsletterSubscriber
-from datetime import datetime
+from pymongo import ReturnDocument
 from auth.admin_auth import get_current_admin
+from utils.rate_limit import rate_limit
+from utils.pagination import PageRequest, paginate
 
 router = APIRouter(prefix="/newsletter", tags=["newsletter"])
 
-@router.post("/subscribe", response_model=dict)
+@router.post("/subscribe", response_model=dict, dependencies=[Depends(rate_limit("newsletter"))])
 async def subscribe_to_newsletter(subscription_data: NewsletterSubscribe):
     """Subscribe to newsletter (public endpoint)"""
-    # Check if email already exists
-    existing = await newsletter_collection.find_one({"email": subscription_data.email})
+    subscriber = NewsletterSubscriber(**subscription_data.model_dump())
+    
+    # One upsert covers all three cases; the document as it was before tells
+    # them apart. created_at is reset on resubscribe, kept if still subscribed.
+    existing = await newsletter_collection.find_one_and_update(
+        {"email": subscription_data.email},
+        [{"$set": {
+            "id": {"$ifNull": ["$id", subscriber.id]},
+            "created_at": {"$cond": [
+                {"$eq": ["$status", "subscribed"]}, "$created_at", subscriber.created_at
+            ]},
+            "status": "subscribed"
+        }}],
+        projection={"_id": 0, "status": 1},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE
+    )
     
     if existing:
         # If already subscribed
@@ -22,34 +39,31 @@ async def subscribe_to_newsletter(subscription_data: NewsletterSubscribe):
                 "message": "This email is already subscribed to our newsletter",
                 "status": "already_subscribed"
             }
-        # If previously unsubscribed, resubscribe
-        else:
-            await newsletter_collection.update_one(
-                {"email": subscription_data.email},
-                {"$set": {"status": "subscribed", "created_at": datetime.utcnow()}}
-            )
-            return {
-                "message": "Successfully resubscribed to newsletter!",
-                "status": "resubscribed"
-            }
+        # If previously unsubscribed, resubscribed above
+        return {
+            "message": "Successfully resubscribed to newsletter!",
+            "status": "resubscribed"
+        }
     
-    # Create new subscriber
-    subscriber = NewsletterSubscriber(**subscription_data.model_dump())
-    doc = subscriber.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    
-    await newsletter_collection.insert_one(doc)
+    # New subscriber created by the upsert
     return {
         "message": "Successfully subscribed to newsletter!",
         "status": "subscribed"
     }
 
 @router.get("/admin/all", response_model=List[NewsletterResponse])
-async def get_all_subscribers(admin = Depends(get_current_admin)):
+async def get_all_subscribers(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        NewsletterResponse,
+        sortable=("created_at", "email"),
+        default_limit=10000
+    )),
+    admin = Depends(get_current_admin)
+):
     """Get all newsletter subscribers (admin only)"""
-    cursor = newsletter_collection.find().sort("created_at", -1)
-    subscribers = await cursor.to_list(length=10000)
-    return [serialize_document(subscriber) for subscriber in subscribers]
+    subscribers = await page.fetch(newsletter_collection, {})
+    return page.respond(response, subscribers, serialize_document)
 
 @router.delete("/admin/{subscriber_id}")
 async def delete_subscriber(subscriber_id: str, admin = Depends(get_current_admin)):
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 from schemas.note import NoteCreate, NoteUpdate, NoteResponse
 from database import db
 from auth.admin_auth import get_current_admin
 from models.note import Note
+from utils.dates import to_iso
+from utils.pagination import PageRequest, paginate
 from datetime import datetime
 
 router = APIRouter(prefix="/notes", tags=["notes"])
@@ -13,7 +15,14 @@ notes_collection = db['notes']
 
 @router.get("/", response_model=List[NoteResponse])
 async def get_all_notes(
+    response: Response,
     search: str = None,
+    page: PageRequest = Depends(paginate(
+        NoteResponse,
+        sortable=("updated_at", "created_at", "name"),
+        default_sort="-updated_at",
+        default_limit=1000
+    )),
     current_admin: dict = Depends(get_current_admin)
 ):
     """Get all notes with optional search"""
@@ -27,22 +36,18 @@ async def get_all_notes(
             {"tags": {"$regex": search, "$options": "i"}}
         ]
     
-    # Fetch notes sorted by updated_at
-    notes = await notes_collection.find(query).sort("updated_at", -1).to_list(1000)
+    # Fetch notes sorted by updated_at unless another sort is requested
+    notes = await page.fetch(notes_collection, query)
     
-    result = []
-    for note in notes:
-        result.append({
-            "id": note['id'],
-            "name": note['name'],
-            "content": note['content'],
-            "created_at": note['created_at'] if isinstance(note['created_at'], str) else note['created_at'].isoformat(),
-            "updated_at": note['updated_at'] if isinstance(note['updated_at'], str) else note['updated_at'].isoformat(),
-            "created_by": note.get('created_by', 'admin'),
-            "tags": note.get('tags', [])
-        })
-    
-    return result
+    return page.respond(response, notes, lambda note: {
+        "id": note['id'],
+        "name": note['name'],
+        "content": note['content'],
+        "created_at": to_iso(note['created_at']),
+        "updated_at": to_iso(note['updated_at']),
+        "created_by": note.get('created_by', 'admin'),
+        "tags": note.get('tags', [])
+    })
 
 @router.get("/{note_id}", response_model=NoteResponse)
 async def get_note(
@@ -58,8 +63,8 @@ async def get_note(
         "id": note['id'],
         "name": note['name'],
         "content": note['content'],
-        "created_at": note['created_at'] if isinstance(note['created_at'], str) else note['created_at'].isoformat(),
-        "updated_at": note['updated_at'] if isinstance(note['updated_at'], str) else note['updated_at'].isoformat(),
+        "created_at": to_iso(note['created_at']),
+        "updated_at": to_iso(note['updated_at']),
         "created_by": note.get('created_by', 'admin'),
         "tags": note.get('tags', [])
     }
@@ -79,8 +84,6 @@ async def create_note(
     )
     
     note_dict = new_note.model_dump()
-    note_dict['created_at'] = note_dict['created_at'].isoformat()
-    note_dict['updated_at'] = note_dict['updated_at'].isoformat()
     
     await notes_collection.insert_one(note_dict)
     
@@ -107,7 +110,7 @@ async def update_note(
     
     # Prepare update data
     update_data = note_data.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
     await notes_collection.update_one(
         {"id": note_id},
@@ -121,8 +124,8 @@ async def update_note(
         "id": updated_note['id'],
         "name": updated_note['name'],
         "content": updated_note['content'],
-        "created_at": updated_note['created_at'] if isinstance(updated_note['created_at'], str) else updated_note['created_at'].isoformat(),
-        "updated_at": updated_note['updated_at'] if isinstance(updated_note['updated_at'], str) else updated_note['updated_at'].isoformat(),
+        "created_at": to_iso(updated_note['created_at']),
+        "updated_at": to_iso(updated_note['updated_at']),
         "created_by": updated_note.get('created_by', 'admin'),
         "tags": updated_note.get('tags', [])
     }
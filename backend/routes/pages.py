@@ -1,58 +1,66 @@
 from fastapi import APIRouter, HTTPException, status
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from schemas.page_content import PageContentCreate, PageContentUpdate, PageContentResponse
 from database import page_content_collection
 from utils import serialize_document
+from utils.cache import LocalCache
 from models import PageContent
 from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+import uuid
 
 router = APIRouter(prefix="/pages", tags=["pages"])
 
-@router.get("/{page_name}")
-async def get_page_content(page_name: str):
-    """Get all content sections for a specific page"""
-    cursor = page_content_collection.find({"page": page_name})
+# {page_name: {section: content}}, dropped whenever the page is written
+page_cache = LocalCache("pages")
+
+
+async def _load_page(page_name: str) -> Dict[str, Any]:
+    # Served by the unique (page, section) index
+    cursor = page_content_collection.find(
+        {"page": page_name},
+        {"_id": 0, "section": 1, "content": 1}
+    )
     sections = await cursor.to_list(length=100)
-    
-    # Organize by section
-    result = {}
-    for section_doc in sections:
-        section_doc = serialize_document(section_doc)
-        section_name = section_doc['section']
-        result[section_name] = section_doc['content']
-    
+    return {section_doc['section']: section_doc['content'] for section_doc in sections}
+
+@router.get("/{page_name}")
+async def get_page_content(page_name: str, sections: Optional[str] = None):
+    """
+    Get all content sections for a specific page, organized by section.
+    ?sections=hero,features returns only those sections.
+    """
+    result = await page_cache.get_or_load(page_name, lambda: _load_page(page_name))
+    if sections:
+        wanted = {name.strip() for name in sections.split(",")}
+        return {name: content for name, content in result.items() if name in wanted}
     return result
 
 @router.put("/{page_name}")
 async def update_page_content(page_name: str, content: Dict[str, Any]):
     """Update page content (receives full page content object)"""
-    # Update or create each section
+    if not content:
+        return {"message": "Page content updated successfully"}
+    
+    # Update or create every section in one round trip
+    now = datetime.utcnow()
+    operations = []
     for section_name, section_content in content.items():
-        # Check if section exists
-        existing = await page_content_collection.find_one({
-            "page": page_name,
-            "section": section_name
-        })
-        
-        if existing:
-            # Update existing section
-            await page_content_collection.update_one(
-                {"page": page_name, "section": section_name},
-                {"$set": {
-                    "content": section_content,
-                    "updated_at": datetime.utcnow().isoformat()
-                }}
-            )
-        else:
-            # Create new section
-            page_content = PageContent(
-                page=page_name,
-                section=section_name,
-                content=section_content
-            )
-            doc = page_content.model_dump()
-            doc['updated_at'] = doc['updated_at'].isoformat()
-            await page_content_collection.insert_one(doc)
+        operations.append(UpdateOne(
+            {"page": page_name, "section": section_name},
+            {
+                "$set": {"content": section_content, "updated_at": now},
+                "$setOnInsert": {"id": str(uuid.uuid4()), "visible": True}
+            },
+            upsert=True
+        ))
+    
+    try:
+        await page_content_collection.bulk_write(operations, ordered=False)
+    finally:
+        # Also after a failed write, which may have applied some sections
+        page_cache.invalidate(page_name)
     
     return {"message": "Page content updated successfully"}
 
@@ -61,7 +69,13 @@ async def create_page_section(page_data: PageContentCreate):
     """Create a new page section"""
     page_content = PageContent(**page_data.model_dump())
     doc = page_content.model_dump()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
-    await page_content_collection.insert_one(doc)
+    try:
+        await page_content_collection.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Section already exists on this page"
+        )
+    page_cache.invalidate(page_content.page)
     return serialize_document(doc)
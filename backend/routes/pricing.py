@@ -49,7 +49,6 @@ async def get_pricing():
         
         # Insert default pricing
         doc = default_pricing.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
         await pricing_collection.insert_one(doc)
         
         return default_pricing.model_dump()
@@ -65,7 +64,7 @@ async def update_pricing(
     existing = await pricing_collection.find_one({"id": "pricing_config"})
     
     update_data = pricing_data.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
     if existing:
         # Update existing pricing
@@ -84,7 +83,6 @@ async def update_pricing(
             currency_symbol=pricing_data.currency_symbol or "₹"
         )
         doc = pricing.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
         await pricing_collection.insert_one(doc)
     
     updated_pricing = await pricing_collection.find_one({"id": "pricing_config"})
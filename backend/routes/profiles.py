@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import FileResponse
+from auth.admin_auth import require_super_admin
+from utils.profiling import profile_store, PROFILING_ENABLED, PROFILE_MAX_FILES, SamplingProfiler
+import asyncio
+
+router = APIRouter(prefix="/admin/profiles", tags=["admin-profiles"])
+
+@router.get("/")
+async def list_profiles(admin = Depends(require_super_admin)):
+    """List stored request profiles, newest first (Super admin only)"""
+    profiles = await asyncio.to_thread(profile_store.list)
+    return {
+        "enabled": PROFILING_ENABLED,
+        "sampling_profiler": SamplingProfiler is not None,
+        "max_profiles": PROFILE_MAX_FILES,
+        "profiles": profiles
+    }
+
+@router.get("/{profile_id}")
+async def download_profile(profile_id: str, admin = Depends(require_super_admin)):
+    """Download a stored profile (Super admin only)"""
+    found = await asyncio.to_thread(profile_store.get, profile_id)
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    path, filename, media_type = found
+    return FileResponse(path, media_type=media_type, filename=filename)
+
+@router.delete("/{profile_id}")
+async def delete_profile(profile_id: str, admin = Depends(require_super_admin)):
+    """Delete a stored profile (Super admin only)"""
+    if not await asyncio.to_thread(profile_store.delete, profile_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return {"message": "Profile deleted successfully"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
 from schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
 from database import projects_collection
@@ -6,22 +6,28 @@ from utils import serialize_document, create_slug
 from models import Project
 from datetime import datetime
 from auth.admin_auth import get_current_admin
+from utils.pagination import PageRequest, paginate
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.get("/", response_model=List[ProjectResponse])
-async def get_projects():
-    """Get public projects only (for public portfolio page)"""
-    cursor = projects_collection.find({"is_private": {"$ne": True}}).sort("created_at", -1)
-    projects = await cursor.to_list(length=100)
-    return [serialize_document(project) for project in projects]
+async def get_projects(
+    response: Response,
+    page: PageRequest = Depends(paginate(ProjectResponse, sortable=("created_at", "title", "views", "trending")))
+):
+    """Get public projects only (for public portfolio page); sort=-views or sort=-trending for popular ones"""
+    projects = await page.fetch(projects_collection, {"is_private": {"$ne": True}})
+    return page.respond(response, projects, serialize_document)
 
 @router.get("/all", response_model=List[ProjectResponse])
-async def get_all_projects(current_admin: dict = Depends(get_current_admin)):
+async def get_all_projects(
+    response: Response,
+    page: PageRequest = Depends(paginate(ProjectResponse, sortable=("created_at", "updated_at", "title", "views", "trending"))),
+    current_admin: dict = Depends(get_current_admin)
+):
     """Get all projects including private ones (admin only)"""
-    cursor = projects_collection.find().sort("created_at", -1)
-    projects = await cursor.to_list(length=100)
-    return [serialize_document(project) for project in projects]
+    projects = await page.fetch(projects_collection, {})
+    return page.respond(response, projects, serialize_document)
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(project_id: str):
@@ -43,8 +49,6 @@ async def create_project(project_data: ProjectCreate):
     
     project = Project(**project_data.model_dump())
     doc = project.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
     await projects_collection.insert_one(doc)
     return serialize_document(doc)
@@ -67,7 +71,7 @@ async def update_project(project_id: str, project_data: ProjectUpdate):
     if 'title' in update_data and 'slug' not in update_data:
         update_data['slug'] = create_slug(update_data['title'])
     
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
     await projects_collection.update_one(
         {"id": project_id},
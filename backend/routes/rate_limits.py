@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Depends
+from auth.admin_auth import require_super_admin
+from utils.rate_limit import limiter
+
+router = APIRouter(prefix="/admin/rate-limits", tags=["admin-rate-limits"])
+
+@router.get("/")
+async def get_rate_limit_metrics(admin = Depends(require_super_admin)):
+    """Get rate limit policies with allowed/limited counters for this worker (Super admin only)"""
+    return limiter.get_metrics()
@@ -0,0 +1,218 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from pymongo.errors import ExecutionTimeout
+from database import (
+    clients_collection,
+    client_projects_collection,
+    bookings_collection,
+    contacts_collection,
+    newsletter_collection,
+    conversations_collection
+)
+from schemas.search import GlobalSearchResponse
+from auth.admin_auth import get_current_admin, check_permission
+import asyncio
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/search", tags=["admin-search"])
+
+# Server-side time budget for each collection branch
+SEARCH_MAX_TIME_MS = int(os.environ.get("SEARCH_MAX_TIME_MS", 500))
+# Candidates fetched from each collection for ranking, as a multiple of limit
+SEARCH_CANDIDATE_FACTOR = int(os.environ.get("SEARCH_CANDIDATE_FACTOR", 5))
+# Also match anywhere inside values, when prefixes find too few candidates
+# (unanchored, so this scans the collection within SEARCH_MAX_TIME_MS)
+SEARCH_SUBSTRING = os.environ.get("SEARCH_SUBSTRING", "false").lower() == "true"
+
+# Each searchable collection: the fields to match on (in priority order),
+# the field shown as title/subtitle, and the permission needed to see it.
+SEARCH_TARGETS = [
+    {
+        "type": "client",
+        "collection": clients_collection,
+        "fields": ["name", "email", "company"],
+        "title": "name",
+        "subtitle": "email",
+        "permission": None
+    },
+    {
+        "type": "client_project",
+        "collection": client_projects_collection,
+        "fields": ["name"],
+        "title": "name",
+        "subtitle": "status",
+        "permission": None
+    },
+    {
+        "type": "booking",
+        "collection": bookings_collection,
+        "fields": ["name", "email"],
+        "title": "name",
+        "subtitle": "email",
+        "permission": None
+    },
+    {
+        "type": "contact",
+        "collection": contacts_collection,
+        "fields": ["name", "email"],
+        "title": "name",
+        "subtitle": "email",
+        "permission": None
+    },
+    {
+        "type": "newsletter",
+        "collection": newsletter_collection,
+        "fields": ["email"],
+        "title": "email",
+        "subtitle": "status",
+        "permission": None
+    },
+    {
+        "type": "conversation",
+        "collection": conversations_collection,
+        "fields": ["customer_name", "customer_email"],
+        "title": "customer_name",
+        "subtitle": "customer_email",
+        "permission": "canAccessChat"
+    }
+]
+
+def score_match(value, query: str) -> int:
+    """Rank how well a field value matches the (lowercased) query"""
+    if not isinstance(value, str):
+        return 0
+    value = value.lower()
+    if value == query:
+        return 100
+    if value.startswith(query):
+        return 60
+    if re.search(r'\b' + re.escape(query), value):
+        return 40
+    if query in value:
+        return 20
+    return 0
+
+def search_filters(fields: list, query: str) -> list:
+    """
+    Filters for the matches of query, best first: exact values, then
+    anchored prefixes, both case-sensitive as typed and in the usual casings
+    of names and emails, so each walks the field index as a point or bounded
+    range. With SEARCH_SUBSTRING, case-insensitive substrings come last.
+    """
+    variants = list(dict.fromkeys([query, query.lower(), query.capitalize(), query.title()]))
+    filters = [
+        {"$or": [{field: {"$in": variants}} for field in fields]},
+        {"$or": [{field: {"$regex": f"^{re.escape(variant)}"}} for field in fields for variant in variants]}
+    ]
+    if SEARCH_SUBSTRING:
+        filters.append({"$or": [{field: {"$regex": re.escape(query), "$options": "i"}} for field in fields]})
+    return filters
+
+async def search_collection(target: dict, query: str, limit: int) -> dict:
+    """
+    Run one capped, time-budgeted search branch: fetch up to
+    SEARCH_CANDIDATE_FACTOR x limit matches, best kinds of match first, rank
+    them and keep the best limit.
+    """
+    projection = {"_id": 0, "id": 1}
+    for field in target["fields"] + [target["title"], target["subtitle"]]:
+        projection[field] = 1
+    candidates = limit * SEARCH_CANDIDATE_FACTOR
+
+    docs = []
+    timed_out = False
+    try:
+        for filter_ in search_filters(target["fields"], query):
+            if docs:
+                filter_ = {"$and": [filter_, {"id": {"$nin": [doc.get("id") for doc in docs]}}]}
+            cursor = (
+                target["collection"]
+                .find(filter_, projection)
+                .limit(candidates - len(docs))
+                .max_time_ms(SEARCH_MAX_TIME_MS)
+            )
+            docs += await cursor.to_list(length=candidates - len(docs))
+            if len(docs) >= candidates:
+                break
+    except ExecutionTimeout:
+        # Keep the better matches earlier stages found
+        logger.warning(f"Global search on {target['type']} exceeded {SEARCH_MAX_TIME_MS}ms")
+        timed_out = True
+
+    needle = query.lower()
+    hits = []
+    for doc in docs:
+        best_score, best_field = 0, target["fields"][0]
+        for field in target["fields"]:
+            field_score = score_match(doc.get(field), needle)
+            if field_score > best_score:
+                best_score, best_field = field_score, field
+        hits.append({
+            "type": target["type"],
+            "id": doc.get("id", ""),
+            "title": doc.get(target["title"]) or "",
+            "subtitle": doc.get(target["subtitle"]),
+            "matched_field": best_field,
+            "score": best_score
+        })
+
+    hits.sort(key=lambda hit: (-hit["score"], hit["title"].lower()))
+    return {"type": target["type"], "hits": hits[:limit], "timed_out": timed_out}
+
+@router.get("/", response_model=GlobalSearchResponse)
+async def global_search(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Search clients, client projects, bookings, contacts, newsletter
+    subscribers and chat conversations at once (admin only).
+    `limit` caps the number of hits taken from each collection, the best
+    ranked among its first candidates.
+    """
+    query = q.strip()
+    if len(query) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must be at least 2 characters"
+        )
+
+    targets = [
+        target for target in SEARCH_TARGETS
+        if not target["permission"] or check_permission(current_admin, target["permission"])
+    ]
+
+    started = time.perf_counter()
+    branches = await asyncio.gather(
+        *(search_collection(target, query, limit) for target in targets),
+        return_exceptions=True
+    )
+
+    results = []
+    counts = {}
+    timed_out = []
+    for target, branch in zip(targets, branches):
+        if isinstance(branch, Exception):
+            logger.error(f"Global search on {target['type']} failed: {str(branch)}")
+            counts[target["type"]] = 0
+            continue
+        if branch["timed_out"]:
+            timed_out.append(branch["type"])
+        counts[branch["type"]] = len(branch["hits"])
+        results.extend(branch["hits"])
+
+    # Best matches first; ties keep the collection order of SEARCH_TARGETS
+    type_order = {target["type"]: i for i, target in enumerate(SEARCH_TARGETS)}
+    results.sort(key=lambda hit: (-hit["score"], type_order[hit["type"]], hit["title"].lower()))
+
+    return {
+        "query": query,
+        "results": results,
+        "counts": counts,
+        "timed_out": timed_out,
+        "took_ms": int((time.perf_counter() - started) * 1000)
+    }
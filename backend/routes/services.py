@@ -31,8 +31,6 @@ async def create_service(service_data: ServiceCreate):
     """Create a new service"""
     service = Service(**service_data.model_dump())
     doc = service.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
     
     await services_collection.insert_one(doc)
     return serialize_document(doc)
@@ -50,7 +48,7 @@ async def update_service(service_id: str, service_data: ServiceUpdate):
     
     # Update only provided fields
     update_data = service_data.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
     await services_collection.update_one(
         {"id": service_id},
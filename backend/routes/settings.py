@@ -4,6 +4,7 @@ from database import settings_collection
 from utils import serialize_document
 from models import Settings
 from datetime import datetime
+from pymongo import ReturnDocument
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -29,35 +30,31 @@ async def get_settings():
 @router.put("/", response_model=SettingsResponse)
 async def update_settings(settings_data: SettingsUpdate):
     """Update global settings"""
-    existing = await settings_collection.find_one({"id": "global_settings"})
-    
     update_data = settings_data.model_dump(exclude_unset=True)
-    update_data['updated_at'] = datetime.utcnow().isoformat()
+    update_data['updated_at'] = datetime.utcnow()
     
-    if existing:
-        # Update existing settings
-        await settings_collection.update_one(
-            {"id": "global_settings"},
-            {"$set": update_data}
-        )
-    else:
-        # Create new settings
-        settings = Settings(
-            agency_name=settings_data.agency_name or "MSPN DEV",
-            owner_name=settings_data.owner_name or "Admin",
-            email=settings_data.email or "info@mspndev.com",
-            phone=settings_data.phone or "+1234567890",
-            address=settings_data.address,
-            description=settings_data.description,
-            tagline=settings_data.tagline,
-            social_links=settings_data.social_links or {},
-            theme=settings_data.theme or {},
-            whatsapp_number=settings_data.whatsapp_number,
-            enable_share_buttons=settings_data.enable_share_buttons if settings_data.enable_share_buttons is not None else True
-        )
-        doc = settings.model_dump()
-        doc['updated_at'] = doc['updated_at'].isoformat()
-        await settings_collection.insert_one(doc)
+    # Defaults only apply when the settings document is created by this upsert
+    defaults = Settings(
+        agency_name=settings_data.agency_name or "MSPN DEV",
+        owner_name=settings_data.owner_name or "Admin",
+        email=settings_data.email or "info@mspndev.com",
+        phone=settings_data.phone or "+1234567890",
+        address=settings_data.address,
+        description=settings_data.description,
+        tagline=settings_data.tagline,
+        social_links=settings_data.social_links or {},
+        theme=settings_data.theme or {},
+        whatsapp_number=settings_data.whatsapp_number,
+        enable_share_buttons=settings_data.enable_share_buttons if settings_data.enable_share_buttons is not None else True
+    ).model_dump(exclude={"id"})
     
-    updated_settings = await settings_collection.find_one({"id": "global_settings"})
+    updated_settings = await settings_collection.find_one_and_update(
+        {"id": "global_settings"},
+        {
+            "$set": update_data,
+            "$setOnInsert": {k: v for k, v in defaults.items() if k not in update_data}
+        },
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
     return serialize_document(updated_settings)
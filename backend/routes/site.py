@@ -0,0 +1,155 @@
+"""
+Site bootstrap: everything the public homepage needs in one response.
+
+GET /site/bootstrap returns settings, content, services, skills, public
+projects, approved testimonials, pricing, about and contact-page content,
+each in the same shape as its own endpoint. The payload is built once,
+with the nine reads running concurrently, and kept as pre-encoded bytes
+(plain plus one copy per negotiated compression) with a content hash as
+its version and ETag, so a cached homepage load costs no MongoDB query,
+no serialization and no compression, and a revalidation is a 304.
+
+The snapshot is rebuilt only after a write: server.py mounts the source
+routers with invalidate_site_bootstrap, which drops it once any non-GET
+request on them has finished. Other workers pick the change up within
+CACHE_TTL_SECONDS (see utils/cache.py).
+"""
+from fastapi import APIRouter, Request, Response
+from typing import Any, Dict, List
+from database import projects_collection, testimonials_collection
+from middleware import ENCODERS, negotiate_encoding
+from schemas.about import AboutContentResponse
+from schemas.content import ContentResponse
+from schemas.pricing import PricingResponse
+from schemas.project import ProjectResponse
+from schemas.service import ServiceResponse
+from schemas.settings import SettingsResponse
+from schemas.testimonial import TestimonialResponse
+from routes.about import get_about_content
+from routes.contact_page import get_contact_page
+from routes.content import get_content
+from routes.pricing import get_pricing
+from routes.services import get_services
+from routes.settings import get_settings
+from routes.skills import get_skills
+from routes.testimonials import testimonial_helper
+from utils import serialize_document
+from utils.cache import LocalCache
+from utils.responses import get_type_adapter
+import asyncio
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+router = APIRouter(prefix="/site", tags=["site"])
+
+bootstrap_cache = LocalCache("site_bootstrap", maxsize=1)
+
+
+async def _get_public_projects():
+    cursor = projects_collection.find({"is_private": {"$ne": True}}).sort("created_at", -1)
+    return [serialize_document(project) for project in await cursor.to_list(length=100)]
+
+
+async def _get_public_testimonials():
+    cursor = testimonials_collection.find({"status": "approved"}).sort("created_at", -1)
+    return [testimonial_helper(testimonial) for testimonial in await cursor.to_list(length=1000)]
+
+
+# payload key -> (loader, response type of the standalone endpoint or None)
+SECTIONS = {
+    "settings": (get_settings, SettingsResponse),
+    "content": (get_content, ContentResponse),
+    "services": (get_services, List[ServiceResponse]),
+    "skills": (get_skills, None),
+    "projects": (_get_public_projects, List[ProjectResponse]),
+    "testimonials": (_get_public_testimonials, List[TestimonialResponse]),
+    "pricing": (get_pricing, PricingResponse),
+    "about": (get_about_content, AboutContentResponse),
+    "contact_page": (get_contact_page, Dict[str, Any]),
+}
+
+
+def _to_json(section: Any, response_type: Any) -> Any:
+    """What the section's own endpoint would send, as JSON-ready data"""
+    if response_type is None:
+        return get_type_adapter(Any).dump_python(section, mode="json")
+    adapter = get_type_adapter(response_type)
+    return adapter.dump_python(adapter.validate_python(section), mode="json")
+
+
+def _dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class BootstrapSnapshot:
+    """One built payload with its version and lazily compressed bodies"""
+
+    def __init__(self, sections: dict):
+        version = hashlib.sha256(_dumps(sections)).hexdigest()[:16]
+        self.version = version
+        self.bodies = {None: _dumps({"version": version, **sections})}
+
+    def body(self, encoding) -> bytes:
+        if encoding not in self.bodies:
+            encoder = ENCODERS[encoding]()
+            self.bodies[encoding] = encoder.compress(self.bodies[None]) + encoder.finish()
+        return self.bodies[encoding]
+
+    def etag(self, encoding) -> str:
+        # One strong validator per representation, all sharing the version
+        return f'"{self.version}-{encoding}"' if encoding else f'"{self.version}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag[2:] if tag.startswith("W/") else tag
+            if tag.strip('"').split("-")[0] == self.version:
+                return True
+        return False
+
+
+async def build_bootstrap() -> BootstrapSnapshot:
+    results = await asyncio.gather(*(loader() for loader, _ in SECTIONS.values()))
+    sections = {
+        key: _to_json(result, response_type)
+        for (key, (_, response_type)), result in zip(SECTIONS.items(), results)
+    }
+    return BootstrapSnapshot(sections)
+
+
+async def invalidate_site_bootstrap(request: Request):
+    """Router dependency: drop the snapshot after any write on a source router"""
+    try:
+        yield
+    finally:
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            bootstrap_cache.invalidate()
+
+
+@router.get("/bootstrap")
+async def get_site_bootstrap(request: Request):
+    """All public homepage data in one cached, versioned response"""
+    snapshot = await bootstrap_cache.get_or_load("bootstrap", build_bootstrap)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": snapshot.etag(encoding),
+        "Cache-Control": "public, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and snapshot.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(snapshot.body(encoding), media_type="application/json", headers=headers)
@@ -33,7 +33,6 @@ async def create_skill(
     )
     
     skill_dict = skill.model_dump()
-    skill_dict['created_at'] = skill_dict['created_at'].isoformat()
     
     await skills_collection.insert_one(skill_dict)
     
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, Query
+from auth.admin_auth import require_super_admin
+from database import db
+from utils.dates import to_iso
+from utils.slow_queries import (
+    SLOW_QUERIES, SLOW_QUERY_EXPLAINS, SLOW_QUERY_LOG_ENABLED, slow_query_log
+)
+
+router = APIRouter(prefix="/admin/slow-queries", tags=["admin-slow-queries"])
+
+@router.get("/")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    admin = Depends(require_super_admin)
+):
+    """Top slow query shapes by total time, with their explain plans (Super admin only)"""
+    offenders = await db[SLOW_QUERIES].find().sort("total_ms", -1).limit(limit).to_list(limit)
+
+    explains = await db[SLOW_QUERY_EXPLAINS].find(
+        {"shape_id": {"$in": [offender["_id"] for offender in offenders]}},
+        {"_id": 0, "shape_id": 1, "plan": 1, "explained_at": 1}
+    ).to_list(None)
+    plans = {explain["shape_id"]: explain for explain in explains}
+
+    results = []
+    for offender in offenders:
+        explain = plans.get(offender["_id"])
+        results.append({
+            "shape_id": offender["_id"],
+            "collection": offender.get("collection"),
+            "command": offender.get("command"),
+            "shape": offender.get("shape"),
+            "count": offender.get("count", 0),
+            "total_ms": round(offender.get("total_ms", 0), 1),
+            "avg_ms": round(offender.get("total_ms", 0) / max(offender.get("count", 1), 1), 1),
+            "max_ms": round(offender.get("max_ms", 0), 1),
+            "routes": offender.get("routes", []),
+            "first_seen": to_iso(offender.get("first_seen")),
+            "last_seen": to_iso(offender.get("last_seen")),
+            "plan": explain["plan"] if explain else None,
+            "explained_at": to_iso(explain["explained_at"]) if explain else None
+        })
+
+    return {
+        "enabled": SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": slow_query_log.threshold_ms,
+        "dropped": slow_query_log.dropped,
+        "slow_queries": results
+    }
+
+@router.delete("/")
+async def reset_slow_queries(admin = Depends(require_super_admin)):
+    """Clear the slow-query aggregates so shapes are explained again (Super admin only)"""
+    result = await db[SLOW_QUERIES].delete_many({})
+    return {"message": "Slow query log cleared", "deleted": result.deleted_count}
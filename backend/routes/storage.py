@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Response
 from typing import List
-from schemas.storage import StorageItemCreate, StorageItemUpdate
+from schemas.storage import StorageItemCreate, StorageItemUpdate, StorageItemResponse
 from database import storage_collection
 from auth.admin_auth import get_current_admin, check_permission
 from models.storage import StorageItem
+from utils.pagination import PageRequest, paginate
 from datetime import datetime
 import os
 import shutil
@@ -16,7 +17,16 @@ UPLOAD_DIR = Path("/app/public/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @router.get("/items")
-async def get_storage_items(current_admin: dict = Depends(get_current_admin)):
+async def get_storage_items(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        StorageItemResponse,
+        sortable=("created_at", "updated_at", "title", "type"),
+        default_limit=1000,
+        field_map={"createdAt": "created_at", "createdBy": "created_by", "updatedAt": "updated_at"}
+    )),
+    current_admin: dict = Depends(get_current_admin)
+):
     """Get all storage items visible to current admin"""
     # Super admin can see all, others need canAccessStorage permission
     if current_admin['role'] == 'super_admin':
@@ -36,25 +46,21 @@ async def get_storage_items(current_admin: dict = Depends(get_current_admin)):
             ]
         }
     
-    items = await storage_collection.find(query).to_list(length=1000)
-    
-    result = []
-    for item in items:
-        result.append({
-            "id": item['id'],
-            "title": item['title'],
-            "content": item.get('content', ''),
-            "type": item.get('type', 'note'),
-            "fileUrl": item.get('fileUrl'),
-            "fileName": item.get('fileName'),
-            "tags": item.get('tags', []),
-            "visibleTo": item.get('visibleTo', []),
-            "createdAt": item['created_at'],
-            "createdBy": item['created_by'],
-            "updatedAt": item.get('updated_at', item['created_at'])
-        })
+    items = await page.fetch(storage_collection, query)
     
-    return {"items": result}
+    return page.respond(response, items, lambda item: {
+        "id": item['id'],
+        "title": item['title'],
+        "content": item.get('content', ''),
+        "type": item.get('type', 'note'),
+        "fileUrl": item.get('fileUrl'),
+        "fileName": item.get('fileName'),
+        "tags": item.get('tags', []),
+        "visibleTo": item.get('visibleTo', []),
+        "createdAt": item['created_at'],
+        "createdBy": item['created_by'],
+        "updatedAt": item.get('updated_at', item['created_at'])
+    }, envelope="items")
 
 @router.post("/items")
 async def create_storage_item(
@@ -80,8 +86,6 @@ async def create_storage_item(
     )
     
     item_dict = item.model_dump()
-    item_dict['created_at'] = item_dict['created_at'].isoformat()
-    item_dict['updated_at'] = item_dict['updated_at'].isoformat()
     
     await storage_collection.insert_one(item_dict)
     
@@ -110,7 +114,7 @@ async def update_storage_item(
         )
     
     # Prepare update data
-    update_data = {"updated_at": datetime.utcnow().isoformat()}
+    update_data = {"updated_at": datetime.utcnow()}
     if item_data.title is not None:
         update_data['title'] = item_data.title
     if item_data.content is not None:
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
 from datetime import datetime
 import uuid
@@ -7,6 +7,8 @@ from database import testimonials_collection, clients_collection, client_project
 from schemas.testimonial import TestimonialCreate, TestimonialSubmit, TestimonialUpdate, TestimonialResponse
 from auth.admin_auth import get_current_admin
 from auth.client_auth import get_current_client
+from utils.rate_limit import rate_limit
+from utils.pagination import PageRequest, paginate
 
 router = APIRouter()
 
@@ -38,22 +40,24 @@ def testimonial_helper(testimonial) -> dict:
 # ================================
 
 @router.get("/", response_model=List[TestimonialResponse])
-async def get_public_testimonials():
+async def get_public_testimonials(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        TestimonialResponse,
+        sortable=("created_at", "rating", "name"),
+        default_limit=1000
+    ))
+):
     """Get all approved testimonials (public endpoint)"""
     try:
-        testimonials = []
-        async for testimonial in testimonials_collection.find({"status": "approved"}):
-            testimonials.append(testimonial_helper(testimonial))
-        
-        # Sort by created_at descending (newest first)
-        testimonials.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        return testimonials
+        # Newest first unless another sort is requested
+        testimonials = await page.fetch(testimonials_collection, {"status": "approved"})
+        return page.respond(response, testimonials, testimonial_helper)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching testimonials: {str(e)}")
 
 
-@router.post("/submit", response_model=dict, status_code=201)
+@router.post("/submit", response_model=dict, status_code=201, dependencies=[Depends(rate_limit("testimonials"))])
 async def submit_testimonial(testimonial: TestimonialSubmit):
     """Public endpoint for customers to submit testimonials"""
     try:
@@ -93,17 +97,20 @@ async def submit_testimonial(testimonial: TestimonialSubmit):
 # ================================
 
 @router.get("/admin/all", response_model=List[TestimonialResponse])
-async def get_all_testimonials(current_admin: dict = Depends(get_current_admin)):
+async def get_all_testimonials(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        TestimonialResponse,
+        sortable=("created_at", "updated_at", "rating", "name", "status"),
+        default_limit=1000
+    )),
+    current_admin: dict = Depends(get_current_admin)
+):
     """Get all testimonials (admin only - includes pending)"""
     try:
-        testimonials = []
-        async for testimonial in testimonials_collection.find():
-            testimonials.append(testimonial_helper(testimonial))
-        
-        # Sort by created_at descending (newest first)
-        testimonials.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        return testimonials
+        # Newest first unless another sort is requested
+        testimonials = await page.fetch(testimonials_collection, {})
+        return page.respond(response, testimonials, testimonial_helper)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching testimonials: {str(e)}")
 
@@ -283,17 +290,20 @@ async def submit_client_testimonial(
 
 
 @router.get("/client/my-testimonials", response_model=List[TestimonialResponse])
-async def get_my_testimonials(current_client: dict = Depends(get_current_client)):
+async def get_my_testimonials(
+    response: Response,
+    page: PageRequest = Depends(paginate(
+        TestimonialResponse,
+        sortable=("created_at", "rating", "name"),
+        default_limit=1000
+    )),
+    current_client: dict = Depends(get_current_client)
+):
     """Get all testimonials submitted by the current client"""
     try:
-        testimonials = []
-        async for testimonial in testimonials_collection.find({"client_id": current_client["id"]}):
-            testimonials.append(testimonial_helper(testimonial))
-        
-        # Sort by created_at descending (newest first)
-        testimonials.sort(key=lambda x: x["created_at"], reverse=True)
-        
-        return testimonials
+        # Newest first unless another sort is requested
+        testimonials = await page.fetch(testimonials_collection, {"client_id": current_client["id"]})
+        return page.respond(response, testimonials, testimonial_helper)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching testimonials: {str(e)}")
 
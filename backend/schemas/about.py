@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from utils.dates import IsoDateTime
 
 class AboutValueSchema(BaseModel):
     """Schema for value/principle"""
@@ -84,5 +85,5 @@ class AboutContentResponse(BaseModel):
     cta_description: str
     cta_button_text: str
     cta_button_link: str
-    updated_at: str
+    updated_at: IsoDateTime
     updated_by: Optional[str]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional, Dict
 from models.admin import AdminPermissions
+from utils.dates import IsoDateTime
 
 class AdminCreate(BaseModel):
     username: str
@@ -22,7 +23,7 @@ class AdminResponse(BaseModel):
     username: str
     role: str
     permissions: AdminPermissions
-    created_at: str
+    created_at: IsoDateTime
     created_by: str
 
 class TokenResponse(BaseModel):
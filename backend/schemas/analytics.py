@@ -1,13 +1,19 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 class AnalyticsEventCreate(BaseModel):
     """Schema for creating analytics events"""
-    event_type: str  # 'page_view', 'contact_submission', 'calculator_opened', 'calculator_estimate', 'blog_view'
+    event_type: str  # 'page_view', 'contact_submission', 'calculator_opened', 'calculator_estimate', 'blog_view', 'project_view'
     page_name: Optional[str] = None
     blog_id: Optional[str] = None
     blog_title: Optional[str] = None
+    project_id: Optional[str] = None
+    # Sent with the first event of a visit
+    referrer: Optional[str] = None
+    utm_source: Optional[str] = None
+    utm_medium: Optional[str] = None
+    utm_campaign: Optional[str] = None
 
 class AnalyticsEventResponse(BaseModel):
     """Response schema for analytics events"""
@@ -22,6 +28,7 @@ class PageViewStats(BaseModel):
     """Page view statistics"""
     page_name: str
     count: int
+    unique_visitors: Optional[int] = None
 
 class BlogViewStats(BaseModel):
     """Blog view statistics"""
@@ -29,6 +36,12 @@ class BlogViewStats(BaseModel):
     blog_title: str
     count: int
 
+class TopItem(BaseModel):
+    """Entry of a top-N list; the true count lies in [count - error, count]"""
+    key: str
+    count: int
+    error: int = 0
+
 class AnalyticsSummary(BaseModel):
     """Summary of analytics data"""
     total_page_views: int
@@ -37,4 +50,21 @@ class AnalyticsSummary(BaseModel):
     calculator_estimates: int
     page_views_by_page: List[PageViewStats]
     blog_views: List[BlogViewStats]
+    unique_visitors: int = 0  # approximate (HyperLogLog), about 1.6% error
+    top_referrers: List[TopItem] = []
+    top_campaigns: List[TopItem] = []
     period: str  # 'today', '7days', '30days'
+
+class TopItemsResponse(BaseModel):
+    """Top entries of one dimension over a period"""
+    dimension: str  # 'page', 'referrer', 'utm_source', 'utm_medium', 'utm_campaign'
+    period: str  # 'today', '7days', '30days'
+    items: List[TopItem]
+
+class UniqueVisitorStats(BaseModel):
+    """Approximate unique visitors over a date range (UTC days, inclusive)"""
+    start: date
+    end: date
+    page: str  # '*' for the whole site
+    unique_visitors: int
+    daily: Dict[str, int]  # 'YYYY-MM-DD' -> unique visitors that day
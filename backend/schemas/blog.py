@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from utils.dates import IsoDateTime
 
 class BlogCreate(BaseModel):
     title: str
@@ -40,5 +41,37 @@ class BlogResponse(BaseModel):
     status: str
     seo_title: Optional[str]
     seo_description: Optional[str]
-    created_at: str
-    updated_at: str
+    views: int = 0
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
+
+class RelatedBlog(BaseModel):
+    id: str
+    slug: str
+    title: str
+    excerpt: str
+    cover_image: str
+    category: str
+    reading_time: Optional[int] = None
+    created_at: IsoDateTime
+
+class BlogCard(BaseModel):
+    """List entry without the post body"""
+    id: str
+    title: str
+    slug: str
+    excerpt: str
+    cover_image: str
+    category: str
+    tags: List[str]
+    author: str
+    reading_time: Optional[int] = None
+    views: int = 0
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
+
+class BlogDetailResponse(BlogResponse):
+    """Public post page: content is the rendered HTML"""
+    reading_time: Optional[int] = None
+    word_count: Optional[int] = None
+    related: List[RelatedBlog] = []
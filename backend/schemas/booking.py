@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
+from utils.dates import IsoDate, IstDateTime
 
 class BookingCreate(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
@@ -19,16 +20,16 @@ class BookingResponse(BaseModel):
     name: str
     email: str
     phone: str
-    preferred_date: str
+    preferred_date: IsoDate
     preferred_time_slot: str
     message: Optional[str]
     status: str
     meeting_type: str
     meeting_link: Optional[str]
-    created_at: str
-    updated_at: str
-    confirmed_at: Optional[str]
-    cancelled_at: Optional[str]
+    created_at: IstDateTime
+    updated_at: IstDateTime
+    confirmed_at: Optional[IstDateTime]
+    cancelled_at: Optional[IstDateTime]
     admin_notes: Optional[str]
 
 class AvailableSlot(BaseModel):
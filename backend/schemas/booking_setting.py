@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from utils.dates import IstDateTime
 
 class TimeSlotSchema(BaseModel):
     start_time: str = Field(..., description="Start time in HH:MM format")
@@ -25,5 +26,5 @@ class BookingSettingResponse(BaseModel):
     meeting_type: str
     timezone: str
     is_active: bool
-    created_at: str
-    updated_at: str
+    created_at: IstDateTime
+    updated_at: IstDateTime
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import date
+from utils.dates import IsoDateTime
 
 # Client Schemas
 class ClientCreate(BaseModel):
@@ -34,7 +35,7 @@ class ClientResponse(BaseModel):
     company: Optional[str] = None
     phone: Optional[str] = None
     is_active: bool
-    created_at: str
+    created_at: IsoDateTime
 
 class ClientTokenResponse(BaseModel):
     """Schema for client token response"""
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict
 from datetime import date
+from utils.dates import IsoDate, IsoDateTime
 
 # Project File Schema
 class ProjectFileResponse(BaseModel):
@@ -8,7 +9,7 @@ class ProjectFileResponse(BaseModel):
     id: str
     filename: str
     file_path: str
-    uploaded_at: str
+    uploaded_at: IsoDateTime
     uploaded_by: str
     file_size: Optional[int] = 0
     file_type: Optional[str] = None
@@ -51,11 +52,11 @@ class MilestoneResponse(BaseModel):
     id: str
     title: str
     description: Optional[str] = None
-    due_date: Optional[str] = None
+    due_date: Optional[IsoDate] = None
     status: str
-    completion_date: Optional[str] = None
+    completion_date: Optional[IsoDateTime] = None
     order: int
-    created_at: str
+    created_at: IsoDateTime
 
 # Task Schemas
 class TaskCreate(BaseModel):
@@ -102,10 +103,10 @@ class TaskResponse(BaseModel):
     status: str
     priority: str
     assigned_to: Optional[str] = None
-    due_date: Optional[str] = None
-    completed_at: Optional[str] = None
+    due_date: Optional[IsoDate] = None
+    completed_at: Optional[IsoDateTime] = None
     milestone_id: Optional[str] = None
-    created_at: str
+    created_at: IsoDateTime
 
 # Comment Schemas
 class CommentCreate(BaseModel):
@@ -119,7 +120,7 @@ class CommentResponse(BaseModel):
     user_name: str
     user_type: str
     message: str
-    created_at: str
+    created_at: IsoDateTime
 
 # Chat Message Schemas
 class ChatMessageCreate(BaseModel):
@@ -134,7 +135,7 @@ class ChatMessageResponse(BaseModel):
     sender_type: str  # admin or client
     message: str
     read: bool
-    created_at: str
+    created_at: IsoDateTime
 
 # Activity Log Schema
 class ActivityResponse(BaseModel):
@@ -144,7 +145,7 @@ class ActivityResponse(BaseModel):
     description: str
     user_id: str
     user_name: str
-    timestamp: str
+    timestamp: IsoDateTime
     metadata: Optional[Dict] = None
 
 # Team Member Schemas
@@ -159,7 +160,7 @@ class TeamMemberResponse(BaseModel):
     admin_id: str
     admin_name: str
     role: Optional[str] = None
-    added_at: str
+    added_at: IsoDateTime
 
 # Budget Schemas
 class BudgetUpdate(BaseModel):
@@ -230,9 +231,9 @@ class ClientProjectResponse(BaseModel):
     status: str
     priority: str
     progress: int
-    start_date: Optional[str] = None
-    expected_delivery: Optional[str] = None
-    actual_delivery: Optional[str] = None
+    start_date: Optional[IsoDate] = None
+    expected_delivery: Optional[IsoDate] = None
+    actual_delivery: Optional[IsoDate] = None
     notes: Optional[str] = None
     milestones: List[MilestoneResponse] = []
     tasks: List[TaskResponse] = []
@@ -243,9 +244,9 @@ class ClientProjectResponse(BaseModel):
     team_members: List[TeamMemberResponse] = []
     budget: Optional[BudgetResponse] = None
     tags: List[str] = []
-    created_at: str
-    updated_at: Optional[str] = None
-    last_activity_at: Optional[str] = None
+    created_at: IsoDateTime
+    updated_at: Optional[IsoDateTime] = None
+    last_activity_at: Optional[IsoDateTime] = None
 
 class FileUploadResponse(BaseModel):
     """Schema for file upload response"""
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from utils.dates import IsoDateTime
 
 class CredentialCreate(BaseModel):
     name: str
@@ -22,6 +23,6 @@ class CredentialResponse(BaseModel):
     value: str  # Will be masked for non-super-admins
     category: str
     description: Optional[str] = None
-    created_at: str
-    updated_at: str
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
     updated_by: str
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ExportCreate(BaseModel):
+    """Datasets to export: analytics, bookings, contacts, client_projects (default all)"""
+    datasets: Optional[List[str]] = None
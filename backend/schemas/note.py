@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
+from utils.dates import IsoDateTime
 
 class NoteCreate(BaseModel):
     name: str
@@ -15,7 +16,7 @@ class NoteResponse(BaseModel):
     id: str
     name: str
     content: str
-    created_at: str
-    updated_at: str
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
     created_by: str
     tags: List[str]
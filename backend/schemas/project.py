@@ -61,3 +61,4 @@ class ProjectResponse(BaseModel):
     project_duration: Optional[str] = None
     team_size: Optional[str] = None
     key_features: Optional[List[str]] = None
+    views: int = 0
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class SearchHit(BaseModel):
+    """A single match from one of the searched collections"""
+    type: str  # client, client_project, booking, contact, newsletter, conversation
+    id: str
+    title: str
+    subtitle: Optional[str] = None
+    matched_field: str
+    score: int
+
+class GlobalSearchResponse(BaseModel):
+    """Merged, ranked results of an admin global search"""
+    query: str
+    results: List[SearchHit]
+    counts: dict  # hits returned per collection type
+    timed_out: List[str]  # collection types that hit their maxTimeMS budget
+    took_ms: int
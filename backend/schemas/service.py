@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
+from utils.dates import IsoDateTime
 
 class ServiceCreate(BaseModel):
     title: str
@@ -30,5 +31,5 @@ class ServiceResponse(BaseModel):
     active: bool = True
     order: int = 0
     slug: Optional[str] = None  # Add slug field
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
+    created_at: Optional[IsoDateTime] = None
+    updated_at: Optional[IsoDateTime] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
+from datetime import datetime
 
 class StorageItemCreate(BaseModel):
     title: str
@@ -18,3 +19,16 @@ class StorageItemUpdate(BaseModel):
     fileName: Optional[str] = None
     tags: Optional[List[str]] = None
     visibleTo: Optional[List[str]] = None
+
+class StorageItemResponse(BaseModel):
+    id: str
+    title: str
+    content: Optional[str] = ""
+    type: str = "note"
+    fileUrl: Optional[str] = None
+    fileName: Optional[str] = None
+    tags: List[str] = []
+    visibleTo: List[str] = []
+    createdAt: datetime
+    createdBy: str
+    updatedAt: datetime
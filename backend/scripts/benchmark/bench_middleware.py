@@ -0,0 +1,123 @@
+"""
+Benchmark the middleware stack: legacy BaseHTTPMiddleware proxy headers
+without compression vs. the pure ASGI stack with negotiated compression.
+
+Both variants mount the real API routers and are driven in-process through
+httpx's ASGI transport, so the numbers reflect middleware + handler cost
+without network noise. Requires a reachable MongoDB (MONGODB_URI) holding
+some data, e.g. after running scripts/seed/seed_complete_portfolio.py.
+
+Usage:
+    cd backend
+    python scripts/benchmark/bench_middleware.py --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from middleware import CompressionMiddleware, ProxyHeaderMiddleware
+from server import api_router
+
+HOT_ENDPOINTS = [
+    "/api/projects/",
+    "/api/services/",
+    "/api/testimonials/",
+    "/api/blogs/",
+    "/api/settings/",
+    "/api/content/",
+]
+
+class LegacyProxyHeaderMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation server.py used before"""
+    async def dispatch(self, request: Request, call_next):
+        forwarded_proto = request.headers.get("X-Forwarded-Proto")
+        if forwarded_proto:
+            request.scope["scheme"] = forwarded_proto
+
+        forwarded_host = request.headers.get("X-Forwarded-Host")
+        if forwarded_host:
+            request.scope["server"] = (forwarded_host, None)
+
+        return await call_next(request)
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+    if variant == "legacy":
+        app.add_middleware(LegacyProxyHeaderMiddleware)
+    else:
+        app.add_middleware(CompressionMiddleware)
+        app.add_middleware(ProxyHeaderMiddleware)
+    app.include_router(api_router)
+    return app
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run_endpoint(client, path, total, concurrency):
+    latencies = []
+    bytes_received = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal bytes_received
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(path, headers={
+                "Accept-Encoding": "zstd, br, gzip",
+                "X-Forwarded-Proto": "https"
+            })
+            latencies.append((time.perf_counter() - started) * 1000)
+            bytes_received += int(response.headers.get("content-length", len(response.content)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "avg_bytes": bytes_received // total
+    }
+
+async def main(args):
+    results = {}
+    for variant in ("legacy", "asgi"):
+        transport = httpx.ASGITransport(app=build_app(variant))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results[variant] = {}
+            for path in args.endpoints:
+                # Warm up connections and any lazy initialisation
+                await run_endpoint(client, path, min(20, args.requests), args.concurrency)
+                results[variant][path] = await run_endpoint(client, path, args.requests, args.concurrency)
+
+    print(f"{'endpoint':<24}{'variant':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>10}")
+    for path in args.endpoints:
+        for variant in ("legacy", "asgi"):
+            row = results[variant][path]
+            print(f"{path:<24}{variant:<8}{row['rps']:>10}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['avg_bytes']:>10}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--endpoints", nargs="+", default=HOT_ENDPOINTS)
+    parser.add_argument("--output", help="write raw results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
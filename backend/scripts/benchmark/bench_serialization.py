@@ -0,0 +1,127 @@
+"""
+Microbenchmark: response serialization of a large ClientProjectResponse.
+
+Compares the validated path (convert_project_to_response validating the
+project into nested models, then FastAPI's response_model validation and
+serialization) with the trusted fast path (project_response_dict's plain
+dicts, rendered once by orjson through trusted_response). Runs fully in-process; no
+database needed.
+
+Usage:
+    cd backend
+    python scripts/benchmark/bench_serialization.py --entries 5000 --rounds 20
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.admin_client_projects import convert_project_to_response, project_response_dict
+from schemas.client_project import ClientProjectResponse
+from utils.responses import FastJSONResponse, trusted_response
+
+def build_project_doc(entries: int) -> dict:
+    """A project document with `entries` nested items spread over its lists"""
+    now = datetime.utcnow()
+    per_list = entries // 5
+
+    def ts(i):
+        return (now - timedelta(minutes=i)).isoformat()
+
+    return {
+        "id": str(uuid.uuid4()),
+        "name": "Benchmark Project",
+        "client_id": str(uuid.uuid4()),
+        "description": "Synthetic project for serialization benchmarks",
+        "status": "in_progress",
+        "priority": "high",
+        "progress": 42,
+        "start_date": "2025-01-01",
+        "expected_delivery": "2025-06-30",
+        "milestones": [
+            {"id": str(uuid.uuid4()), "title": f"Milestone {i}", "description": "Deliverable",
+             "due_date": "2025-03-01", "status": "pending", "order": i, "created_at": ts(i)}
+            for i in range(per_list)
+        ],
+        "tasks": [
+            {"id": str(uuid.uuid4()), "title": f"Task {i}", "description": "Implement feature",
+             "status": "in_progress", "priority": "medium", "assigned_to": "admin-1", "created_at": ts(i)}
+            for i in range(per_list)
+        ],
+        "files": [
+            {"id": str(uuid.uuid4()), "filename": f"file_{i}.pdf", "file_path": f"/uploads/file_{i}.pdf",
+             "uploaded_at": ts(i), "uploaded_by": "admin-1", "file_size": 1024 * i, "file_type": "application/pdf"}
+            for i in range(per_list)
+        ],
+        "comments": [
+            {"id": str(uuid.uuid4()), "user_id": "client-1", "user_name": "Client", "user_type": "client",
+             "message": f"Comment number {i}", "created_at": ts(i)}
+            for i in range(per_list)
+        ],
+        "activity_log": [
+            {"id": str(uuid.uuid4()), "action": "updated", "description": f"Activity {i}",
+             "user_id": "admin-1", "user_name": "Admin", "timestamp": ts(i), "metadata": {"n": i}}
+            for i in range(entries - 4 * per_list)
+        ],
+        "budget": {"total_amount": 10000.0, "currency": "USD", "paid_amount": 2500.0, "pending_amount": 7500.0},
+        "tags": ["benchmark"],
+        "created_at": now.isoformat(),
+    }
+
+def build_app(project_doc: dict) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/validated", response_model=ClientProjectResponse)
+    async def validated():
+        return convert_project_to_response(project_doc)
+
+    @app.get("/trusted", response_model=ClientProjectResponse)
+    async def trusted():
+        return trusted_response(project_response_dict(project_doc))
+
+    return app
+
+def time_endpoint(client: TestClient, path: str, rounds: int) -> list:
+    client.get(path)  # warm up
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    return timings
+
+def main(args):
+    project_doc = build_project_doc(args.entries)
+    client = TestClient(build_app(project_doc))
+
+    validated_body = client.get("/validated").json()
+    trusted_body = client.get("/trusted").json()
+    assert validated_body == trusted_body, "fast path produced a different payload"
+
+    results = {}
+    for path in ("/validated", "/trusted"):
+        timings = time_endpoint(client, path, args.rounds)
+        results[path] = {"mean_ms": statistics.mean(timings), "p50_ms": statistics.median(timings)}
+
+    size_kb = len(json.dumps(trusted_body)) / 1024
+    print(f"ClientProjectResponse with {args.entries} nested entries ({size_kb:.0f} KB JSON), {args.rounds} rounds")
+    for path, row in results.items():
+        print(f"  {path:<12} mean {row['mean_ms']:8.1f} ms   p50 {row['p50_ms']:8.1f} ms")
+    speedup = results["/validated"]["mean_ms"] / results["/trusted"]["mean_ms"]
+    print(f"  speedup: {speedup:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,447 @@
+"""
+Reproducible load test of the full API against a local MongoDB.
+
+The app runs in-process (httpx ASGI transport, real startup hooks and
+middleware) against a dedicated benchmark database, which is dropped and
+re-seeded with synthetic data at --scale (scripts/seed/generate_dataset.py). Virtual users then drive a
+weighted mix of workloads concurrently:
+
+    public      portfolio, services, blogs, testimonials, content pages
+    analytics   POST /api/analytics/event page views
+    bookings    available slots, then a booking on a random slot
+    portal      client-portal chat: send and read project messages
+    admin       dashboards: client projects, clients, booking stats,
+                analytics summary, chat inbox
+
+Throughput and p50/p95/p99 latency per endpoint are written to a JSON
+baseline. With --compare, the run is checked against an earlier baseline
+and endpoints whose p95 or throughput got worse by more than --threshold
+are flagged (exit status 1). Everything random is derived from --seed, so
+two runs issue the same request mix.
+
+MongoDB: --mongo-uri (default MONGODB_URI) or --spawn-mongod to start a
+throwaway `mongod` from PATH on a temporary data directory.
+
+Usage:
+    cd backend
+    python scripts/benchmark/load_test.py --spawn-mongod --scale 2 --duration 30 --output baseline.json
+    python scripts/benchmark/load_test.py --spawn-mongod --scale 2 --duration 30 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from scripts.seed.generate_dataset import PAGES, TIME_SLOTS, generate
+
+BENCH_PASSWORD = "bench-password"
+
+# scenario -> weight in the workload mix
+WORKLOAD_MIX = {
+    "public": 40,
+    "analytics": 25,
+    "portal": 15,
+    "admin": 12,
+    "bookings": 8,
+}
+
+PUBLIC_ENDPOINTS = [
+    "/api/projects/",
+    "/api/services/",
+    "/api/blogs/",
+    "/api/testimonials/",
+    "/api/content/",
+    "/api/settings/",
+    "/api/pricing/",
+]
+
+ADMIN_ENDPOINTS = [
+    "/api/admin/client-projects/",
+    "/api/admin/clients/",
+    "/api/bookings/admin/stats/summary",
+    "/api/analytics/summary?period=7days",
+    "/api/chat/conversations",
+]
+
+
+# ---------------------------------------------------------------------------
+# MongoDB
+# ---------------------------------------------------------------------------
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_mongod():
+    """Start a throwaway mongod; returns (uri, process, data directory)"""
+    binary = shutil.which("mongod")
+    if binary is None:
+        sys.exit("--spawn-mongod needs a `mongod` binary on PATH")
+    data_dir = tempfile.mkdtemp(prefix="mspn-bench-")
+    port = free_port()
+    process = subprocess.Popen(
+        [binary, "--dbpath", data_dir, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+    uri = f"mongodb://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            MongoClient(uri, serverSelectionTimeoutMS=500).admin.command("ping")
+            return uri, process, data_dir
+        except PyMongoError:
+            if time.monotonic() > deadline or process.poll() is not None:
+                process.kill()
+                sys.exit("mongod did not start")
+            time.sleep(0.2)
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def dataset_counts(scale: int) -> dict:
+    """Per-collection volumes for generate_dataset at a given --scale"""
+    return {
+        "clients": 10 * scale,
+        "client_projects": 20 * scale,
+        "analytics": 5000 * scale,
+        "bookings": 200 * scale,
+        "newsletter": 100 * scale,
+        "conversations": 20 * scale,
+        "projects": 10 * scale,
+        "blogs": 15 * scale,
+        "testimonials": 10 * scale,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Workloads
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except Exception:
+            response, status = None, "exception"
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        self.statuses[label][str(status)] += 1
+        return response
+
+
+async def login(client, url: str, payload: dict) -> str:
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    body = response.json()
+    # Admin login returns "token", client login "access_token"
+    return body.get("token") or body["access_token"]
+
+
+async def scenario_public(client, recorder, rng, ctx):
+    path = rng.choice(PUBLIC_ENDPOINTS + ["/api/blogs/{slug}"])
+    if path == "/api/blogs/{slug}":
+        await recorder.request(client, "GET /api/blogs/{slug}", "GET", f"/api/blogs/{rng.choice(ctx['blog_slugs'])}")
+    else:
+        await recorder.request(client, f"GET {path}", "GET", path)
+
+
+async def scenario_analytics(client, recorder, rng, ctx):
+    await recorder.request(client, "POST /api/analytics/event", "POST", "/api/analytics/event", json={
+        "event_type": "page_view", "page_name": rng.choice(PAGES)
+    })
+
+
+async def scenario_bookings(client, recorder, rng, ctx):
+    start = datetime.utcnow().date() + timedelta(days=rng.randint(1, 60))
+    await recorder.request(
+        client, "GET /api/bookings/available-slots", "GET",
+        f"/api/bookings/available-slots?start_date={start.isoformat()}&days=14"
+    )
+    start_time, end_time = rng.choice(TIME_SLOTS)
+    await recorder.request(client, "POST /api/bookings/", "POST", "/api/bookings/", json={
+        "name": "Load Test",
+        "email": f"load{rng.randint(0, 10 ** 6)}@bench.example.com",
+        "phone": "9999999999",
+        "preferred_date": (start + timedelta(days=rng.randint(0, 13))).isoformat(),
+        "preferred_time_slot": f"{start_time}-{end_time}",
+        "message": "Benchmark booking"
+    })
+
+
+async def scenario_portal(client, recorder, rng, ctx):
+    token, project_ids = rng.choice(ctx["client_sessions"])
+    headers = {"Authorization": f"Bearer {token}"}
+    project_id = rng.choice(project_ids)
+    if rng.random() < 0.4:
+        await recorder.request(
+            client, "POST /api/client/projects/{id}/chat", "POST", f"/api/client/projects/{project_id}/chat",
+            json={"message": "Any update on this?"}, headers=headers
+        )
+    await recorder.request(
+        client, "GET /api/client/projects/{id}/chat", "GET", f"/api/client/projects/{project_id}/chat",
+        headers=headers
+    )
+    if rng.random() < 0.3:
+        await recorder.request(client, "GET /api/client/projects/", "GET", "/api/client/projects/", headers=headers)
+
+
+async def scenario_admin(client, recorder, rng, ctx):
+    path = rng.choice(ADMIN_ENDPOINTS)
+    await recorder.request(
+        client, f"GET {path.split('?')[0]}", "GET", path,
+        headers={"Authorization": f"Bearer {ctx['admin_token']}"}
+    )
+
+
+SCENARIOS = {
+    "public": scenario_public,
+    "analytics": scenario_analytics,
+    "bookings": scenario_bookings,
+    "portal": scenario_portal,
+    "admin": scenario_admin,
+}
+
+
+async def virtual_user(client, recorder, rng, ctx, deadline, remaining):
+    names = list(WORKLOAD_MIX)
+    weights = [WORKLOAD_MIX[name] for name in names]
+    while time.monotonic() < deadline:
+        if remaining is not None:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+        await SCENARIOS[rng.choices(names, weights)[0]](client, recorder, rng, ctx)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for label, latencies in sorted(recorder.latencies.items()):
+        statuses = dict(recorder.statuses[label])
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500)
+        endpoints[label] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "statuses": statuses,
+        }
+    all_latencies = [value for latencies in recorder.latencies.values() for value in latencies]
+    total = {
+        "requests": len(all_latencies),
+        "errors": sum(row["errors"] for row in endpoints.values()),
+        "rps": round(len(all_latencies) / elapsed, 2),
+        "p50_ms": round(percentile(all_latencies, 50), 2) if all_latencies else None,
+        "p95_ms": round(percentile(all_latencies, 95), 2) if all_latencies else None,
+        "p99_ms": round(percentile(all_latencies, 99), 2) if all_latencies else None,
+    }
+    return {"endpoints": endpoints, "total": total}
+
+
+def print_report(report: dict):
+    print(f"\n{'endpoint':<46}{'reqs':>7}{'err':>5}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, row in report["endpoints"].items():
+        print(
+            f"{label:<46}{row['requests']:>7}{row['errors']:>5}{row['rps']:>9}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+        )
+    total = report["total"]
+    print(
+        f"{'TOTAL':<46}{total['requests']:>7}{total['errors']:>5}{total['rps']:>9}"
+        f"{total['p50_ms']:>9}{total['p95_ms']:>9}{total['p99_ms']:>9}"
+    )
+
+
+def compare(report: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """Endpoints that regressed against the baseline"""
+    regressions = []
+    for label, row in report["endpoints"].items():
+        base = baseline["endpoints"].get(label)
+        if base is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if row[metric] > base[metric] * (1 + threshold) and row[metric] - base[metric] >= min_delta_ms:
+                regressions.append(f"{label}: {metric} {base[metric]} -> {row[metric]}")
+        if row["rps"] < base["rps"] * (1 - threshold):
+            regressions.append(f"{label}: rps {base['rps']} -> {row['rps']}")
+        if row["errors"] > base["errors"]:
+            regressions.append(f"{label}: errors {base['errors']} -> {row['errors']}")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+async def run(args) -> dict:
+    # Imported late: these read the environment configured in main()
+    import httpx
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from server import app
+
+    mongo = AsyncIOMotorClient(os.environ["MONGODB_URI"])
+    await mongo.drop_database(args.db_name)
+    started = time.perf_counter()
+    ctx = await generate(
+        mongo[args.db_name], dataset_counts(args.scale),
+        seed=args.seed, password=BENCH_PASSWORD, max_activity=200, max_chat=100, verbose=False
+    )
+    print(f"Seeded {args.db_name} at scale {args.scale} in {time.perf_counter() - started:.1f}s")
+
+    for handler in app.router.on_startup:
+        await handler()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            ctx["admin_token"] = await login(
+                client, "/api/admins/login", {"username": ctx["admin_username"], "password": BENCH_PASSWORD}
+            )
+            ctx["client_sessions"] = []
+            for email, project_ids in ctx["clients"]:
+                if len(ctx["client_sessions"]) == 20:
+                    break
+                if not project_ids:
+                    continue
+                try:
+                    token = await login(client, "/api/client/auth/login", {"email": email, "password": BENCH_PASSWORD})
+                except httpx.HTTPStatusError:
+                    continue  # deactivated client
+                ctx["client_sessions"].append((token, project_ids))
+
+            # Warm-up pass, not recorded
+            await asyncio.gather(*(
+                virtual_user(client, Recorder(), random.Random(f"warmup-{i}"), ctx, time.monotonic() + args.warmup, None)
+                for i in range(args.concurrency)
+            ))
+
+            recorder = Recorder()
+            remaining = [args.requests] if args.requests else None
+            deadline = time.monotonic() + (args.duration if not args.requests else 10 ** 9)
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                virtual_user(client, recorder, random.Random(f"{args.seed}-{i}"), ctx, deadline, remaining)
+                for i in range(args.concurrency)
+            ))
+            elapsed = time.perf_counter() - started
+    finally:
+        for handler in app.router.on_shutdown:
+            await handler()
+        if not args.keep_data:
+            await mongo.drop_database(args.db_name)
+        mongo.close()
+
+    report = summarize(recorder, elapsed)
+    report["meta"] = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": WORKLOAD_MIX,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=os.environ.get("MONGODB_URI"))
+    parser.add_argument("--spawn-mongod", action="store_true", help="start a throwaway mongod from PATH")
+    parser.add_argument("--db-name", default="mspn_benchmark", help="dropped and re-seeded on every run")
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the seeded data volume")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of measured load")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many scenarios instead")
+    parser.add_argument("--warmup", type=float, default=3, help="seconds of unrecorded warm-up")
+    parser.add_argument("--output", help="write the JSON report (a baseline) here")
+    parser.add_argument("--compare", help="baseline JSON to check this run against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore latency changes smaller than this")
+    parser.add_argument("--keep-data", action="store_true", help="leave the benchmark database in place")
+    args = parser.parse_args()
+
+    if "bench" not in args.db_name:
+        sys.exit("--db-name must contain 'bench'; the database is dropped on every run")
+
+    mongod = None
+    if args.spawn_mongod:
+        args.mongo_uri, mongod, data_dir = spawn_mongod()
+    if not args.mongo_uri:
+        sys.exit("Set MONGODB_URI, pass --mongo-uri, or use --spawn-mongod")
+
+    # Must be in place before the app (and database.py) is imported
+    os.environ.update({
+        "MONGODB_URI": args.mongo_uri,
+        "DB_NAME": args.db_name,
+        "RATE_LIMIT_ENABLED": "false",
+        "BREVO_API_KEY": "",
+        "LOOP_MONITOR_ENABLED": "false",
+        "PROFILING_ENABLED": "false",
+        "SLOW_QUERY_LOG_ENABLED": "false",
+    })
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait(timeout=30)
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text()), args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  REGRESSION {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
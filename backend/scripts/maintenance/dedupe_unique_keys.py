@@ -0,0 +1,82 @@
+"""
+Merge duplicate values of the keys that must be unique.
+
+Upserts and find_one_and_update calls (newsletter signups, chat
+conversations, page content, ...) rely on unique indexes, which startup
+cannot create while older data holds duplicates (database.UNIQUE_KEYS).
+For every group of documents sharing such a key this keeps the most
+recently active one (updated_at, last_message_at or created_at, native or
+ISO string) and moves the others to `<collection>_duplicates`, so nothing
+is lost and they can be looked at or merged back by hand. Documents missing
+the key count as one group, as they do for the index. The unique indexes
+are created afterwards.
+
+Usage:
+    cd backend
+    python scripts/maintenance/dedupe_unique_keys.py --dry-run
+    python scripts/maintenance/dedupe_unique_keys.py
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import db, UNIQUE_KEYS, ensure_unique_index
+from utils.dates import to_datetime
+
+ACTIVITY_FIELDS = ("updated_at", "last_message_at", "created_at")
+
+
+def last_active(doc: dict) -> datetime:
+    for field in ACTIVITY_FIELDS:
+        value = to_datetime(doc.get(field))
+        if isinstance(value, datetime):
+            return value
+    return datetime.min
+
+
+async def dedupe(collection, keys, dry_run: bool) -> int:
+    key_spec = [(keys, 1)] if isinstance(keys, str) else list(keys)
+    fields = [field for field, _ in key_spec]
+    pipeline = [
+        {"$group": {"_id": {field: f"${field}" for field in fields}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    backup = db[f"{collection.name}_duplicates"]
+    moved = 0
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        docs = await collection.find({"_id": {"$in": group["ids"]}}).to_list(length=None)
+        docs.sort(key=lambda doc: (last_active(doc), str(doc["_id"])), reverse=True)
+        extra = docs[1:]
+        print(f"  • {collection.name} {group['_id']}: keeping {docs[0]['_id']}, moving {len(extra)}")
+        if not dry_run:
+            for doc in extra:
+                await backup.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+            await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in extra]}})
+        moved += len(extra)
+    return moved
+
+
+async def run(dry_run: bool):
+    print(f"🔧 Merging duplicate unique keys{' (dry run)' if dry_run else ''}...")
+    for collection, keys in UNIQUE_KEYS:
+        moved = await dedupe(collection, keys, dry_run)
+        verb = "would move" if dry_run else "moved"
+        print(f"  ✅ {collection.name} ({keys}): {verb} {moved} duplicates")
+        if not dry_run:
+            await ensure_unique_index(collection, keys)
+    print("🎉 Done")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only list the duplicates")
+    args = parser.parse_args()
+    asyncio.run(run(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Convert the analytics collection into a time-series collection.
+
+MongoDB cannot turn an existing collection into a time-series one, so this
+renames `analytics` to `analytics_legacy`, lets the app create the new
+time-series `analytics` (utils/analytics_store.py) and copies the events
+across in timestamp order, moving event_type and page_name into meta.
+Events keep their _id. Progress is checkpointed after every batch in the
+`migrations` collection, so an interrupted run picks up where it stopped;
+time-series collections have no unique _id index, so the first batch after
+a restart skips events the interrupted run had already inserted. Stop the
+backend (or at least analytics ingest) while it runs; the legacy collection
+is only dropped with --drop-legacy.
+
+Usage:
+    cd backend
+    ANALYTICS_TIMESERIES=true python scripts/maintenance/migrate_analytics_timeseries.py
+    ANALYTICS_TIMESERIES=true python scripts/maintenance/migrate_analytics_timeseries.py --drop-legacy
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from database import db, analytics_collection
+from utils.analytics_store import ANALYTICS_TIMESERIES, ensure_analytics_collection, stored_event
+
+LEGACY = "analytics_legacy"
+MIGRATION_ID = "analytics_timeseries_v1"
+migrations_collection = db["migrations"]
+
+
+async def load_checkpoint():
+    state = await migrations_collection.find_one({"_id": MIGRATION_ID})
+    return state or {}
+
+
+async def save_checkpoint(last: list, copied: int, done: bool = False):
+    await migrations_collection.update_one(
+        {"_id": MIGRATION_ID},
+        {"$set": {"last": last, "copied": copied, "done": done, "updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def not_copied(batch: list) -> list:
+    """The events of batch not yet in the new collection"""
+    copied = await analytics_collection.distinct("_id", {
+        "_id": {"$in": [event["_id"] for event in batch]},
+        "timestamp": {"$gte": batch[0]["timestamp"], "$lte": batch[-1]["timestamp"]}
+    })
+    copied = set(copied)
+    return [event for event in batch if event["_id"] not in copied]
+
+
+async def migrate(batch_size: int, drop_legacy: bool):
+    if not ANALYTICS_TIMESERIES:
+        sys.exit("Set ANALYTICS_TIMESERIES=true (here and for the app) first")
+
+    names = await db.list_collection_names()
+    if "analytics" in names and LEGACY not in names:
+        info = await db.list_collections(filter={"name": "analytics"}).to_list(length=1)
+        if info and info[0].get("type") == "timeseries":
+            print("  • analytics is already a time-series collection")
+            return
+        await analytics_collection.rename(LEGACY)
+        print(f"  • renamed analytics to {LEGACY}")
+    elif LEGACY not in names:
+        print("  • no analytics collection to migrate")
+        await ensure_analytics_collection()
+        return
+
+    await ensure_analytics_collection()
+    legacy = db[LEGACY]
+
+    state = await load_checkpoint()
+    last = state.get("last")
+    copied = state.get("copied", 0)
+    total = await legacy.estimated_document_count()
+    first = True
+    while not state.get("done"):
+        # Resume after the last event of the last checkpointed batch
+        query = {}
+        if last is not None:
+            query = {"$or": [{"timestamp": {"$gt": last[0]}}, {"timestamp": last[0], "_id": {"$gt": last[1]}}]}
+        batch = await legacy.find(query).sort([("timestamp", 1), ("_id", 1)]).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        # An interrupted run may have inserted part of the batch after its last checkpoint
+        events = await not_copied(batch) if first else batch
+        first = False
+        if events:
+            await analytics_collection.insert_many([
+                event if "meta" in event else stored_event(event) for event in events
+            ])
+        copied += len(batch)
+        last = [batch[-1]["timestamp"], batch[-1]["_id"]]
+        await save_checkpoint(last, copied)
+        print(f"  • {copied}/{total} events copied", end="\r")
+    if not state.get("done"):
+        await save_checkpoint(last, copied, done=True)
+    print(f"  • {copied}/{total} events copied")
+
+    if drop_legacy:
+        await legacy.drop()
+        print(f"  • dropped {LEGACY}")
+    else:
+        print(f"  • {LEGACY} kept; drop it once the new collection looks right (--drop-legacy)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop-legacy", action="store_true", help="drop analytics_legacy after copying")
+    args = parser.parse_args()
+    print("📈 Migrating analytics to a time-series collection...")
+    asyncio.run(migrate(args.batch_size, args.drop_legacy))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Convert string timestamps to native BSON dates.
+
+Walks every collection listed in utils.dates.DATETIME_FIELDS in _id order,
+converts ISO-string date fields (including nested ones such as a project's
+activity_log entries) and writes them back in batches with bulk_write.
+Progress is checkpointed per collection in the `migrations` collection, so
+an interrupted run picks up where it stopped. Running it again after it has
+finished is a no-op.
+
+Usage:
+    cd backend
+    python scripts/maintenance/migrate_datetimes.py
+    python scripts/maintenance/migrate_datetimes.py --collections bookings,contacts --batch-size 500
+    python scripts/maintenance/migrate_datetimes.py --dry-run
+    python scripts/maintenance/migrate_datetimes.py --restart   # ignore saved checkpoints
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pymongo import UpdateOne
+from database import db
+from utils.dates import DATETIME_FIELDS, normalize_datetimes
+
+MIGRATION_ID = "datetimes_v1"
+migrations_collection = db["migrations"]
+
+
+async def load_checkpoint(collection_name: str):
+    state = await migrations_collection.find_one({"_id": f"{MIGRATION_ID}:{collection_name}"})
+    return state or {}
+
+
+async def save_checkpoint(collection_name: str, last_id, scanned: int, modified: int, done: bool = False):
+    await migrations_collection.update_one(
+        {"_id": f"{MIGRATION_ID}:{collection_name}"},
+        {"$set": {
+            "last_id": last_id,
+            "scanned": scanned,
+            "modified": modified,
+            "done": done,
+            "updated_at": datetime.utcnow()
+        }},
+        upsert=True
+    )
+
+
+async def migrate_collection(collection_name: str, fields: list, batch_size: int, dry_run: bool, restart: bool):
+    collection = db[collection_name]
+    state = {} if restart else await load_checkpoint(collection_name)
+    if state.get("done"):
+        print(f"  • {collection_name}: already migrated, skipping")
+        return
+
+    last_id = state.get("last_id")
+    scanned = state.get("scanned", 0)
+    modified = state.get("modified", 0)
+    projection = {field.split(".")[0]: 1 for field in fields}
+
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await collection.find(query, projection).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        operations = []
+        for doc in batch:
+            changes = normalize_datetimes(doc, fields)
+            if changes:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+
+        if operations and not dry_run:
+            result = await collection.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+        elif dry_run:
+            modified += len(operations)
+
+        scanned += len(batch)
+        last_id = batch[-1]["_id"]
+        if not dry_run:
+            await save_checkpoint(collection_name, last_id, scanned, modified)
+
+    if not dry_run:
+        await save_checkpoint(collection_name, last_id, scanned, modified, done=True)
+
+    verb = "would update" if dry_run else "updated"
+    print(f"  ✅ {collection_name}: scanned {scanned}, {verb} {modified}")
+
+
+async def migrate(collections: list, batch_size: int, dry_run: bool, restart: bool):
+    print(f"🔧 Migrating timestamps to native dates{' (dry run)' if dry_run else ''}...")
+    for collection_name in collections:
+        await migrate_collection(collection_name, DATETIME_FIELDS[collection_name], batch_size, dry_run, restart)
+    print("🎉 Done")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collections", help="Comma-separated subset of collections (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    parser.add_argument("--restart", action="store_true", help="Ignore saved checkpoints")
+    args = parser.parse_args()
+
+    names = args.collections.split(",") if args.collections else list(DATETIME_FIELDS)
+    unknown = [name for name in names if name not in DATETIME_FIELDS]
+    if unknown:
+        parser.error(f"Unknown collections: {', '.join(unknown)}")
+
+    asyncio.run(migrate(names, args.batch_size, args.dry_run, args.restart))
@@ -0,0 +1,524 @@
+"""
+Synthetic large-dataset generator for capacity testing.
+
+Generates realistic, deterministic data at any scale: clients and client
+projects (long-tailed task, milestone, file, activity-log and chat
+distributions, multi-currency budgets), analytics events, bookings,
+newsletter subscribers and chat-widget conversations, plus a small
+portfolio (projects, blogs, testimonials), a super admin and active booking
+settings so the whole app works against the result.
+
+Every batch draws from its own generator seeded by (--seed, collection,
+batch number), so the same arguments always produce the same documents,
+whatever order the batches finish in. Batches are written with unordered
+insert_many, --workers at a time.
+
+Usage:
+    cd backend
+    # ~1.1M documents
+    python scripts/seed/generate_dataset.py --drop --clients 2000 --client-projects 5000 \\
+        --analytics 1000000 --bookings 100000
+
+All generated accounts (clients and the `dataset-admin` super admin) share
+the --password. Point DB_NAME at a scratch database: --drop drops every
+collection this script writes to (restart the app afterwards so its indexes
+are recreated).
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+ID_NAMESPACE = uuid.UUID("6f1c8e52-4d0b-4a8e-9a57-0c3f7f2b9d11")
+
+PAGES = ["home", "about", "services", "portfolio", "blog", "contact", "pricing"]
+PAGE_WEIGHTS = [40, 8, 15, 14, 12, 7, 4]
+EVENT_TYPES = ["page_view", "blog_view", "contact_submission", "calculator_opened", "calculator_estimate"]
+EVENT_WEIGHTS = [80, 12, 3, 3, 2]
+ALL_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TIME_SLOTS = [("09:00", "10:00"), ("10:00", "11:00"), ("11:00", "12:00"), ("14:00", "15:00"), ("15:00", "16:00")]
+CURRENCIES = ["INR", "USD", "EUR", "GBP", "AED", "SGD", "AUD", "CAD"]
+CURRENCY_WEIGHTS = [40, 30, 10, 8, 4, 3, 3, 2]
+VOCABULARY = (
+    "design build launch scale cloud data api mobile web secure fast modern platform product "
+    "client team sprint release review feedback analytics dashboard checkout payment search "
+    "integration deploy migrate optimize responsive brand content update schedule invoice"
+).split()
+
+DEFAULT_COUNTS = {
+    "clients": 500,
+    "client_projects": 1500,
+    "analytics": 1_000_000,
+    "bookings": 100_000,
+    "newsletter": 20_000,
+    "conversations": 5_000,
+    "projects": 40,
+    "blogs": 60,
+    "testimonials": 40,
+}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def stable_id(seed: int, kind: str, index: int) -> str:
+    """Id of the index-th document of a kind; other collections can derive it"""
+    return str(uuid.uuid5(ID_NAMESPACE, f"{seed}:{kind}:{index}"))
+
+
+def random_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, k=count))
+
+
+def long_tail(rng: random.Random, scale: float, cap: int, alpha: float = 1.3) -> int:
+    """Pareto-distributed count: most small, a few up to the cap"""
+    return min(cap, int(rng.paretovariate(alpha) * scale))
+
+
+def skewed_index(rng: random.Random, size: int) -> int:
+    """Index biased towards the low end, so some clients own many projects"""
+    return min(size - 1, int(size * rng.random() ** 2))
+
+
+def day_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+
+# ---------------------------------------------------------------------------
+# Document factories: (rng, index, ctx) -> document
+# ---------------------------------------------------------------------------
+
+def make_client(rng, i, ctx):
+    return {
+        "id": stable_id(ctx["seed"], "client", i),
+        "name": f"Client {i}",
+        "email": f"client{i}@dataset.example.com",
+        "password_hash": ctx["password_hash"],
+        "company": f"{rng.choice(VOCABULARY).title()} {rng.choice(['Labs', 'Systems', 'Studio', 'Retail', 'Group'])}",
+        "phone": f"+91{rng.randint(7000000000, 9999999999)}",
+        "is_active": rng.random() < 0.95,
+        "created_at": ctx["now"] - timedelta(days=rng.randint(30, 3 * 365)),
+        "created_by": ctx["admin_id"],
+    }
+
+
+def make_client_project(rng, i, ctx):
+    client_index = skewed_index(rng, ctx["counts"]["clients"])
+    client_id = stable_id(ctx["seed"], "client", client_index)
+    client_name = f"Client {client_index}"
+    created = ctx["now"] - timedelta(days=rng.randint(1, 2 * 365), seconds=rng.randint(0, 86400))
+    age_seconds = max(1, int((ctx["now"] - created).total_seconds()))
+
+    def moment():
+        return created + timedelta(seconds=rng.randint(0, age_seconds))
+
+    milestones = []
+    for m in range(rng.randint(3, 10)):
+        status = rng.choices(["completed", "in_progress", "pending"], [5, 2, 3])[0]
+        milestones.append({
+            "id": random_id(rng),
+            "title": f"Milestone {m + 1}: {words(rng, 2)}",
+            "description": words(rng, 12),
+            "due_date": day_start(created + timedelta(days=14 * (m + 1))),
+            "status": status,
+            "completion_date": moment() if status == "completed" else None,
+            "order": m,
+            "created_at": created,
+        })
+
+    tasks = []
+    for _ in range(long_tail(rng, 8, 300, alpha=1.6) + 3):
+        status = rng.choices(["completed", "in_progress", "pending"], [5, 2, 3])[0]
+        tasks.append({
+            "id": random_id(rng),
+            "title": words(rng, 4).capitalize(),
+            "description": words(rng, 15),
+            "status": status,
+            "priority": rng.choices(["low", "medium", "high", "urgent"], [2, 5, 3, 1])[0],
+            "assigned_to": ctx["admin_id"],
+            "due_date": day_start(moment() + timedelta(days=rng.randint(1, 30))),
+            "completed_at": moment() if status == "completed" else None,
+            "milestone_id": rng.choice(milestones)["id"],
+            "created_at": moment(),
+        })
+
+    files = [{
+        "id": random_id(rng),
+        "filename": f"{words(rng, 2).replace(' ', '_')}.{extension}",
+        "file_path": f"/app/backend/uploads/client_projects/{random_id(rng)}.{extension}",
+        "uploaded_at": moment(),
+        "uploaded_by": ctx["admin_id"],
+        "file_size": rng.randint(10_000, 20_000_000),
+        "file_type": mime,
+    } for extension, mime in (
+        rng.choice([("pdf", "application/pdf"), ("png", "image/png"), ("zip", "application/zip")])
+        for _ in range(long_tail(rng, 2, 50))
+    )]
+
+    chat_messages = sorted(({
+        "id": random_id(rng),
+        "sender_id": client_id if sender == "client" else ctx["admin_id"],
+        "sender_name": client_name if sender == "client" else "Dataset Admin",
+        "sender_type": sender,
+        "message": words(rng, rng.randint(3, 40)),
+        "read": rng.random() < 0.9,
+        "created_at": moment(),
+    } for sender in (
+        rng.choice(["client", "admin"]) for _ in range(long_tail(rng, 10, ctx["max_chat"]))
+    )), key=lambda message: message["created_at"])
+
+    activity_log = sorted(({
+        "id": random_id(rng),
+        "action": action,
+        "description": f"{action.replace('_', ' ').capitalize()}: {words(rng, 4)}",
+        "user_id": ctx["admin_id"],
+        "user_name": "Dataset Admin",
+        "timestamp": moment(),
+        "metadata": {},
+    } for action in rng.choices(
+        ["updated", "task_updated", "milestone_updated", "file_uploaded", "comment_added", "chat_message"],
+        k=long_tail(rng, 30, ctx["max_activity"], alpha=1.1) + 1
+    )), key=lambda entry: entry["timestamp"])
+
+    total = round(rng.lognormvariate(11, 1), 2)
+    paid = round(total * rng.choice([0, 0.25, 0.5, 0.75, 1]), 2)
+    status = rng.choices(["pending", "in_progress", "review", "completed", "on_hold"], [2, 5, 2, 4, 1])[0]
+    return {
+        "id": stable_id(ctx["seed"], "client_project", i),
+        "name": f"{words(rng, 2).title()} {rng.choice(['Website', 'App', 'Portal', 'Redesign', 'Platform'])}",
+        "client_id": client_id,
+        "description": words(rng, 30),
+        "status": status,
+        "priority": rng.choices(["low", "medium", "high", "urgent"], [2, 5, 3, 1])[0],
+        "progress": 100 if status == "completed" else rng.randint(0, 95),
+        "start_date": day_start(created),
+        "expected_delivery": day_start(created + timedelta(days=rng.randint(30, 240))),
+        "actual_delivery": moment() if status == "completed" else None,
+        "notes": words(rng, 10),
+        "milestones": milestones,
+        "tasks": tasks,
+        "files": files,
+        "comments": [],
+        "chat_messages": chat_messages,
+        "activity_log": activity_log,
+        "team_members": [{
+            "admin_id": ctx["admin_id"], "admin_name": "Dataset Admin", "role": "Project Manager", "added_at": created
+        }],
+        "budget": {
+            "total_amount": total,
+            "currency": rng.choices(CURRENCIES, CURRENCY_WEIGHTS)[0],
+            "paid_amount": paid,
+            "pending_amount": round(total - paid, 2),
+            "payment_terms": rng.choice(["50% upfront", "Milestone based", "Net 30"]),
+        },
+        "tags": rng.sample(["web", "mobile", "ecommerce", "saas", "branding", "seo"], 2),
+        "created_at": created,
+        "created_by": ctx["admin_id"],
+        "updated_at": moment(),
+        "last_activity_at": activity_log[-1]["timestamp"],
+    }
+
+
+def make_analytics_event(rng, i, ctx):
+    event_type = rng.choices(EVENT_TYPES, EVENT_WEIGHTS)[0]
+    event = {
+        "_id": random_id(rng),
+        "event_type": event_type,
+        "page_name": rng.choices(PAGES, PAGE_WEIGHTS)[0],
+        "blog_id": None,
+        "blog_title": None,
+        "timestamp": ctx["now"] - timedelta(seconds=rng.randint(0, ctx["days"] * 86400)),
+    }
+    if event_type == "blog_view" and ctx["counts"]["blogs"]:
+        blog = skewed_index(rng, ctx["counts"]["blogs"])
+        event.update(page_name="blog", blog_id=stable_id(ctx["seed"], "blog", blog), blog_title=f"Blog post {blog}")
+    # Regular or time-series layout, as the app stores it
+    return ctx["stored_event"](event)
+
+
+def make_booking(rng, i, ctx):
+    preferred = day_start(ctx["now"]) + timedelta(days=rng.randint(-ctx["days"], 60))
+    created = preferred - timedelta(days=rng.randint(0, 30), seconds=rng.randint(0, 86400))
+    status = rng.choices(["pending", "confirmed", "cancelled"], [3, 6, 1])[0]
+    return {
+        "id": random_id(rng),
+        "name": f"Lead {i}",
+        "email": f"lead{i}@dataset.example.com",
+        "phone": f"+91{rng.randint(7000000000, 9999999999)}",
+        "preferred_date": preferred,
+        "preferred_time_slot": "-".join(rng.choice(TIME_SLOTS)),
+        "message": words(rng, rng.randint(0, 25)) or None,
+        "status": status,
+        "meeting_type": "Google Meet",
+        "meeting_link": "https://meet.google.com/dataset" if status == "confirmed" else None,
+        "created_at": created,
+        "updated_at": created,
+        "confirmed_at": created + timedelta(hours=rng.randint(1, 48)) if status == "confirmed" else None,
+        "cancelled_at": created + timedelta(hours=rng.randint(1, 48)) if status == "cancelled" else None,
+        "admin_notes": None,
+    }
+
+
+def make_subscriber(rng, i, ctx):
+    return {
+        "id": random_id(rng),
+        "email": f"reader{i}@dataset.example.com",
+        "status": "subscribed" if rng.random() < 0.9 else "unsubscribed",
+        "created_at": ctx["now"] - timedelta(seconds=rng.randint(0, ctx["days"] * 86400)),
+    }
+
+
+def make_conversation(rng, i, ctx):
+    started = ctx["now"] - timedelta(seconds=rng.randint(0, ctx["days"] * 86400))
+    messages = [{
+        "id": random_id(rng),
+        "sender": "customer" if m % 2 == 0 else "admin",
+        "message": words(rng, rng.randint(3, 30)),
+        "timestamp": started + timedelta(minutes=5 * m),
+        "read": True,
+    } for m in range(long_tail(rng, 2, 200) + 1)]
+    unread = rng.randint(0, 3) if messages[-1]["sender"] == "customer" else 0
+    for message in messages[len(messages) - unread:]:
+        message["read"] = False
+    return {
+        "id": random_id(rng),
+        "customer_name": f"Visitor {i}",
+        "customer_email": f"visitor{i}@dataset.example.com",
+        "customer_phone": None,
+        "messages": messages,
+        "unread_count": unread,
+        "last_message_at": messages[-1]["timestamp"],
+        "created_at": started,
+    }
+
+
+def make_project(rng, i, ctx):
+    return {
+        "id": stable_id(ctx["seed"], "project", i),
+        "title": f"{words(rng, 2).title()} Project {i}",
+        "slug": f"project-{i}",
+        "category": rng.choice(["Web", "Mobile", "E-commerce", "SaaS"]),
+        "description": words(rng, 20),
+        "image_url": f"https://picsum.photos/seed/project{i}/800/600",
+        "tech_stack": rng.sample(["React", "FastAPI", "MongoDB", "Node.js", "Flutter", "AWS"], 3),
+        "featured": rng.random() < 0.3,
+        "is_private": rng.random() < 0.1,
+        "status": "completed",
+        "created_at": ctx["now"] - timedelta(days=rng.randint(0, 3 * 365)),
+        "updated_at": ctx["now"],
+    }
+
+
+def make_blog(rng, i, ctx):
+    created = ctx["now"] - timedelta(days=rng.randint(0, 3 * 365))
+    return {
+        "id": stable_id(ctx["seed"], "blog", i),
+        "title": f"Blog post {i}",
+        "slug": f"blog-post-{i}",
+        "content": "\n\n".join(words(rng, rng.randint(40, 120)) for _ in range(rng.randint(5, 20))),
+        "excerpt": words(rng, 30),
+        "cover_image": f"https://picsum.photos/seed/blog{i}/1200/630",
+        "category": rng.choice(["Engineering", "Design", "Business"]),
+        "tags": rng.sample(["python", "react", "mongodb", "seo", "ux", "cloud"], 2),
+        "author": "MSPN DEV",
+        "status": "published" if rng.random() < 0.85 else "draft",
+        "seo_title": None,
+        "seo_description": None,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def make_testimonial(rng, i, ctx):
+    created = ctx["now"] - timedelta(days=rng.randint(0, 3 * 365))
+    return {
+        "id": random_id(rng),
+        "name": f"Customer {i}",
+        "role": rng.choice(["CEO", "CTO", "Founder", "Marketing Lead"]),
+        "company": f"Company {i}",
+        "message": words(rng, 40),
+        "rating": rng.choices([3, 4, 5], [1, 3, 6])[0],
+        "status": "approved" if rng.random() < 0.75 else "pending",
+        "source": "admin_created",
+        "verified": True,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+# collection -> (count key, factory, documents per batch relative to --batch-size)
+FACTORIES = {
+    "clients": ("clients", make_client, 1),
+    "client_projects": ("client_projects", make_client_project, 0.02),
+    "analytics": ("analytics", make_analytics_event, 1),
+    "bookings": ("bookings", make_booking, 1),
+    "newsletter": ("newsletter", make_subscriber, 1),
+    "conversations": ("conversations", make_conversation, 0.2),
+    "projects": ("projects", make_project, 1),
+    "blogs": ("blogs", make_blog, 0.2),
+    "testimonials": ("testimonials", make_testimonial, 1),
+}
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+async def write_collection(db, name: str, ctx: dict, batch_size: int, semaphore: asyncio.Semaphore) -> int:
+    count_key, factory, batch_factor = FACTORIES[name]
+    total = ctx["counts"][count_key]
+    size = max(1, int(batch_size * batch_factor))
+
+    async def write_batch(number: int):
+        async with semaphore:
+            rng = random.Random(f"{ctx['seed']}:{name}:{number}")
+            start = number * size
+            documents = [factory(rng, i, ctx) for i in range(start, min(total, start + size))]
+            await db[name].insert_many(documents, ordered=False)
+
+    await asyncio.gather(*(write_batch(number) for number in range((total + size - 1) // size)))
+    return total
+
+
+async def generate(
+    db,
+    counts: dict,
+    seed: int = 42,
+    password: str = "password123",
+    batch_size: int = 5000,
+    workers: int = 8,
+    days: int = 365,
+    max_activity: int = 10_000,
+    max_chat: int = 2_000,
+    drop: bool = False,
+    anchor: datetime = None,
+    verbose: bool = True,
+) -> dict:
+    """
+    Write the dataset; returns what callers need to log in and navigate it
+    (admin username, client emails with their project ids, blog slugs).
+    """
+    from auth.password import hash_password
+    from utils.analytics_store import ANALYTICS_TIMESERIES, TIMESERIES_OPTIONS, stored_event
+
+    counts = {**DEFAULT_COUNTS, **counts}
+    # All timestamps are relative to the anchor (today by default)
+    now = anchor or day_start(datetime.utcnow())
+    ctx = {
+        "seed": seed,
+        "counts": counts,
+        "now": now,
+        "days": days,
+        "max_activity": max_activity,
+        "max_chat": max_chat,
+        "admin_id": stable_id(seed, "admin", 0),
+        # One bcrypt hash shared by every account keeps generation fast
+        "password_hash": hash_password(password),
+        "stored_event": stored_event,
+    }
+
+    collections = list(FACTORIES) + ["admins", "booking_settings"]
+    if drop:
+        for name in collections:
+            await db.drop_collection(name)
+        if ANALYTICS_TIMESERIES:
+            await db.create_collection("analytics", timeseries=TIMESERIES_OPTIONS)
+
+    await db.admins.update_one({"id": ctx["admin_id"]}, {"$set": {
+        "id": ctx["admin_id"],
+        "username": "dataset-admin",
+        "password_hash": ctx["password_hash"],
+        "role": "super_admin",
+        "permissions": {"canManageAdmins": True},
+        "created_at": now,
+        "created_by": "generate_dataset",
+    }}, upsert=True)
+    await db.booking_settings.update_many({}, {"$set": {"is_active": False}})
+    await db.booking_settings.insert_one({
+        "id": stable_id(seed, "booking_settings", 0),
+        "available_days": ALL_DAYS,
+        "time_slots": [{"start_time": start, "end_time": end, "max_bookings": 3} for start, end in TIME_SLOTS],
+        "meeting_type": "Google Meet",
+        "timezone": "Asia/Kolkata",
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+    semaphore = asyncio.Semaphore(workers)
+    started = time.perf_counter()
+    written = 0
+    for name in FACTORIES:
+        collection_started = time.perf_counter()
+        written += await write_collection(db, name, ctx, batch_size, semaphore)
+        if verbose:
+            print(f"  {name:<16}{counts[FACTORIES[name][0]]:>10,} docs in {time.perf_counter() - collection_started:6.1f}s")
+    if verbose:
+        elapsed = time.perf_counter() - started
+        print(f"✅ {written:,} documents in {elapsed:.1f}s ({written / max(elapsed, 1e-9):,.0f} docs/s)")
+
+    projects_by_client = {}
+    async for project in db.client_projects.find(
+        {"created_by": ctx["admin_id"]}, {"_id": 0, "id": 1, "client_id": 1}
+    ):
+        projects_by_client.setdefault(project["client_id"], []).append(project["id"])
+
+    return {
+        "admin_username": "dataset-admin",
+        "clients": [
+            (f"client{i}@dataset.example.com", projects_by_client.get(stable_id(seed, "client", i), []))
+            for i in range(counts["clients"])
+        ],
+        "blog_slugs": [f"blog-post-{i}" for i in range(counts["blogs"])],
+    }
+
+
+async def main(args):
+    from database import db, client
+
+    counts = {name: getattr(args, name) for name in DEFAULT_COUNTS}
+    print(f"🌱 Generating dataset (seed {args.seed}) into {db.name}...")
+    try:
+        await generate(
+            db, counts,
+            seed=args.seed,
+            password=args.password,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            days=args.days,
+            max_activity=args.max_activity,
+            max_chat=args.max_chat,
+            drop=args.drop,
+            anchor=datetime.strptime(args.anchor, "%Y-%m-%d") if args.anchor else None,
+        )
+        print(f"   Admin login: dataset-admin / {args.password}")
+        print(f"   Client login: client0@dataset.example.com / {args.password}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for name, default in DEFAULT_COUNTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, default=default)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password123", help="password of every generated account")
+    parser.add_argument("--anchor", help="YYYY-MM-DD the data is generated around (default today)")
+    parser.add_argument("--days", type=int, default=365, help="history window for events and bookings")
+    parser.add_argument("--max-activity", type=int, default=10_000, help="activity log cap per project")
+    parser.add_argument("--max-chat", type=int, default=2_000, help="chat history cap per project")
+    parser.add_argument("--batch-size", type=int, default=5000, help="documents per insert_many")
+    parser.add_argument("--workers", type=int, default=8, help="insert_many batches in flight")
+    parser.add_argument("--drop", action="store_true", help="empty the generated collections first")
+    asyncio.run(main(parser.parse_args()))
@@ -1,10 +1,11 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Depends
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import os
 import logging
 from pathlib import Path
 from database import close_db_connection
+from utils.responses import FastJSONResponse
 
 # Import all routers
 from routes import (
@@ -34,10 +35,24 @@ from routes.client_auth import router as client_auth_router
 from routes.admin_clients import router as admin_clients_router
 from routes.admin_client_projects import router as admin_client_projects_router
 from routes.client_projects import router as client_projects_router
+from utils.revenue_report import invalidate_revenue_report
 
 # Booking Routers
 from routes.bookings import router as bookings_router
 from routes.booking_settings import router as booking_settings_router
+from utils.booking_analytics import invalidate_booking_analytics
+
+# Admin Tools Routers
+from routes.search import router as search_router
+from routes.rate_limits import router as rate_limits_router
+from routes.metrics import router as metrics_router
+from routes.profiles import router as profiles_router
+from routes.slow_queries import router as slow_queries_router
+from routes.exports import router as exports_router
+
+# Aggregated public data
+from routes.site import router as site_router, invalidate_site_bootstrap
+from routes.feeds import router as feeds_router, invalidate_site_feeds
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -54,27 +69,24 @@ app = FastAPI(
     title="MSPN DEV API",
     description="Backend API for MSPN DEV website and admin panel",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     root_path="/api" if os.environ.get("TRUST_PROXY") == "true" else ""
 )
 
 # -------------------------------------------------------------------
-# Proxy Header Middleware
+# Proxy Header, Request Context, Metrics, Loop Monitor, Profiling + Compression Middleware
+# (pure ASGI, see middleware.py)
 # -------------------------------------------------------------------
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-
-class ProxyHeaderMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        forwarded_proto = request.headers.get("X-Forwarded-Proto")
-        if forwarded_proto:
-            request.scope["scheme"] = forwarded_proto
-
-        forwarded_host = request.headers.get("X-Forwarded-Host")
-        if forwarded_host:
-            request.scope["server"] = (forwarded_host, None)
-
-        return await call_next(request)
+from middleware import (
+    ProxyHeaderMiddleware, RequestContextMiddleware, MetricsMiddleware, LoopMonitorMiddleware,
+    ProfilingMiddleware, CompressionMiddleware
+)
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(LoopMonitorMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestContextMiddleware)
 app.add_middleware(ProxyHeaderMiddleware)
 
 # -------------------------------------------------------------------
@@ -92,8 +104,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paging metadata for list endpoints (utils/pagination.py)
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Link"],
 )
 
+# -------------------------------------------------------------------
+# OpenTelemetry server spans (no-op unless TRACING_ENABLED, see utils/tracing.py)
+# -------------------------------------------------------------------
+from utils.tracing import instrument_app
+
+instrument_app(app)
+
 # -------------------------------------------------------------------
 # Routers
 # -------------------------------------------------------------------
@@ -107,45 +128,110 @@ async def health_check():
 async def root():
     return {"message": "MSPN DEV API is running"}
 
+# Writes through these routers rebuild the /site/bootstrap snapshot
+bootstrap_sources = [Depends(invalidate_site_bootstrap)]
+# ... and these refresh the sitemap and blog feeds
+feed_sources = [Depends(invalidate_site_feeds)]
+# ... and these drop cached booking reports
+booking_sources = [Depends(invalidate_booking_analytics)]
+# ... and these drop cached revenue reports
+revenue_sources = [Depends(invalidate_revenue_report)]
+
 api_router.include_router(auth_router)
 api_router.include_router(pages_router)
-api_router.include_router(services_router)
-api_router.include_router(projects_router)
+api_router.include_router(services_router, dependencies=bootstrap_sources + feed_sources)
+api_router.include_router(projects_router, dependencies=bootstrap_sources + feed_sources)
 api_router.include_router(contacts_router)
-api_router.include_router(settings_router)
+api_router.include_router(settings_router, dependencies=bootstrap_sources)
 api_router.include_router(admins_router)
 api_router.include_router(storage_router)
-api_router.include_router(skills_router)
-api_router.include_router(content_router)
+api_router.include_router(skills_router, dependencies=bootstrap_sources)
+api_router.include_router(content_router, dependencies=bootstrap_sources)
 api_router.include_router(notes_router)
-api_router.include_router(about_router)
-api_router.include_router(contact_page_router)
+api_router.include_router(about_router, dependencies=bootstrap_sources)
+api_router.include_router(contact_page_router, dependencies=bootstrap_sources)
 api_router.include_router(chat_router)
-api_router.include_router(blogs_router)
-api_router.include_router(testimonials_router, prefix="/testimonials")
+api_router.include_router(blogs_router, dependencies=feed_sources)
+api_router.include_router(testimonials_router, prefix="/testimonials", dependencies=bootstrap_sources)
 api_router.include_router(newsletter_router)
-api_router.include_router(pricing_router)
+api_router.include_router(pricing_router, dependencies=bootstrap_sources)
 api_router.include_router(analytics_router)
 
 api_router.include_router(client_auth_router)
 api_router.include_router(admin_clients_router)
-api_router.include_router(admin_client_projects_router)
+api_router.include_router(admin_client_projects_router, dependencies=revenue_sources)
 api_router.include_router(client_projects_router)
 
-api_router.include_router(bookings_router)
-api_router.include_router(booking_settings_router)
+api_router.include_router(bookings_router, dependencies=booking_sources)
+api_router.include_router(booking_settings_router, dependencies=booking_sources)
+
+api_router.include_router(search_router)
+api_router.include_router(rate_limits_router)
+api_router.include_router(profiles_router)
+api_router.include_router(slow_queries_router)
+api_router.include_router(exports_router)
+
+api_router.include_router(site_router)
+api_router.include_router(feeds_router)
 
 app.include_router(api_router)
 
+# Prometheus scrape endpoint, outside /api
+app.include_router(metrics_router)
+
 # -------------------------------------------------------------------
 # Startup Initialization
 # -------------------------------------------------------------------
+@app.on_event("startup")
+async def start_loop_monitor():
+    from utils.loop_monitor import loop_monitor, LOOP_MONITOR_ENABLED
+    if LOOP_MONITOR_ENABLED:
+        await loop_monitor.start()
+
+@app.on_event("startup")
+async def start_analytics_buffers():
+    from utils.view_counters import view_counters
+    await view_counters.start()
+
+    from utils.visitors import visitor_sketches
+    await visitor_sketches.start()
+
+    from utils.top_k import top_sketches
+    await top_sketches.start()
+
+    from utils.analytics_store import analytics_archiver
+    await analytics_archiver.start()
+
 @app.on_event("startup")
 async def startup_event():
     try:
         from auto_init import auto_initialize_database
         await auto_initialize_database()
 
+        # Before anything writes to it, so it can be created as a time-series collection
+        from utils.analytics_store import ensure_analytics_collection
+        await ensure_analytics_collection()
+
+        from utils.visitors import migrate_visitor_sketches
+        await migrate_visitor_sketches()
+
+        from database import ensure_indexes
+        await ensure_indexes()
+
+        from routes.blogs import ensure_blog_processing
+        await ensure_blog_processing()
+
+        from utils.view_counters import ensure_view_fields
+        await ensure_view_fields()
+
+        from utils.top_k import backfill_top_pages
+        await backfill_top_pages()
+
+        from database import db
+        from utils.slow_queries import slow_query_log, SLOW_QUERY_LOG_ENABLED
+        if SLOW_QUERY_LOG_ENABLED:
+            await slow_query_log.start(db)
+
         from database import admins_collection
         from auth.password import hash_password
         import uuid
@@ -162,7 +248,7 @@ async def startup_event():
                 "password_hash": hash_password("maneesh123"),
                 "role": "super_admin",
                 "permissions": {"canManageAdmins": True},
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": datetime.utcnow(),
                 "created_by": "system"
             }
 
@@ -181,4 +267,32 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # Buffered view counts and analytics sketches need the connection
+    from utils.view_counters import view_counters
+    await view_counters.stop()
+
+    from utils.visitors import visitor_sketches
+    await visitor_sketches.stop()
+
+    from utils.top_k import top_sketches
+    await top_sketches.stop()
+
+    from utils.analytics_store import analytics_archiver
+    await analytics_archiver.stop()
+
+    from utils.parquet_export import parquet_exporter
+    await parquet_exporter.stop()
+
     await close_db_connection()
+
+    from utils.loop_monitor import loop_monitor
+    await loop_monitor.stop()
+
+    from utils.slow_queries import slow_query_log
+    await slow_query_log.stop()
+
+    from utils.tracing import shutdown_tracing
+    shutdown_tracing()
+
+    from utils.metrics import mark_worker_dead
+    mark_worker_dead()
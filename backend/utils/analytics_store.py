@@ -0,0 +1,246 @@
+"""
+Storage of raw analytics events: collection layout, retention and archival.
+
+Layout: with ANALYTICS_TIMESERIES=true the analytics collection is created
+as a MongoDB time-series collection (timeField timestamp, metaField meta,
+which holds event_type and page_name). MongoDB then stores events in
+compressed per-minute buckets grouped by meta, and queries on
+meta.event_type + timestamp read whole buckets. Events are stored through
+stored_event() and queried through event_field(), which take care of the
+two layouts. An existing regular collection is not converted at startup;
+scripts/maintenance/migrate_analytics_timeseries.py does that.
+
+Retention: ANALYTICS_RETENTION_DAYS > 0 makes MongoDB delete events older
+than that (a TTL index, or the time-series collection's expireAfterSeconds).
+Everything dashboards show beyond the summary's 30 days comes from the
+daily rollups (utils/visitors.py, utils/top_k.py), so retention is kept
+at 31 days or more. Retention only applies together with
+ANALYTICS_ARCHIVE_DIR; without an archive raw events are kept.
+
+Archival: with ANALYTICS_ARCHIVE_DIR set, a background task writes each
+completed UTC day to ANALYTICS_ARCHIVE_DIR/analytics-YYYY-MM-DD.jsonl.gz
+(MongoDB extended JSON, one event per line) long before retention removes
+it. Days are claimed in analytics_archives, so with several workers each
+day is written once. The TTL does not know about archives, so each pass
+warns about days still unarchived within EXPIRY_WARNING of being deleted.
+"""
+from bson import json_util
+from datetime import datetime, timedelta
+from pathlib import Path
+from pymongo.errors import CollectionInvalid, DuplicateKeyError, PyMongoError
+from typing import Optional
+from database import db, analytics_collection, analytics_archives_collection
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_TIMESERIES = os.environ.get("ANALYTICS_TIMESERIES", "false").lower() == "true"
+ANALYTICS_RETENTION_DAYS = int(os.environ.get("ANALYTICS_RETENTION_DAYS", 0))
+ANALYTICS_ARCHIVE_DIR = os.environ.get("ANALYTICS_ARCHIVE_DIR", "")
+ANALYTICS_ARCHIVE_INTERVAL_HOURS = float(os.environ.get("ANALYTICS_ARCHIVE_INTERVAL_HOURS", 6))
+
+MIN_RETENTION_DAYS = 31
+TIMESERIES_OPTIONS = {"timeField": "timestamp", "metaField": "meta", "granularity": "minutes"}
+META_FIELDS = ("event_type", "page_name")
+ARCHIVE_BATCH_SIZE = 1000
+# A claim older than this belongs to a worker that died mid-archive
+STALE_CLAIM = timedelta(hours=1)
+EXPIRY_WARNING = timedelta(days=3)
+
+
+def retention_seconds() -> Optional[int]:
+    if ANALYTICS_RETENTION_DAYS <= 0:
+        return None
+    if not ANALYTICS_ARCHIVE_DIR:
+        logger.warning(
+            "ANALYTICS_RETENTION_DAYS is set but ANALYTICS_ARCHIVE_DIR is not; "
+            "keeping raw analytics events rather than deleting them unarchived"
+        )
+        return None
+    if ANALYTICS_RETENTION_DAYS < MIN_RETENTION_DAYS:
+        logger.warning(
+            f"ANALYTICS_RETENTION_DAYS={ANALYTICS_RETENTION_DAYS} is shorter than the analytics summary; "
+            f"keeping {MIN_RETENTION_DAYS} days"
+        )
+    return max(ANALYTICS_RETENTION_DAYS, MIN_RETENTION_DAYS) * 86400
+
+
+def event_field(name: str) -> str:
+    """Path of an event field in the current layout"""
+    return f"meta.{name}" if ANALYTICS_TIMESERIES and name in META_FIELDS else name
+
+
+def stored_event(event: dict) -> dict:
+    """An event document in the current layout"""
+    if not ANALYTICS_TIMESERIES:
+        return event
+    stored = {key: value for key, value in event.items() if key not in META_FIELDS}
+    stored["meta"] = {key: event.get(key) for key in META_FIELDS}
+    return stored
+
+
+async def _collection_options() -> Optional[dict]:
+    async for info in db.list_collections(filter={"name": analytics_collection.name}):
+        return info
+    return None
+
+
+async def _ensure_ttl_index(key_spec: list, seconds: Optional[int]):
+    """key_spec as a TTL index expiring after seconds, or a plain index when None"""
+    for name, info in (await analytics_collection.index_information()).items():
+        if list(info["key"]) != key_spec:
+            continue
+        if info.get("expireAfterSeconds") == seconds:
+            return
+        if seconds is not None and info.get("expireAfterSeconds") is not None:
+            await db.command("collMod", analytics_collection.name, index={"name": name, "expireAfterSeconds": seconds})
+            return
+        await analytics_collection.drop_index(name)
+    options = {"expireAfterSeconds": seconds} if seconds is not None else {}
+    await analytics_collection.create_index(key_spec, **options)
+
+
+async def ensure_analytics_collection():
+    """Create the events collection in the configured layout, with its indexes and retention (startup)"""
+    seconds = retention_seconds()
+    info = await _collection_options()
+    is_timeseries = bool(info and info.get("type") == "timeseries")
+
+    if ANALYTICS_TIMESERIES and info is None:
+        options = {"timeseries": TIMESERIES_OPTIONS}
+        if seconds is not None:
+            options["expireAfterSeconds"] = seconds
+        try:
+            await db.create_collection(analytics_collection.name, **options)
+            is_timeseries = True
+        except CollectionInvalid:
+            is_timeseries = ((await _collection_options()) or {}).get("type") == "timeseries"
+    elif ANALYTICS_TIMESERIES and not is_timeseries:
+        logger.warning(
+            "ANALYTICS_TIMESERIES=true but the analytics collection already exists as a regular collection; "
+            "run scripts/maintenance/migrate_analytics_timeseries.py to convert it"
+        )
+    elif is_timeseries and not ANALYTICS_TIMESERIES:
+        logger.warning("The analytics collection is a time-series collection; set ANALYTICS_TIMESERIES=true")
+
+    if is_timeseries:
+        await db.command("collMod", analytics_collection.name, expireAfterSeconds=seconds if seconds is not None else "off")
+        await analytics_collection.create_index([("meta.event_type", 1), ("timestamp", -1)])
+    else:
+        await analytics_collection.create_index([("event_type", 1), ("timestamp", -1)])
+        await _ensure_ttl_index([("timestamp", -1)], seconds)
+
+
+def _write_lines(path: Path, lines: list):
+    with gzip.open(path, "at", encoding="utf-8") as archive:
+        archive.writelines(lines)
+
+
+class AnalyticsArchiver:
+    def __init__(self):
+        self._task = None
+
+    async def _claim(self, day: str) -> bool:
+        now = datetime.utcnow()
+        try:
+            await analytics_archives_collection.insert_one({"_id": day, "status": "claimed", "claimed_at": now})
+            return True
+        except DuplicateKeyError:
+            # Take over a claim abandoned by a worker that died
+            result = await analytics_archives_collection.update_one(
+                {"_id": day, "status": "claimed", "claimed_at": {"$lt": now - STALE_CLAIM}},
+                {"$set": {"claimed_at": now}}
+            )
+            return bool(result.modified_count)
+
+    async def archive_day(self, day: datetime) -> Optional[Path]:
+        """Write one UTC day's events to a gzipped JSON-lines file"""
+        name = day.strftime("%Y-%m-%d")
+        if not await self._claim(name):
+            return None
+
+        directory = Path(ANALYTICS_ARCHIVE_DIR)
+        await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+        path = directory / f"analytics-{name}.jsonl.gz"
+        partial = path.with_suffix(".gz.partial")
+        await asyncio.to_thread(partial.unlink, missing_ok=True)
+
+        count = 0
+        lines = []
+        cursor = analytics_collection.find({"timestamp": {"$gte": day, "$lt": day + timedelta(days=1)}}).sort("timestamp", 1)
+        async for event in cursor:
+            lines.append(json_util.dumps(event, json_options=json_util.RELAXED_JSON_OPTIONS) + "\n")
+            if len(lines) >= ARCHIVE_BATCH_SIZE:
+                await asyncio.to_thread(_write_lines, partial, lines)
+                count += len(lines)
+                lines = []
+        await asyncio.to_thread(_write_lines, partial, lines)
+        count += len(lines)
+
+        await asyncio.to_thread(partial.replace, path)
+        digest = await asyncio.to_thread(lambda: hashlib.sha256(path.read_bytes()).hexdigest())
+        await analytics_archives_collection.update_one(
+            {"_id": name},
+            {"$set": {
+                "status": "archived", "file": str(path), "events": count,
+                "sha256": digest, "archived_at": datetime.utcnow()
+            }}
+        )
+        logger.info(f"Archived {count} analytics events for {name} to {path}")
+        return path
+
+    async def run_once(self):
+        """Archive every completed day that is not archived yet"""
+        oldest = await analytics_collection.find_one({}, {"timestamp": 1}, sort=[("timestamp", 1)])
+        if oldest is None:
+            return
+        now = datetime.utcnow()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        first = oldest["timestamp"].replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        archived = set(await analytics_archives_collection.distinct("_id", {"status": "archived"}))
+        pending = []
+        day = first
+        while day < today:
+            if day.strftime("%Y-%m-%d") not in archived:
+                pending.append(day)
+            day += timedelta(days=1)
+
+        seconds = retention_seconds()
+        if seconds is not None:
+            # Warned before archiving, which stops at the first failing day
+            expiring = [day for day in pending if day + timedelta(days=1, seconds=seconds) <= now + EXPIRY_WARNING]
+            if expiring:
+                logger.warning(
+                    f"{len(expiring)} unarchived analytics day(s) from {expiring[0].strftime('%Y-%m-%d')} "
+                    f"expire within {EXPIRY_WARNING.days} days; check ANALYTICS_ARCHIVE_DIR"
+                )
+        for day in pending:
+            await self.archive_day(day)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except (PyMongoError, OSError) as e:
+                logger.warning(f"Analytics archival failed: {str(e)}")
+            await asyncio.sleep(ANALYTICS_ARCHIVE_INTERVAL_HOURS * 3600)
+
+    async def start(self):
+        if ANALYTICS_ARCHIVE_DIR and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+analytics_archiver = AnalyticsArchiver()
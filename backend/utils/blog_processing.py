@@ -0,0 +1,172 @@
+"""
+Publish-time processing for blog posts.
+
+Everything the public blog pages need beyond the stored fields is derived
+once, when a post is written, and saved on the blog document:
+
+    rendered_content   HTML for the post page. Content written in the rich
+                       text editor is HTML already and kept as is; plain
+                       Markdown is rendered with markdown-it-py (optional,
+                       falls back to escaped paragraphs).
+    excerpt            the admin's excerpt, or the start of the plain text
+                       when left blank
+    word_count, reading_time (whole minutes, at BLOG_WORDS_PER_MINUTE)
+    keywords           the post's most frequent meaningful words
+    related            small cards of the most similar published posts
+
+`related` depends on every other post, so it is recomputed for all
+published posts by build_related_index() after any blog write.
+"""
+from collections import Counter
+from datetime import datetime
+from html import escape, unescape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from utils.dates import to_datetime
+import math
+import os
+import re
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:  # optional dependency
+    MarkdownIt = None
+
+BLOG_WORDS_PER_MINUTE = int(os.environ.get("BLOG_WORDS_PER_MINUTE", 200))
+EXCERPT_LENGTH = 200
+KEYWORD_COUNT = 15
+RELATED_COUNT = 3
+
+# Fields copied into `related` cards
+CARD_FIELDS = ("id", "slug", "title", "excerpt", "cover_image", "category", "reading_time", "created_at")
+
+_markdown = MarkdownIt("commonmark", {"html": True}).enable("table") if MarkdownIt is not None else None
+_HTML_BLOCK = re.compile(r"<(p|div|h[1-6]|ul|ol|li|br|blockquote|pre|img|table|section|article)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#'-]*[a-z0-9+#]|[a-z0-9]", re.IGNORECASE)
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each even every few for from further get
+got had has have having he her here hers herself him himself his how however i if in into is it its
+itself just let like make many may me might more most much must my myself new no nor not now of off on
+once one only or other our ours ourselves out over own per really same she should so some such than that
+the their theirs them themselves then there these they this those through to too under until up upon us
+use used using very via was way we well were what when where which while who whom why will with within
+without would you your yours yourself yourselves
+""".split())
+
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text, skipping scripts and styles"""
+
+    BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "tr"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def render_content(content: str) -> str:
+    """HTML for a post body"""
+    content = content or ""
+    if _HTML_BLOCK.search(content):
+        return content
+    if _markdown is not None:
+        return _markdown.render(content)
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", content) if p.strip()]
+    return "".join(f"<p>{escape(p).replace(chr(10), '<br>')}</p>" for p in paragraphs)
+
+
+def plain_text(html: str) -> str:
+    extractor = _TextExtractor()
+    extractor.feed(html or "")
+    extractor.close()
+    return re.sub(r"\s+", " ", unescape("".join(extractor.parts))).strip()
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0].rstrip(",.;:-")
+    return cut + "…"
+
+
+def extract_keywords(title: str, text: str, count: int = KEYWORD_COUNT) -> List[str]:
+    """Most frequent meaningful words; title words count three times"""
+    counts = Counter()
+    for weight, source in ((3, title or ""), (1, text)):
+        for word in _WORD.findall(source.lower()):
+            if len(word) > 2 and word not in STOPWORDS and not word.isdigit():
+                counts[word] += weight
+    return [word for word, _ in counts.most_common(count)]
+
+
+def process_blog(doc: dict) -> Dict:
+    """Derived fields for one blog document, to $set alongside it"""
+    rendered = render_content(doc.get("content", ""))
+    text = plain_text(rendered)
+    word_count = len(text.split())
+    return {
+        "rendered_content": rendered,
+        "excerpt": (doc.get("excerpt") or "").strip() or make_excerpt(text),
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / BLOG_WORDS_PER_MINUTE)),
+        "keywords": extract_keywords(doc.get("title", ""), text),
+    }
+
+
+def similarity(a: dict, b: dict) -> float:
+    """Shared tags weigh most, then shared keywords, then the category"""
+    tags_a = {tag.lower() for tag in a.get("tags") or []}
+    tags_b = {tag.lower() for tag in b.get("tags") or []}
+    keywords_a, keywords_b = set(a.get("keywords") or []), set(b.get("keywords") or [])
+
+    score = 0.0
+    if tags_a and tags_b:
+        score += 2.0 * len(tags_a & tags_b) / len(tags_a | tags_b)
+    if keywords_a and keywords_b:
+        score += len(keywords_a & keywords_b) / math.sqrt(len(keywords_a) * len(keywords_b))
+    if a.get("category") and a.get("category") == b.get("category"):
+        score += 0.25
+    return score
+
+
+def _created(post: dict) -> Optional[datetime]:
+    # Native dates and legacy ISO strings alike, so they compare
+    created = to_datetime(post.get("created_at"))
+    return created if isinstance(created, datetime) else None
+
+
+def related_posts(posts: List[dict], count: int = RELATED_COUNT) -> Dict[str, List[dict]]:
+    """{post id: cards of its most similar posts}, newest first among equals"""
+    index = {}
+    for post in posts:
+        scored = [
+            (similarity(post, other), _created(other), other)
+            for other in posts
+            if other["id"] != post["id"]
+        ]
+        scored = [entry for entry in scored if entry[0] > 0]
+        scored.sort(key=lambda entry: (entry[0], entry[1] is not None, entry[1] or datetime.min), reverse=True)
+        index[post["id"]] = [
+            {field: other.get(field) for field in CARD_FIELDS}
+            for _, _, other in scored[:count]
+        ]
+    return index
@@ -0,0 +1,168 @@
+"""
+Booking demand report: when people want meetings and how bookings turn out.
+
+Bookings whose preferred_date falls in the range are loaded in one query
+(only the fields used below) into a pandas frame and reduced with numpy in a
+worker thread, so the cost is one pass over a few columns rather than a
+query per slot or day:
+
+    heatmap       bookings per weekday x time slot (all statuses)
+    lead_time     hours from created_at to the start of the booked slot
+                  (slot times are wall-clock in the settings' timezone)
+    slots         per slot: bookings, pending / confirmed / cancelled,
+                  conversion (share ever confirmed) and cancellation rates,
+                  capacity and utilization
+    utilization   active (pending + confirmed) bookings / capacity, where
+                  capacity is max_bookings x the range's available days under
+                  the current booking settings
+
+Reports are cached per (start, end). server.py mounts the booking and
+booking settings routers with invalidate_booking_analytics, which drops them after
+any write; other workers follow within CACHE_TTL_SECONDS (utils/cache.py).
+"""
+from datetime import date, timedelta
+from fastapi import Request
+from typing import Dict, List, Optional
+from database import bookings_collection, booking_settings_collection
+from utils.cache import LocalCache
+from utils.dates import date_range_filter
+import asyncio
+import numpy as np
+import pandas as pd
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+LEAD_TIME_BUCKETS = [
+    ("< 1 day", 0), ("1-3 days", 24), ("3-7 days", 72),
+    ("1-2 weeks", 168), ("2-4 weeks", 336), ("4+ weeks", 672)
+]
+FIELDS = ["preferred_date", "preferred_time_slot", "status", "created_at", "confirmed_at"]
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+
+booking_report_cache = LocalCache("booking_analytics", maxsize=32)
+
+
+def _timestamps(column: pd.Series) -> pd.Series:
+    """Naive UTC timestamps from stored dates (native or legacy ISO strings)"""
+    return pd.to_datetime(column, utc=True, errors="coerce", format="mixed").dt.tz_localize(None)
+
+
+def _rate(numerator: np.ndarray, denominator: np.ndarray) -> List[Optional[float]]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.round(numerator / denominator, 4)
+    return [None if denominator[i] == 0 else float(rates[i]) for i in range(len(rates))]
+
+
+def build_report(docs: List[dict], settings: Optional[dict], start: date, end: date) -> dict:
+    """The report for bookings already loaded (CPU only; run in a thread)"""
+    settings = settings or {}
+    timezone = settings.get("timezone") or DEFAULT_TIMEZONE
+    configured = [f"{slot['start_time']}-{slot['end_time']}" for slot in settings.get("time_slots", [])]
+    max_bookings = {
+        f"{slot['start_time']}-{slot['end_time']}": int(slot.get("max_bookings", 1))
+        for slot in settings.get("time_slots", [])
+    }
+
+    frame = pd.DataFrame.from_records(docs, columns=FIELDS)
+    frame["preferred_date"] = _timestamps(frame["preferred_date"]).dt.normalize()
+    frame = frame[frame["preferred_date"].notna() & frame["preferred_time_slot"].notna()]
+
+    # Slots no longer in the settings still show up, after the configured ones
+    extra = sorted(set(frame["preferred_time_slot"].astype(str).unique()) - set(configured))
+    slots = configured + extra
+    codes = pd.Categorical(frame["preferred_time_slot"].astype(str), categories=slots).codes
+    weekday = frame["preferred_date"].dt.dayofweek.to_numpy()
+    width = len(slots)
+
+    heatmap = np.bincount(weekday * width + codes, minlength=7 * width).reshape(7, width)
+
+    status = frame["status"].fillna("pending").to_numpy()
+    pending = status == "pending"
+    cancelled = status == "cancelled"
+    ever_confirmed = (status == "confirmed") | frame["confirmed_at"].notna().to_numpy()
+    total = np.bincount(codes, minlength=width)
+    by_status = {
+        name: np.bincount(codes, weights=mask, minlength=width)
+        for name, mask in (
+            ("pending", pending), ("confirmed", status == "confirmed"),
+            ("cancelled", cancelled), ("ever_confirmed", ever_confirmed)
+        )
+    }
+    active = by_status["pending"] + by_status["confirmed"]
+    conversion = _rate(by_status["ever_confirmed"], total)
+    cancellation = _rate(by_status["cancelled"], total)
+
+    # Lead time: slot start (wall clock in the settings' timezone) minus created_at (UTC)
+    slot_start = pd.to_timedelta(frame["preferred_time_slot"].astype(str).str.slice(0, 5) + ":00", errors="coerce")
+    starts_at = (frame["preferred_date"] + slot_start).dt.tz_localize(timezone, ambiguous="NaT", nonexistent="NaT")
+    created = _timestamps(frame["created_at"]).dt.tz_localize("UTC")
+    lead = ((starts_at - created).dt.total_seconds() / 3600).dropna().clip(lower=0).to_numpy()
+    edges = [hours for _, hours in LEAD_TIME_BUCKETS] + [np.inf]
+    histogram, _ = np.histogram(lead, bins=edges)
+
+    days = pd.date_range(start, end, freq="D")
+    available_days = int(np.isin(np.array(WEEKDAYS)[days.dayofweek], settings.get("available_days", [])).sum())
+    capacity = np.array([available_days * max_bookings.get(slot, 0) for slot in slots], dtype=float)
+    utilization = _rate(active, capacity)
+    in_settings = capacity > 0
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "timezone": timezone,
+        "total": int(total.sum()),
+        "heatmap": {
+            "weekdays": WEEKDAYS,
+            "slots": slots,
+            "counts": heatmap.tolist()
+        },
+        "lead_time": {
+            "count": int(lead.size),
+            "mean_hours": round(float(lead.mean()), 1) if lead.size else None,
+            "median_hours": round(float(np.percentile(lead, 50)), 1) if lead.size else None,
+            "p90_hours": round(float(np.percentile(lead, 90)), 1) if lead.size else None,
+            "buckets": [
+                {"label": label, "count": int(count)}
+                for (label, _), count in zip(LEAD_TIME_BUCKETS, histogram)
+            ]
+        },
+        "slots": [
+            {
+                "slot": slot,
+                "bookings": int(total[i]),
+                "pending": int(by_status["pending"][i]),
+                "confirmed": int(by_status["confirmed"][i]),
+                "cancelled": int(by_status["cancelled"][i]),
+                "conversion_rate": conversion[i],
+                "cancellation_rate": cancellation[i],
+                "max_bookings": max_bookings.get(slot),
+                "capacity": int(capacity[i]),
+                "utilization": utilization[i]
+            }
+            for i, slot in enumerate(slots)
+        ],
+        "available_days": available_days,
+        "utilization": _rate(np.array([active[in_settings].sum()]), np.array([capacity.sum()]))[0]
+    }
+
+
+async def _load_report(start: date, end: date) -> dict:
+    docs = await bookings_collection.find(
+        date_range_filter("preferred_date", gte=start, lt=end + timedelta(days=1)),
+        {"_id": 0, **{field: 1 for field in FIELDS}}
+    ).to_list(length=None)
+    settings = await booking_settings_collection.find_one({"is_active": True}, {"_id": 0})
+    return await asyncio.to_thread(build_report, docs, settings, start, end)
+
+
+async def booking_report(start: date, end: date) -> Dict[str, object]:
+    """Cached demand report for bookings with preferred_date in start..end (inclusive)"""
+    return await booking_report_cache.get_or_load((start, end), lambda: _load_report(start, end))
+
+
+async def invalidate_booking_analytics(request: Request):
+    """Router dependency: drop cached reports after any write on bookings or their settings"""
+    try:
+        yield
+    finally:
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            booking_report_cache.invalidate()
@@ -0,0 +1,90 @@
+"""
+Process-local caches for read-mostly data served to every visitor.
+
+Each worker keeps its own copy. The worker that handles an admin edit
+invalidates its entries straight away; other workers pick the change up
+once their entries expire after CACHE_TTL_SECONDS, which bounds how stale
+a multi-worker deployment can be. CACHE_ENABLED=false turns every cache
+into a pass-through (each get_or_load calls the loader).
+
+Concurrent misses for the same key share one load, so a cold cache under
+load costs one query rather than one per request.
+"""
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+from utils.metrics import _metric
+import asyncio
+import os
+import time
+
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "true").lower() == "true"
+CACHE_TTL_SECONDS = float(os.environ.get("CACHE_TTL_SECONDS", 60))
+
+CACHE_REQUESTS = _metric(
+    "counter", "cache_requests_total",
+    "Process-local cache lookups by cache name and result",
+    ("cache", "result")
+)
+
+
+class LocalCache:
+    """A small TTL + LRU cache with single-flight loading"""
+
+    def __init__(self, name: str, ttl: Optional[float] = None, maxsize: int = 256):
+        self.name = name
+        self.ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+        self.maxsize = maxsize
+        # Bumped on every invalidation; loads started before a bump are not stored
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._loading: dict = {}
+
+    def get(self, key: Hashable) -> Any:
+        """The cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if not CACHE_ENABLED:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when key is None"""
+        self.generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            CACHE_REQUESTS.labels(self.name, "hit").inc()
+            return value
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        generation = self.generation
+        pending = asyncio.ensure_future(loader())
+        self._loading[key] = pending
+        try:
+            value = await asyncio.shield(pending)
+        finally:
+            self._loading.pop(key, None)
+        if generation == self.generation:
+            self.set(key, value)
+        return value
@@ -5,6 +5,8 @@
 # These are approximate rates and should be updated periodically for accuracy
 # ============================================================================
 
+import numpy as np
+
 # Fixed Exchange Rates (as of 2025)
 # All rates are relative to INR (1 INR = X currency)
 EXCHANGE_RATES = {
@@ -74,6 +76,37 @@ def convert_currency(amount: float, from_currency: str = "INR", to_currency: str
     
     return round(converted_amount, 2)
 
+# Currency x currency conversion factors for converting many amounts at once:
+# RATE_MATRIX[CURRENCY_INDEX[from], CURRENCY_INDEX[to]] is what one unit of
+# `from` is worth in `to` (the same INR cross rate convert_currency uses)
+CURRENCY_CODES = list(EXCHANGE_RATES.keys())
+CURRENCY_INDEX = {code: index for index, code in enumerate(CURRENCY_CODES)}
+_RATES = np.array([EXCHANGE_RATES[code] for code in CURRENCY_CODES])
+RATE_MATRIX = _RATES[np.newaxis, :] / _RATES[:, np.newaxis]
+
+def convert_amounts(amounts: np.ndarray, currency_indexes: np.ndarray, to_currency: str = "INR") -> np.ndarray:
+    """
+    Convert an array of amounts in one vectorized pass
+    
+    Args:
+        amounts: Amounts, one row per item (1-D, or 2-D for several amounts per item)
+        currency_indexes: CURRENCY_INDEX of each item's currency
+        to_currency: Target currency code (default: INR)
+    
+    Returns:
+        np.ndarray: Converted amounts (not rounded)
+    
+    Example:
+        convert_amounts(np.array([100000.0, 50.0]), np.array([CURRENCY_INDEX["INR"], CURRENCY_INDEX["USD"]]), "USD")
+    """
+    if to_currency not in CURRENCY_INDEX:
+        raise ValueError(f"Unknown target currency: {to_currency}")
+    
+    factors = RATE_MATRIX[currency_indexes, CURRENCY_INDEX[to_currency]]
+    if amounts.ndim > 1:
+        factors = factors[:, np.newaxis]
+    return amounts * factors
+
 def format_currency(amount: float, currency: str = "INR") -> str:
     """
     Format amount with currency symbol
@@ -0,0 +1,181 @@
+"""
+Date/time handling shared by every collection.
+
+Timestamps are stored as native BSON dates. MongoDB keeps them in UTC and
+Motor hands them back as naive UTC datetimes; `date` objects (calendar
+fields such as start_date or a booking's preferred_date) are stored as
+midnight UTC through the DateEncoder registered on the client.
+
+Older documents may still hold ISO strings until
+scripts/maintenance/migrate_datetimes.py has run, so the readers below
+accept both. to_iso() / to_date_str() are the single serialization path
+for API responses; response schemas use them through the IsoDateTime and
+IsoDate field types.
+"""
+from bson.codec_options import TypeEncoder, TypeRegistry
+from pydantic import BeforeValidator
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Annotated, Any, Dict, Iterable, Optional
+
+# Timestamp and calendar-date fields per collection. Dotted paths walk into
+# arrays of sub-documents (e.g. a project's activity_log entries).
+DATETIME_FIELDS: Dict[str, list] = {
+    "admins": ["created_at"],
+    "users": ["created_at"],
+    "clients": ["created_at", "updated_at"],
+    "client_projects": [
+        "created_at", "updated_at", "last_activity_at",
+        "start_date", "expected_delivery", "actual_delivery",
+        "milestones.created_at", "milestones.due_date", "milestones.completion_date",
+        "tasks.created_at", "tasks.due_date", "tasks.completed_at",
+        "files.uploaded_at",
+        "comments.created_at",
+        "chat_messages.created_at",
+        "activity_log.timestamp",
+        "team_members.added_at",
+    ],
+    "contacts": ["created_at"],
+    "newsletter": ["created_at"],
+    "conversations": ["created_at", "last_message_at", "messages.timestamp"],
+    "bookings": ["preferred_date", "created_at", "updated_at", "confirmed_at", "cancelled_at"],
+    "booking_settings": ["created_at", "updated_at"],
+    "blogs": ["created_at", "updated_at"],
+    "projects": ["created_at", "updated_at"],
+    "services": ["created_at", "updated_at"],
+    "skills": ["created_at"],
+    "notes": ["created_at", "updated_at"],
+    "storage": ["created_at", "updated_at"],
+    "content": ["updated_at"],
+    "page_content": ["updated_at"],
+    "settings": ["updated_at"],
+    "pricing": ["updated_at"],
+    "about_content": ["updated_at"],
+    "contact_page": ["updated_at"],
+    "credentials": ["created_at", "updated_at"],
+}
+
+
+class DateEncoder(TypeEncoder):
+    """Store datetime.date values as midnight UTC BSON dates"""
+    python_type = date
+
+    def transform_python(self, value: date) -> datetime:
+        return datetime.combine(value, time())
+
+
+type_registry = TypeRegistry([DateEncoder()])
+
+
+def to_datetime(value: Any) -> Optional[datetime]:
+    """
+    Coerce an ISO string, date or datetime to a naive UTC datetime.
+    Returns None for empty values and leaves unparseable strings alone.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time())
+    if isinstance(value, str):
+        try:
+            return to_datetime(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            return value
+    return value
+
+
+def to_iso(value: Any, tz=None) -> Optional[str]:
+    """
+    Render a stored timestamp for an API response. Naive datetimes are UTC;
+    pass tz to render in a local zone (e.g. bookings in IST).
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        if tz is not None:
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            value = value.astimezone(tz)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def to_date_str(value: Any) -> Optional[str]:
+    """Render a stored calendar date as YYYY-MM-DD"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return value[:10]
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
+
+
+def date_equals(value: Any) -> Dict[str, Any]:
+    """
+    Query condition matching a date stored natively or, until the migration
+    has run, as the equivalent ISO string.
+    """
+    return {"$in": [to_datetime(value), to_iso(value)]}
+
+
+def date_range_filter(field: str, gte: Any = None, lt: Any = None) -> Dict[str, Any]:
+    """
+    Range filter on a date field. BSON comparisons never cross types, so
+    legacy string values get their own branch until the migration has run.
+    """
+    native, legacy = {}, {}
+    if gte is not None:
+        native["$gte"], legacy["$gte"] = to_datetime(gte), to_iso(gte)
+    if lt is not None:
+        native["$lt"], legacy["$lt"] = to_datetime(lt), to_iso(lt)
+    return {"$or": [{field: native}, {field: legacy}]}
+
+
+def _walk(doc: Dict[str, Any], parts: list, changed: Dict[str, Any], prefix: str):
+    key = parts[0]
+    if key not in doc:
+        return
+    value = doc[key]
+    path = f"{prefix}{key}"
+
+    if len(parts) == 1:
+        converted = to_datetime(value)
+        if isinstance(converted, datetime) and converted is not value:
+            doc[key] = converted
+            changed[path] = converted
+        return
+
+    if isinstance(value, list):
+        for i, item in enumerate(value):
+            if isinstance(item, dict):
+                _walk(item, parts[1:], changed, f"{path}.{i}.")
+    elif isinstance(value, dict):
+        _walk(value, parts[1:], changed, f"{path}.")
+
+
+def normalize_datetimes(doc: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Convert the given (dotted) date fields of a document to native datetimes
+    in place. Returns a {mongo path: new value} map of what changed, ready to
+    be used as a $set.
+    """
+    changed: Dict[str, Any] = {}
+    for field in fields:
+        _walk(doc, field.split("."), changed, "")
+    return changed
+
+
+# Bookings are shown in India Standard Time
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+
+# Response schema field types: accept a stored datetime (or a legacy ISO
+# string) and always serialize it as a string.
+IsoDateTime = Annotated[str, BeforeValidator(to_iso)]
+IstDateTime = Annotated[str, BeforeValidator(lambda value: to_iso(value, tz=IST))]
+IsoDate = Annotated[str, BeforeValidator(to_date_str)]
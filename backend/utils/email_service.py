@@ -1,6 +1,9 @@
 import os
+import time
 import requests
 from typing import Optional
+from utils.dates import to_date_str
+from utils.metrics import EMAIL_SEND_DURATION
 
 BREVO_API_KEY = os.environ.get('BREVO_API_KEY', '')
 BREVO_API_URL = "https://api.brevo.com/v3/smtp/email"
@@ -8,6 +11,18 @@ ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'admin@mspndev.com')
 BREVO_SENDER_EMAIL = os.environ.get('BREVO_SENDER_EMAIL', 'noreply@mspndev.com')
 BREVO_SENDER_NAME = os.environ.get('BREVO_SENDER_NAME', 'MSPN DEV')
 
+def _post_email(kind: str, email_data: dict, headers: dict):
+    """POST to the Brevo API, recording latency by email kind and outcome"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = requests.post(BREVO_API_URL, json=email_data, headers=headers)
+        response.raise_for_status()
+        outcome = "sent"
+        return response
+    finally:
+        EMAIL_SEND_DURATION.labels(kind, outcome).observe(time.perf_counter() - started)
+
 def send_contact_email(name: str, email: str, message: str, phone: Optional[str] = None) -> bool:
     """Send contact form notification email via Brevo"""
     
@@ -54,8 +69,7 @@ def send_contact_email(name: str, email: str, message: str, phone: Optional[str]
     }
     
     try:
-        response = requests.post(BREVO_API_URL, json=email_data, headers=headers)
-        response.raise_for_status()
+        _post_email("contact", email_data, headers)
         print(f"Email sent successfully to {ADMIN_EMAIL}")
         return True
     except requests.exceptions.RequestException as e:
@@ -101,8 +115,7 @@ def send_chat_notification(customer_name: str, customer_email: str, message: str
     }
     
     try:
-        response = requests.post(BREVO_API_URL, json=email_data, headers=headers)
-        response.raise_for_status()
+        _post_email("chat", email_data, headers)
         print(f"Chat notification sent to {ADMIN_EMAIL}")
         return True
     except requests.exceptions.RequestException as e:
@@ -143,7 +156,7 @@ async def send_booking_notification(booking_data: dict) -> bool:
                     <p><strong>Name:</strong> {booking_data.get('name')}</p>
                     <p><strong>Email:</strong> {booking_data.get('email')}</p>
                     <p><strong>Phone:</strong> {booking_data.get('phone')}</p>
-                    <p><strong>Preferred Date:</strong> {booking_data.get('preferred_date')}</p>
+                    <p><strong>Preferred Date:</strong> {to_date_str(booking_data.get('preferred_date'))}</p>
                     <p><strong>Preferred Time:</strong> {booking_data.get('preferred_time_slot')}</p>
                     <p><strong>Meeting Type:</strong> {booking_data.get('meeting_type')}</p>
                     {message_text}
@@ -160,8 +173,7 @@ async def send_booking_notification(booking_data: dict) -> bool:
     }
     
     try:
-        response = requests.post(BREVO_API_URL, json=email_data, headers=headers)
-        response.raise_for_status()
+        _post_email("booking", email_data, headers)
         print(f"Booking notification sent to {ADMIN_EMAIL}")
         return True
     except requests.exceptions.RequestException as e:
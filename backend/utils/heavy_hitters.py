@@ -0,0 +1,72 @@
+"""
+Space-saving top-K counter (Metwally et al.).
+
+Keeps at most `capacity` keys with a count and an error bound. A new key
+arriving when the table is full replaces the smallest entry and inherits
+its count as error, so every key whose true count exceeds total/capacity
+is guaranteed to be present, and count - error <= true count <= count.
+Memory is fixed at `capacity` entries however many distinct keys arrive.
+
+Summaries merge (for combining workers and days): counts of shared keys
+add up, a key missing from a full summary is credited with that
+summary's smallest count as both count and error, then the largest
+`capacity` entries are kept.
+"""
+from typing import Dict, List, Tuple
+
+DEFAULT_CAPACITY = 100
+
+
+class SpaceSaving:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        # key -> [count, error]
+        self.counters: Dict[str, List[int]] = {}
+
+    def add(self, key: str, count: int = 1):
+        entry = self.counters.get(key)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [count, 0]
+        else:
+            smallest = min(self.counters, key=lambda item: self.counters[item][0])
+            floor = self.counters.pop(smallest)[0]
+            self.counters[key] = [floor + count, floor]
+
+    def _floor(self) -> int:
+        """What a key missing from this summary may have had"""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def merge(self, other: "SpaceSaving"):
+        floor, other_floor = self._floor(), other._floor()
+        merged = {}
+        for key in self.counters.keys() | other.counters.keys():
+            count, error = self.counters.get(key, (floor, floor))
+            other_count, other_error = other.counters.get(key, (other_floor, other_floor))
+            merged[key] = [count + other_count, error + other_error]
+        largest = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.capacity]
+        self.counters = dict(largest)
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """[(key, count, error)], largest first"""
+        ranked = sorted(self.counters.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(key, count, error) for key, (count, error) in ranked[:n]]
+
+    def stored(self) -> list:
+        return [[key, count, error] for key, (count, error) in self.counters.items()]
+
+    @classmethod
+    def from_stored(cls, value: list, capacity: int = DEFAULT_CAPACITY) -> "SpaceSaving":
+        summary = cls(capacity)
+        summary.counters = {key: [count, error] for key, count, error in value}
+        return summary
+
+    @classmethod
+    def union(cls, summaries, capacity: int = DEFAULT_CAPACITY) -> "SpaceSaving":
+        merged = cls(capacity)
+        for summary in summaries:
+            merged.merge(summary)
+        return merged
@@ -1,6 +1,7 @@
 import re
 from datetime import datetime
 from typing import Any, Dict
+from .dates import to_iso
 
 def create_slug(title: str) -> str:
     """Create a URL-friendly slug from a title"""
@@ -21,6 +22,6 @@ def serialize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
     # Convert datetime objects to ISO strings
     for key, value in doc.items():
         if isinstance(value, datetime):
-            doc[key] = value.isoformat()
+            doc[key] = to_iso(value)
     
     return doc
@@ -0,0 +1,70 @@
+"""
+HyperLogLog distinct counter.
+
+A sketch is 2^p one-byte registers (4 KB at the default p=12) however many
+items go in, estimates distinct counts with a standard error of about
+1.04 / sqrt(2^p) (1.6% at p=12), and two sketches merge losslessly by
+taking the larger register, so per-day sketches combine into any range.
+
+Items are added by a 64-bit hash, which callers supply (their ids are
+hashes already).
+"""
+from bson import Binary
+from typing import Iterable, Optional
+import math
+
+DEFAULT_PRECISION = 12
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None and len(registers) != self.size:
+            raise ValueError(f"Expected {self.size} registers, got {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+
+    def add_hash(self, value: int):
+        """Add an item by its 64-bit hash"""
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        # Position of the first 1 bit in the remaining bits, counted from 1
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def is_empty(self) -> bool:
+        return not any(self.registers)
+
+    def count(self) -> int:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    def stored(self) -> Binary:
+        return Binary(self.to_bytes())
+
+    @classmethod
+    def from_stored(cls, value: bytes) -> "HyperLogLog":
+        registers = bytes(value)
+        return cls(len(registers).bit_length() - 1, registers)
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        merged = cls(precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
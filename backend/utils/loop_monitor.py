@@ -0,0 +1,171 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A heartbeat task sleeps for LOOP_MONITOR_INTERVAL_MS at a time and records
+how late it wakes up (the loop lag). A daemon sampling thread watches that
+heartbeat; when it goes stale for more than LOOP_BLOCK_THRESHOLD_MS the
+loop thread is stuck in synchronous code, so the thread grabs the loop
+thread's stack and the request that was running. Once the loop recovers the
+incident is logged as one JSON line and counted in the metrics.
+
+Strict (test) mode: set LOOP_MONITOR_STRICT_MS=N and any request that blocks
+the loop for more than N ms fails with BlockingCallError. Responses are held
+back until the handler returns (so streaming responses arrive in one piece),
+which lets a request over the limit answer 500 instead; TestClient also
+re-raises the error, so the test that triggered it fails.
+"""
+from utils.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+from utils.request_context import describe_scope
+from collections import deque
+from typing import Optional
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_ENABLED = os.environ.get("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL_MS = float(os.environ.get("LOOP_MONITOR_INTERVAL_MS", 100))
+LOOP_BLOCK_THRESHOLD_MS = float(os.environ.get("LOOP_BLOCK_THRESHOLD_MS", 100))
+LOOP_MONITOR_STRICT_MS = float(os.environ.get("LOOP_MONITOR_STRICT_MS", 0)) or None
+
+# Innermost frames kept from a captured stack
+STACK_DEPTH = 25
+
+
+class BlockingCallError(RuntimeError):
+    """A request blocked the event loop for longer than the strict limit"""
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+        threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS,
+        strict_ms: Optional[float] = LOOP_MONITOR_STRICT_MS
+    ):
+        self.threshold = threshold_ms / 1000
+        self.strict = strict_ms / 1000 if strict_ms else None
+        if self.strict:
+            # Short stalls only show up with a fine-grained heartbeat
+            interval_ms = min(interval_ms, 5)
+            self.threshold = min(self.threshold, self.strict)
+        self.interval = interval_ms / 1000
+        self.sample_interval = max(0.002, min(self.interval, self.threshold) / 4)
+
+        self.loop = None
+        self.loop_thread_id = None
+        self.heartbeat = 0.0
+        self.incidents = deque(maxlen=50)
+        self._capture = None
+        self._beat_task = None
+        self._thread = None
+        self._stop = threading.Event()
+        # Running request task -> its ASGI scope, to name the blocking route
+        self._request_scopes = weakref.WeakKeyDictionary()
+        # Strict mode: request task -> longest stall seen (seconds)
+        self._blocked = weakref.WeakKeyDictionary()
+
+    @property
+    def running(self) -> bool:
+        return self._beat_task is not None
+
+    async def start(self):
+        if self.running:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self._stop.clear()
+        self._beat_task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._sample, name="loop-monitor", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Event loop monitor started (threshold {self.threshold * 1000:.0f}ms"
+            f"{f', strict {self.strict * 1000:.0f}ms' if self.strict else ''})"
+        )
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._beat_task.cancel()
+        try:
+            await self._beat_task
+        except asyncio.CancelledError:
+            pass
+        self._beat_task = None
+
+    # ---- request tracking (called by LoopMonitorMiddleware) ----
+
+    def track_request(self, task: asyncio.Task, scope: dict):
+        self._request_scopes[task] = scope
+
+    def finish_request(self, task: asyncio.Task) -> Optional[float]:
+        """Stop tracking a request; returns its longest stall in strict mode"""
+        self._request_scopes.pop(task, None)
+        return self._blocked.pop(task, None)
+
+    # ---- loop side ----
+
+    async def _beat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.heartbeat = now
+            lag = max(0.0, now - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                self._report(lag)
+
+    def _report(self, lag: float):
+        capture, self._capture = self._capture, None
+        incident = {
+            "event": "event_loop_blocked",
+            "lag_ms": round(lag * 1000, 1),
+            "route": capture["route"] if capture else None,
+            "stack": capture["stack"] if capture else None,
+            "at": time.time()
+        }
+        self.incidents.append(incident)
+        EVENT_LOOP_BLOCKED.labels(incident["route"] or "unknown").inc()
+        logger.warning(json.dumps(incident))
+
+    # ---- sampling thread ----
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            stalled = time.monotonic() - self.heartbeat - self.interval
+            if stalled < self.threshold:
+                continue
+
+            task = self._current_task()
+            if self._capture is None:
+                self._capture = {"route": self._describe(task), "stack": self._loop_stack()}
+            if self.strict and stalled >= self.strict and task in self._request_scopes:
+                self._blocked[task] = max(stalled, self._blocked.get(task, 0.0))
+
+    def _current_task(self) -> Optional[asyncio.Task]:
+        try:
+            return asyncio.current_task(self.loop)
+        except RuntimeError:
+            return None
+
+    def _describe(self, task: Optional[asyncio.Task]) -> Optional[str]:
+        return describe_scope(self._request_scopes.get(task) if task is not None else None)
+
+    def _loop_stack(self) -> Optional[str]:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame)[-STACK_DEPTH:])
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,210 @@
+"""
+Prometheus metrics.
+
+All metrics are defined here and exposed at GET /metrics (see
+routes/metrics.py). prometheus_client is optional: without it every metric
+below is a no-op and /metrics returns 503.
+
+Multiple uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the workers start. Each worker then writes its
+samples to mmap files there and /metrics aggregates all of them through a
+MultiProcessCollector. Wipe the directory on deploy.
+"""
+from pymongo import monitoring
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # optional dependency
+    prometheus_client = None
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true" and prometheus_client is not None
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Latency buckets (seconds) tuned for API requests and Mongo commands
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _NoopMetric:
+    """Stands in for every metric when prometheus_client is unavailable"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+    @contextmanager
+    def time(self):
+        yield
+
+
+def _metric(kind: str, name: str, documentation: str, labelnames=(), **kwargs):
+    if not METRICS_ENABLED:
+        return _NoopMetric()
+    if kind == "gauge":
+        # Gauges need to say how per-worker values combine
+        kwargs.setdefault("multiprocess_mode", "livesum")
+    metric_class = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind]
+    return metric_class(name, documentation, labelnames, **kwargs)
+
+
+HTTP_REQUESTS = _metric(
+    "counter", "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = _metric(
+    "histogram", "http_request_duration_seconds",
+    "HTTP request latency by route template and method",
+    ("method", "route"), buckets=REQUEST_BUCKETS
+)
+HTTP_IN_PROGRESS = _metric(
+    "gauge", "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ("method",)
+)
+MONGO_COMMAND_DURATION = _metric(
+    "histogram", "mongodb_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ("collection", "command"), buckets=DB_BUCKETS
+)
+MONGO_COMMAND_FAILURES = _metric(
+    "counter", "mongodb_command_failures_total",
+    "Failed MongoDB commands by collection and command",
+    ("collection", "command")
+)
+MONGO_POOL_WAIT = _metric(
+    "histogram", "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=DB_BUCKETS
+)
+MONGO_POOL_CHECKOUT_FAILURES = _metric(
+    "counter", "mongodb_pool_checkout_failures_total",
+    "Connection pool checkouts that failed, by reason",
+    ("reason",)
+)
+BCRYPT_DURATION = _metric(
+    "histogram", "bcrypt_duration_seconds",
+    "Time spent hashing or verifying passwords",
+    ("operation",), buckets=SLOW_BUCKETS
+)
+EMAIL_SEND_DURATION = _metric(
+    "histogram", "email_send_duration_seconds",
+    "Latency of transactional email API calls by email kind and outcome",
+    ("kind", "outcome"), buckets=SLOW_BUCKETS
+)
+EVENT_LOOP_LAG = _metric(
+    "histogram", "event_loop_lag_seconds",
+    "How late the event loop heartbeat woke up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+EVENT_LOOP_BLOCKED = _metric(
+    "counter", "event_loop_blocked_total",
+    "Event loop stalls over the blocking threshold, by the route that was running",
+    ("route",)
+)
+ANALYTICS_INSERTS_IN_PROGRESS = _metric(
+    "gauge", "analytics_inserts_in_progress",
+    "Analytics event inserts currently awaiting MongoDB"
+)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records every MongoDB command's latency by collection and command name"""
+
+    def __init__(self):
+        self._pending = {}
+
+    def started(self, event):
+        command = event.command
+        collection = command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        if not isinstance(collection, str):
+            collection = "-"
+        self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event):
+        return self._pending.pop((event.connection_id, event.request_id), "-")
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Measures pool checkout wait. PyMongo checks connections out on the
+    calling (executor) thread and the events carry no correlation id, so
+    the start time is kept per thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            MONGO_POOL_WAIT.observe(time.perf_counter() - started)
+            self._local.started = None
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        MONGO_POOL_CHECKOUT_FAILURES.labels(str(event.reason)).inc()
+
+    # The remaining pool events are not needed
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_created(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_checked_in(self, event): pass
+
+
+def mongo_event_listeners() -> list:
+    """Listeners to pass to the Mongo client; empty when metrics are off"""
+    if not METRICS_ENABLED:
+        return []
+    return [CommandMetricsListener(), PoolMetricsListener()]
+
+
+def render_metrics():
+    """Returns (body, content type) for the scrape endpoint"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead():
+    """Drop this worker's live gauges from the multiprocess directory on shutdown"""
+    if METRICS_ENABLED and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,270 @@
+"""
+Keyset pagination, sorting and sparse fieldsets for list endpoints.
+
+Query parameters understood by every paginated endpoint:
+    limit=50                page size (each endpoint has its own default and maximum)
+    sort=-created_at,name   comma separated, '-' for descending; only the
+                            endpoint's sortable fields
+    cursor=...              continue after the last item of the previous page
+    fields=id,name,email    return only these fields of the response model
+    include_total=true      also count the matching documents
+
+The body stays a plain JSON list, so existing clients keep working, and the
+paging metadata travels in headers:
+    X-Next-Cursor   cursor for the next page (absent on the last page)
+    X-Total-Count   number of matching documents, with include_total=true
+                    (an estimate from collection metadata when unfiltered)
+    Link            the next page's URL, rel="next"
+
+Cursors are opaque url-safe strings holding the sort spec and the last
+item's sort values plus its id, which breaks ties. The next page is fetched
+with a range query on those values instead of skip(), so every page costs
+the same however deep it is.
+
+Usage:
+    @router.get("/admin/all", response_model=List[ContactResponse])
+    async def get_all_contacts(
+        response: Response,
+        page: PageRequest = Depends(paginate(ContactResponse, sortable=("created_at", "name")))
+    ):
+        contacts = await page.fetch(contacts_collection, {})
+        return page.respond(response, contacts, serialize_document)
+"""
+from fastapi import HTTPException, Query, Request, Response, status
+from bson import json_util
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from utils.dates import to_iso
+from utils.responses import trusted_response
+import asyncio
+import base64
+import binascii
+import os
+
+PAGE_MAX_LIMIT = int(os.environ.get("PAGE_MAX_LIMIT", 1000))
+
+
+def _get(doc: dict, path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+
+def encode_cursor(sort_spec: str, values: list) -> str:
+    raw = json_util.dumps({"s": sort_spec, "v": values}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_spec: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json_util.loads(raw)
+        values = data["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if data.get("s") != sort_spec:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor was issued for a different sort order"
+        )
+    return values
+
+
+class PageRequest:
+    """One parsed page request; fetches the page and builds the response"""
+
+    def __init__(
+        self,
+        request: Request,
+        sort: List[Tuple[str, int]],
+        sort_spec: str,
+        limit: int,
+        cursor: Optional[str],
+        fields: Optional[List[str]],
+        include_total: bool,
+        id_field: str,
+        field_map: dict
+    ):
+        self.request = request
+        self.id_field = id_field
+        if not sort or sort[-1][0] != id_field:
+            # The id is the final tie-breaker, in the direction of the last key
+            sort = sort + [(id_field, sort[-1][1] if sort else 1)]
+        self.sort = sort
+        self.sort_spec = sort_spec
+        self.limit = limit
+        self.after = decode_cursor(cursor, sort_spec) if cursor else None
+        if self.after is not None and len(self.after) != len(self.sort):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        self.fields = fields
+        self.field_map = field_map
+        self.include_total = include_total
+        self.next_cursor: Optional[str] = None
+        self.total: Optional[int] = None
+
+    def _keyset_filter(self) -> dict:
+        """Documents strictly after the cursor position in sort order"""
+        branches = []
+        for i, (field, direction) in enumerate(self.sort):
+            value = self.after[i]
+            if value is None:
+                if direction == -1:
+                    # Nothing sorts below null in descending order
+                    continue
+                comparisons = [{"$ne": None}]
+            elif direction == -1:
+                # Null and missing values sort after every value in descending
+                # order, and no range operator matches them
+                comparisons = [{"$lt": value}, None]
+                if isinstance(value, datetime):
+                    # Range operators never cross BSON types, and legacy ISO-string
+                    # dates (utils/dates.py) sort below every native date
+                    comparisons.append({"$type": "string"})
+            else:
+                comparisons = [{"$gt": value}]
+                if isinstance(value, str):
+                    comparisons.append({"$type": "date"})
+            prefix = {prev_field: self.after[j] for j, (prev_field, _) in enumerate(self.sort[:i])}
+            branches.extend({**prefix, field: comparison} for comparison in comparisons)
+        return {"$or": branches} if branches else {"_id": {"$exists": False}}
+
+    async def _count(self, collection, query: dict) -> int:
+        if not query:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(query)
+
+    async def fetch(self, collection, query: Optional[dict] = None, projection: Optional[dict] = None) -> List[dict]:
+        """
+        Fetch one page of documents matching query. projection applies when
+        no fields= were requested (e.g. to leave out large bodies).
+        """
+        query = query or {}
+        filter_ = {"$and": [query, self._keyset_filter()]} if self.after is not None else query
+
+        if self.fields:
+            projection = {self.field_map.get(field, field): 1 for field in self.fields}
+        if projection is not None:
+            # The cursor needs the sort keys
+            projection = {**projection, **{field: 1 for field, _ in self.sort}}
+
+        find = collection.find(filter_, projection).sort(self.sort).limit(self.limit + 1).to_list(self.limit + 1)
+        if self.include_total:
+            docs, self.total = await asyncio.gather(find, self._count(collection, query))
+        else:
+            docs = await find
+
+        if len(docs) > self.limit:
+            docs = docs[:self.limit]
+            last = docs[-1]
+            self.next_cursor = encode_cursor(self.sort_spec, [_get(last, field) for field, _ in self.sort])
+        return docs
+
+    def _headers(self) -> dict:
+        headers = {}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+            next_url = self.request.url.include_query_params(cursor=self.next_cursor)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        if self.total is not None:
+            headers["X-Total-Count"] = str(self.total)
+        return headers
+
+    def respond(
+        self,
+        response: Response,
+        docs: Iterable[dict],
+        convert: Callable[[dict], Any],
+        envelope: Optional[str] = None
+    ):
+        """
+        Return the page, wrapped as {envelope: [...]} if given. Full
+        documents go through convert and the route's response_model; with
+        fields= only the requested fields are sent.
+        """
+        if not self.fields:
+            response.headers.update(self._headers())
+            items = [convert(doc) for doc in docs]
+            return {envelope: items} if envelope else items
+
+        items = []
+        for doc in docs:
+            item = {}
+            for field in self.fields:
+                value = _get(doc, self.field_map.get(field, field))
+                item[field] = to_iso(value) if isinstance(value, datetime) else value
+            items.append(item)
+        page = trusted_response({envelope: items} if envelope else items)
+        page.headers.update(self._headers())
+        return page
+
+
+def paginate(
+    response_model,
+    sortable: Iterable[str] = ("created_at",),
+    default_sort: str = "-created_at",
+    default_limit: int = 100,
+    max_limit: Optional[int] = None,
+    id_field: str = "id",
+    field_map: Optional[dict] = None
+) -> Callable:
+    """
+    Dependency factory for a paginated list endpoint. Only fields declared
+    on response_model can be requested with fields=, so internal fields
+    never leak through a projection. field_map maps response field names
+    to document fields where they differ; sort keys are document fields.
+    """
+    sortable = set(sortable) | {id_field}
+    allowed_fields = set(response_model.model_fields)
+    max_limit = max(default_limit, max_limit or PAGE_MAX_LIMIT)
+
+    def parse_sort(spec: str) -> List[Tuple[str, int]]:
+        sort = []
+        for part in filter(None, (item.strip() for item in spec.split(","))):
+            field = part.lstrip("-+")
+            if field not in sortable:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot sort by '{field}'. Sortable fields: {', '.join(sorted(sortable))}"
+                )
+            sort.append((field, -1 if part.startswith("-") else 1))
+            if field == id_field:
+                # Ids are unique, so later keys could never apply
+                break
+        return sort
+
+    def dependency(
+        request: Request,
+        limit: int = Query(default_limit, ge=1, le=max_limit),
+        sort: Optional[str] = Query(None, description="e.g. -created_at,name"),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None, description="e.g. id,name,created_at"),
+        include_total: bool = Query(False)
+    ) -> PageRequest:
+        sort_spec = sort or default_sort
+        requested = None
+        if fields:
+            requested = [field.strip() for field in fields.split(",") if field.strip()]
+            unknown = set(requested) - allowed_fields
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+                )
+            if id_field in allowed_fields and id_field not in requested:
+                requested.insert(0, id_field)
+
+        return PageRequest(
+            request,
+            parse_sort(sort_spec),
+            sort_spec,
+            limit,
+            cursor,
+            requested,
+            include_total,
+            id_field,
+            field_map or {}
+        )
+
+    return dependency
@@ -0,0 +1,468 @@
+"""
+Columnar export of analytics and business data for offline analysis.
+
+An export job writes these datasets as Parquet files (pyarrow, PARQUET_COMPRESSION
+zstd or snappy) under PARQUET_EXPORT_DIR, partitioned Hive-style so that
+pandas.read_parquet / DuckDB / Spark read a whole dataset directory:
+
+    analytics/day=YYYY-MM-DD/        raw events, by event timestamp (UTC)
+    bookings/month=YYYY-MM/          bookings, by created_at
+    contacts/month=YYYY-MM/          contact submissions, by created_at
+    client_projects/snapshot=YYYY-MM-DD/
+                                     one summary row per client project
+
+Each dataset has a fixed Arrow schema, so columns keep their types (UTC
+timestamps, dates, integers, booleans) however the documents vary. Contact
+details and free text (names, emails, phones, messages) are left out.
+
+Runs are incremental: each run reads only the partitions not complete on
+disk (every closed one missing since the oldest document, plus the open
+one), one partition at a time, PARQUET_CHUNK_ROWS rows at a time, and each
+partition is written through a .partial file that is renamed once complete.
+A partition written while still open (today / this month) carries an _open
+marker file, which readers skip, so the first run after it closes writes it
+again in full. Closed partitions are written once, empty ones included, so a
+gap on disk always means a partition still to be written; the client-project
+snapshot is rewritten on every run. Legacy ISO-string timestamps are matched
+alongside native dates (utils/dates.py). Documents later added inside a
+closed partition (or bookings whose status changes after their month was
+exported) are not picked up; delete that partition directory to have the
+next run write it again.
+
+The files a job wrote are bundled into jobs/export-<id>.zip for download.
+Jobs are recorded in the exports collection; a unique index on running jobs
+allows one at a time across workers.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from typing import Callable, Dict, List, Optional
+from database import (
+    analytics_collection, bookings_collection, contacts_collection,
+    client_projects_collection, exports_collection
+)
+from utils.dates import date_range_filter, to_datetime
+import asyncio
+import logging
+import os
+import uuid
+import zipfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+PARQUET_EXPORT_DIR = Path(os.environ.get("PARQUET_EXPORT_DIR", "./exports"))
+PARQUET_COMPRESSION = os.environ.get("PARQUET_COMPRESSION", "zstd")
+PARQUET_CHUNK_ROWS = int(os.environ.get("PARQUET_CHUNK_ROWS", 50000))
+
+# A running job whose heartbeat is older than this belongs to a dead worker
+STALE_JOB = timedelta(hours=1)
+# Marks a partition written before it closed; readers skip files starting with _
+OPEN_MARKER = "_open"
+
+
+def _timestamp(value) -> Optional[datetime]:
+    value = to_datetime(value)
+    return value if isinstance(value, datetime) else None
+
+
+def _date(value):
+    value = _timestamp(value)
+    return value.date() if value is not None else None
+
+
+def _text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _count(items, **match) -> int:
+    items = items or []
+    if not match:
+        return len(items)
+    return sum(1 for item in items if all(item.get(key) == value for key, value in match.items()))
+
+
+def _analytics_row(event: dict) -> dict:
+    # Time-series layout keeps event_type and page_name under meta (utils/analytics_store.py)
+    event = {**event, **(event.get("meta") or {})}
+    return {
+        "timestamp": _timestamp(event.get("timestamp")),
+        "event_type": _text(event.get("event_type")),
+        "page_name": _text(event.get("page_name")),
+        "blog_id": _text(event.get("blog_id")),
+        "project_id": _text(event.get("project_id")),
+        "visitor_id": _text(event.get("visitor_id")),
+        "referrer": _text(event.get("referrer")),
+        "utm_source": _text(event.get("utm_source")),
+        "utm_medium": _text(event.get("utm_medium")),
+        "utm_campaign": _text(event.get("utm_campaign")),
+    }
+
+
+def _booking_row(booking: dict) -> dict:
+    return {
+        "id": _text(booking.get("id")),
+        "status": _text(booking.get("status")),
+        "meeting_type": _text(booking.get("meeting_type")),
+        "preferred_date": _date(booking.get("preferred_date")),
+        "preferred_time_slot": _text(booking.get("preferred_time_slot")),
+        "has_message": bool(booking.get("message")),
+        "created_at": _timestamp(booking.get("created_at")),
+        "updated_at": _timestamp(booking.get("updated_at")),
+        "confirmed_at": _timestamp(booking.get("confirmed_at")),
+        "cancelled_at": _timestamp(booking.get("cancelled_at")),
+    }
+
+
+def _contact_row(contact: dict) -> dict:
+    return {
+        "id": _text(contact.get("id")),
+        "service": _text(contact.get("service")),
+        "read": bool(contact.get("read", False)),
+        "created_at": _timestamp(contact.get("created_at")),
+    }
+
+
+def _client_project_row(project: dict) -> dict:
+    budget = project.get("budget") or {}
+    return {
+        "id": _text(project.get("id")),
+        "client_id": _text(project.get("client_id")),
+        "name": _text(project.get("name")),
+        "status": _text(project.get("status")),
+        "priority": _text(project.get("priority")),
+        "progress": int(project.get("progress") or 0),
+        "start_date": _date(project.get("start_date")),
+        "expected_delivery": _date(project.get("expected_delivery")),
+        "actual_delivery": _timestamp(project.get("actual_delivery")),
+        "milestones": _count(project.get("milestones")),
+        "milestones_completed": _count(project.get("milestones"), status="completed"),
+        "tasks": _count(project.get("tasks")),
+        "tasks_completed": _count(project.get("tasks"), status="completed"),
+        "files": _count(project.get("files")),
+        "comments": _count(project.get("comments")),
+        "team_size": _count(project.get("team_members")),
+        "budget_total": float(budget.get("total_amount") or 0),
+        "budget_paid": float(budget.get("paid_amount") or 0),
+        "budget_pending": float(budget.get("pending_amount") or 0),
+        "currency": _text(budget.get("currency")) if budget else None,
+        "tags": [str(tag) for tag in project.get("tags") or []],
+        "created_at": _timestamp(project.get("created_at")),
+        "updated_at": _timestamp(project.get("updated_at")),
+        "last_activity_at": _timestamp(project.get("last_activity_at")),
+    }
+
+
+class Dataset:
+    def __init__(self, name: str, collection, partition: str, time_field: Optional[str],
+                 columns: Callable[[], list], to_row: Callable[[dict], dict]):
+        self.name = name
+        self.collection = collection
+        # "day" / "month" of time_field, or "snapshot" (the whole collection as of the run)
+        self.partition = partition
+        self.time_field = time_field
+        self.columns = columns
+        self.to_row = to_row
+
+    def schema(self):
+        return pa.schema(self.columns())
+
+    def key(self, when: datetime) -> str:
+        return when.strftime("%Y-%m-%d" if self.partition in ("day", "snapshot") else "%Y-%m")
+
+    def start(self, key: str) -> datetime:
+        return datetime.strptime(key, "%Y-%m-%d" if self.partition == "day" else "%Y-%m")
+
+    def after(self, key: str) -> datetime:
+        """Start of the partition following key"""
+        start = self.start(key)
+        if self.partition == "day":
+            return start + timedelta(days=1)
+        return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def _timestamp_type():
+    return pa.timestamp("ms", tz="UTC")
+
+
+DATASETS: Dict[str, Dataset] = {
+    dataset.name: dataset for dataset in (
+        Dataset("analytics", analytics_collection, "day", "timestamp", lambda: [
+            ("timestamp", _timestamp_type()),
+            ("event_type", pa.string()),
+            ("page_name", pa.string()),
+            ("blog_id", pa.string()),
+            ("project_id", pa.string()),
+            ("visitor_id", pa.string()),
+            ("referrer", pa.string()),
+            ("utm_source", pa.string()),
+            ("utm_medium", pa.string()),
+            ("utm_campaign", pa.string()),
+        ], _analytics_row),
+        Dataset("bookings", bookings_collection, "month", "created_at", lambda: [
+            ("id", pa.string()),
+            ("status", pa.string()),
+            ("meeting_type", pa.string()),
+            ("preferred_date", pa.date32()),
+            ("preferred_time_slot", pa.string()),
+            ("has_message", pa.bool_()),
+            ("created_at", _timestamp_type()),
+            ("updated_at", _timestamp_type()),
+            ("confirmed_at", _timestamp_type()),
+            ("cancelled_at", _timestamp_type()),
+        ], _booking_row),
+        Dataset("contacts", contacts_collection, "month", "created_at", lambda: [
+            ("id", pa.string()),
+            ("service", pa.string()),
+            ("read", pa.bool_()),
+            ("created_at", _timestamp_type()),
+        ], _contact_row),
+        Dataset("client_projects", client_projects_collection, "snapshot", None, lambda: [
+            ("id", pa.string()),
+            ("client_id", pa.string()),
+            ("name", pa.string()),
+            ("status", pa.string()),
+            ("priority", pa.string()),
+            ("progress", pa.int32()),
+            ("start_date", pa.date32()),
+            ("expected_delivery", pa.date32()),
+            ("actual_delivery", _timestamp_type()),
+            ("milestones", pa.int32()),
+            ("milestones_completed", pa.int32()),
+            ("tasks", pa.int32()),
+            ("tasks_completed", pa.int32()),
+            ("files", pa.int32()),
+            ("comments", pa.int32()),
+            ("team_size", pa.int32()),
+            ("budget_total", pa.float64()),
+            ("budget_paid", pa.float64()),
+            ("budget_pending", pa.float64()),
+            ("currency", pa.string()),
+            ("tags", pa.list_(pa.string())),
+            ("created_at", _timestamp_type()),
+            ("updated_at", _timestamp_type()),
+            ("last_activity_at", _timestamp_type()),
+        ], _client_project_row),
+    )
+}
+
+
+class PartitionWriter:
+    """Writes one partition's rows in chunks to a .partial file, renamed on close"""
+
+    def __init__(self, dataset: Dataset, key: str):
+        self.dataset = dataset
+        self.key = key
+        self.directory = PARQUET_EXPORT_DIR / dataset.name / f"{dataset.partition}={key}"
+        self.path = self.directory / "part-0.parquet"
+        self.partial = self.directory / "part-0.parquet.partial"
+        self.marker = self.directory / OPEN_MARKER
+        self.schema = dataset.schema()
+        self.rows = 0
+        self._writer = None
+
+    def write(self, rows: List[dict]):
+        if self._writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.partial, self.schema, compression=PARQUET_COMPRESSION)
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self, still_open: bool = False) -> Path:
+        """Publish the file; still_open marks it for rewriting once the partition closes"""
+        if self._writer is None:
+            self.write([])
+        self._writer.close()
+        if still_open:
+            self.marker.touch()
+        self.partial.replace(self.path)
+        if not still_open:
+            self.marker.unlink(missing_ok=True)
+        return self.path
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        self.partial.unlink(missing_ok=True)
+
+
+def _closed_partitions(dataset: Dataset, current: str) -> List[str]:
+    root = PARQUET_EXPORT_DIR / dataset.name
+    if not root.is_dir():
+        return []
+    prefix = f"{dataset.partition}="
+    return sorted(
+        entry.name[len(prefix):] for entry in root.iterdir()
+        if entry.name.startswith(prefix) and entry.name[len(prefix):] < current
+        and (entry / "part-0.parquet").exists() and not (entry / OPEN_MARKER).exists()
+    )
+
+
+def _bundle(path: Path, files: List[Path]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".zip.partial")
+    # Parquet pages are already compressed
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_STORED) as bundle:
+        for file in files:
+            bundle.write(file, file.relative_to(PARQUET_EXPORT_DIR).as_posix())
+    partial.replace(path)
+
+
+def bundle_path(job_id: str) -> Path:
+    return PARQUET_EXPORT_DIR / "jobs" / f"export-{job_id}.zip"
+
+
+class ParquetExporter:
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def _heartbeat(self, job_id: str, **fields):
+        await exports_collection.update_one(
+            {"id": job_id}, {"$set": {"heartbeat_at": datetime.utcnow(), **fields}}
+        )
+
+    async def _oldest(self, dataset: Dataset) -> Optional[datetime]:
+        """Oldest time_field value; native dates and legacy strings sort apart in BSON"""
+        oldest = []
+        for bson_type in ("date", "string"):
+            doc = await dataset.collection.find_one(
+                {dataset.time_field: {"$type": bson_type}}, {"_id": 0, dataset.time_field: 1},
+                sort=[(dataset.time_field, 1)]
+            )
+            when = _timestamp(doc.get(dataset.time_field)) if doc else None
+            if when is not None:
+                oldest.append(when)
+        return min(oldest) if oldest else None
+
+    async def _missing_partitions(self, dataset: Dataset, current: str) -> List[str]:
+        """Keys from the oldest document's partition to the open one that are not complete on disk"""
+        when = await self._oldest(dataset)
+        if when is None:
+            return []
+        closed = set(await asyncio.to_thread(_closed_partitions, dataset, current))
+        keys, key = [], min(dataset.key(when), current)
+        while key <= current:
+            if key not in closed:
+                keys.append(key)
+            key = dataset.key(dataset.after(key))
+        return keys
+
+    async def _write_partition(self, dataset: Dataset, key: str, query: dict, still_open: bool) -> PartitionWriter:
+        writer = PartitionWriter(dataset, key)
+        cursor = dataset.collection.find(query, {"_id": 0}, batch_size=min(PARQUET_CHUNK_ROWS, 10000))
+        if dataset.time_field:
+            cursor = cursor.sort(dataset.time_field, 1)
+        chunk: List[dict] = []
+        try:
+            async for doc in cursor:
+                chunk.append(dataset.to_row(doc))
+                if len(chunk) >= PARQUET_CHUNK_ROWS:
+                    await asyncio.to_thread(writer.write, chunk)
+                    chunk = []
+            if chunk:
+                await asyncio.to_thread(writer.write, chunk)
+            await asyncio.to_thread(writer.close, still_open)
+        except BaseException:
+            await asyncio.to_thread(writer.abort)
+            raise
+        return writer
+
+    async def export_dataset(self, dataset: Dataset, job_id: str, now: datetime) -> Dict[str, object]:
+        """Write the dataset's missing and open partitions; returns {rows, files}"""
+        current = dataset.key(now)
+        if dataset.partition == "snapshot":
+            writer = await self._write_partition(dataset, current, {}, still_open=False)
+            return {"rows": writer.rows, "files": [writer.path]}
+
+        files, total = [], 0
+        for key in await self._missing_partitions(dataset, current):
+            query = date_range_filter(dataset.time_field, gte=dataset.start(key), lt=dataset.after(key))
+            writer = await self._write_partition(dataset, key, query, still_open=key >= current)
+            files.append(writer.path)
+            total += writer.rows
+            await self._heartbeat(job_id)
+        return {"rows": total, "files": files}
+
+    async def _run(self, job_id: str, names: List[str]):
+        now = datetime.utcnow()
+        files: List[Path] = []
+        rows: Dict[str, int] = {}
+        try:
+            for name in names:
+                result = await self.export_dataset(DATASETS[name], job_id, now)
+                files.extend(result["files"])
+                rows[name] = result["rows"]
+                await self._heartbeat(job_id, rows=rows)
+            await asyncio.to_thread(_bundle, bundle_path(job_id), files)
+            await exports_collection.update_one({"id": job_id}, {"$set": {
+                "status": "completed",
+                "rows": rows,
+                "files": [file.relative_to(PARQUET_EXPORT_DIR).as_posix() for file in files],
+                "finished_at": datetime.utcnow()
+            }})
+            logger.info(f"Parquet export {job_id} wrote {len(files)} partitions ({rows})")
+        except asyncio.CancelledError:
+            await exports_collection.update_one({"id": job_id}, {"$set": {
+                "status": "failed", "error": "Interrupted by shutdown", "finished_at": datetime.utcnow()
+            }})
+            raise
+        except Exception as e:
+            logger.warning(f"Parquet export {job_id} failed: {str(e)}")
+            await exports_collection.update_one({"id": job_id}, {"$set": {
+                "status": "failed", "error": str(e), "finished_at": datetime.utcnow()
+            }})
+        finally:
+            self._tasks.pop(job_id, None)
+
+    async def start_job(self, names: List[str], requested_by: str) -> Optional[dict]:
+        """Record and start an export of the named datasets, or None while another one is running"""
+        now = datetime.utcnow()
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": "running",
+            "datasets": names,
+            "requested_by": requested_by,
+            "rows": {},
+            "files": [],
+            "error": None,
+            "started_at": now,
+            "heartbeat_at": now,
+            "finished_at": None
+        }
+        try:
+            await exports_collection.insert_one(job)
+        except DuplicateKeyError:
+            # Take over from a worker that died mid-export
+            result = await exports_collection.update_one(
+                {"status": "running", "heartbeat_at": {"$lt": now - STALE_JOB}},
+                {"$set": {"status": "failed", "error": "Worker stopped responding", "finished_at": now}}
+            )
+            if not result.modified_count:
+                return None
+            try:
+                await exports_collection.insert_one(job)
+            except DuplicateKeyError:
+                return None
+        job.pop("_id", None)
+        self._tasks[job["id"]] = asyncio.create_task(self._run(job["id"], names))
+        return job
+
+    async def stop(self):
+        """Cancel running jobs (shutdown); they are recorded as failed"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, PyMongoError):
+                pass
+
+
+parquet_exporter = ParquetExporter()
@@ -0,0 +1,165 @@
+"""
+On-demand profiling of single requests.
+
+A super admin adds `X-Profile: <format>` (or `?__profile=<format>`) to any
+request and ProfilingMiddleware runs just that request under a profiler.
+Formats:
+    html        pyinstrument HTML report (default when pyinstrument is installed)
+    speedscope  pyinstrument speedscope JSON, for https://www.speedscope.app
+    pstats      cProfile stats, for snakeviz / pstats (default otherwise)
+
+Profiles are written to PROFILE_DIR, which keeps only the newest
+PROFILE_MAX_FILES, and are listed and downloaded through /api/admin/profiles.
+The response carries an X-Profile-Id header with the id to download.
+Requests without the flag never touch any of this.
+"""
+from pathlib import Path
+from datetime import datetime
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs
+import cProfile
+import json
+import marshal
+import os
+import re
+import uuid
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency
+    SamplingProfiler = None
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "true").lower() == "true"
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", Path(__file__).parent.parent / "profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", 50))
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", 0.001))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+
+# format -> (file extension, media type)
+FORMATS = {
+    "html": ("html", "text/html"),
+    "speedscope": ("speedscope.json", "application/json"),
+    "pstats": ("prof", "application/octet-stream"),
+}
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+
+
+def requested_format(scope: dict) -> Optional[str]:
+    """The profile format asked for by the request, or None (the common case)"""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").strip().lower()
+
+    query_string = scope.get("query_string", b"")
+    if PROFILE_QUERY_PARAM.encode() in query_string:
+        values = parse_qs(query_string.decode("latin-1"), keep_blank_values=True).get(PROFILE_QUERY_PARAM)
+        if values is not None:
+            return values[0].strip().lower()
+    return None
+
+
+def resolve_format(requested: str) -> str:
+    """Map the requested format onto one this installation can produce"""
+    if requested not in FORMATS:
+        requested = "html"
+    if requested != "pstats" and SamplingProfiler is None:
+        return "pstats"
+    return requested
+
+
+def new_profile_id() -> str:
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+
+class RequestProfiler:
+    """Wraps pyinstrument (sampling) or cProfile behind one start/stop/render API"""
+
+    def __init__(self, output_format: str):
+        self.format = output_format
+        if output_format == "pstats":
+            self.profiler = cProfile.Profile()
+        else:
+            self.profiler = SamplingProfiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+
+    def start(self):
+        if self.format == "pstats":
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def stop(self):
+        if self.format == "pstats":
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+
+    def render(self) -> bytes:
+        if self.format == "pstats":
+            self.profiler.create_stats()
+            return marshal.dumps(self.profiler.stats)
+        if self.format == "speedscope":
+            return self.profiler.output(renderer=SpeedscopeRenderer()).encode("utf-8")
+        return self.profiler.output_html().encode("utf-8")
+
+
+class ProfileStore:
+    """Bounded on-disk ring of profiles, each with a JSON metadata sidecar"""
+
+    def __init__(self, directory: Path = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def save(self, profile_id: str, meta: dict, profiler: RequestProfiler):
+        """Render and write a profile (blocking; run it in a thread)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        extension, _ = FORMATS[profiler.format]
+        body = profiler.render()
+        meta = {**meta, "id": profile_id, "format": profiler.format, "size": len(body)}
+
+        (self.directory / f"{profile_id}.{extension}").write_bytes(body)
+        (self.directory / f"{profile_id}.meta.json").write_text(json.dumps(meta))
+        self._trim()
+
+    def list(self) -> List[dict]:
+        profiles = []
+        for meta_path in sorted(self.directory.glob("*.meta.json"), reverse=True):
+            try:
+                profiles.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Tuple[Path, str, str]]:
+        """Returns (path, download filename, media type) or None"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        meta_path = self.directory / f"{profile_id}.meta.json"
+        if not meta_path.exists():
+            return None
+        extension, media_type = FORMATS[json.loads(meta_path.read_text())["format"]]
+        path = self.directory / f"{profile_id}.{extension}"
+        if not path.exists():
+            return None
+        return path, f"profile-{profile_id}.{extension}", media_type
+
+    def delete(self, profile_id: str) -> bool:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return False
+        removed = False
+        for path in self.directory.glob(f"{profile_id}.*"):
+            path.unlink(missing_ok=True)
+            removed = True
+        return removed
+
+    def _trim(self):
+        # Ids start with a UTC timestamp, so name order is age order
+        metas = sorted(self.directory.glob("*.meta.json"))
+        for meta_path in metas[:max(0, len(metas) - self.max_files)]:
+            self.delete(meta_path.name[:-len(".meta.json")])
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,231 @@
+"""
+Token-bucket rate limiting for public (unauthenticated) write endpoints.
+
+Every protected route has a policy with one bucket per client IP and,
+optionally, one per submitted email address. Buckets live in memory per
+worker by default; set RATE_LIMIT_STORE=mongo to share them across
+workers through the `rate_limits` collection.
+
+Usage:
+    @router.post("/", dependencies=[Depends(rate_limit("contacts"))])
+"""
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_STORE = os.environ.get("RATE_LIMIT_STORE", "memory")  # memory | mongo
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 50000))
+TRUST_PROXY = os.environ.get("TRUST_PROXY") == "true"
+
+# Default policies: (capacity, per_seconds) for each bucket dimension.
+# A bucket holds `capacity` requests and refills fully over `per_seconds`.
+DEFAULT_POLICIES = {
+    "contacts": {"ip": (5, 600), "email": (3, 3600), "email_field": "email"},
+    "chat_messages": {"ip": (20, 60), "email": (10, 60), "email_field": "customer_email"},
+    "newsletter": {"ip": (5, 600), "email": (3, 3600), "email_field": "email"},
+    "bookings": {"ip": (5, 600), "email": (3, 3600), "email_field": "email"},
+    "analytics": {"ip": (120, 60)},
+    "testimonials": {"ip": (3, 3600), "email": (2, 86400), "email_field": "email"},
+}
+
+def load_policies() -> Dict[str, dict]:
+    """
+    Merge DEFAULT_POLICIES with JSON overrides from RATE_LIMIT_POLICIES, e.g.
+    RATE_LIMIT_POLICIES='{"contacts": {"ip": [10, 600]}}'
+    """
+    policies = {name: dict(policy) for name, policy in DEFAULT_POLICIES.items()}
+    overrides = os.environ.get("RATE_LIMIT_POLICIES")
+    if not overrides:
+        return policies
+
+    try:
+        for name, override in json.loads(overrides).items():
+            policy = policies.setdefault(name, {})
+            for key, value in override.items():
+                policy[key] = tuple(value) if isinstance(value, list) else value
+    except (ValueError, AttributeError) as e:
+        logger.error(f"Ignoring invalid RATE_LIMIT_POLICIES: {str(e)}")
+    return policies
+
+POLICIES = load_policies()
+
+class MemoryBucketStore:
+    """Per-worker token buckets, evicting the least recently used keys"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, capacity: int, per_seconds: float) -> Tuple[bool, float]:
+        """Consume one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic()
+        rate = capacity / per_seconds
+        tokens, updated = self.buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self.buckets[key] = (tokens, now)
+        self.buckets.move_to_end(key)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+class MongoBucketStore:
+    """
+    Token buckets shared by every worker. Refill and consume happen in a
+    single atomic find_one_and_update using an update pipeline.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def take(self, key: str, capacity: int, per_seconds: float) -> Tuple[bool, float]:
+        now = time.time()
+        rate = capacity / per_seconds
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [
+                        capacity,
+                        {"$add": [
+                            {"$ifNull": ["$tokens", capacity]},
+                            {"$multiply": [
+                                {"$subtract": [now, {"$ifNull": ["$updated_at", now]}]},
+                                rate
+                            ]}
+                        ]}
+                    ]},
+                    "updated_at": now
+                }},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [
+                        {"$gte": ["$tokens", 1]},
+                        {"$subtract": ["$tokens", 1]},
+                        "$tokens"
+                    ]},
+                    # Idle buckets are full again after per_seconds; let TTL drop them
+                    "expires_at": datetime.utcnow() + timedelta(seconds=per_seconds)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if doc["allowed"]:
+            return True, 0.0
+        return False, (1 - doc["tokens"]) / rate
+
+class RateLimiter:
+    """Applies named policies against a bucket store and keeps counters"""
+
+    def __init__(self, policies: Dict[str, dict], store=None):
+        self.policies = policies
+        self.memory_store = MemoryBucketStore()
+        self.store = store or self.memory_store
+        self.metrics = defaultdict(lambda: {"allowed": 0, "limited": 0, "store_errors": 0})
+
+    async def _take(self, policy_name: str, key: str, capacity: int, per_seconds: float) -> Tuple[bool, float]:
+        try:
+            return await self.store.take(key, capacity, per_seconds)
+        except Exception as e:
+            # Never turn a store outage into an outage of the public forms
+            self.metrics[policy_name]["store_errors"] += 1
+            logger.warning(f"Rate limit store failed, using per-worker buckets: {str(e)}")
+            return await self.memory_store.take(key, capacity, per_seconds)
+
+    async def check(self, policy_name: str, ip: str, email: Optional[str] = None) -> Optional[float]:
+        """Returns None if the request is allowed, else the Retry-After in seconds"""
+        policy = self.policies[policy_name]
+        checks = [("ip", ip)]
+        if email and "email" in policy:
+            checks.append(("email", email.strip().lower()))
+
+        for dimension, value in checks:
+            if dimension not in policy:
+                continue
+            capacity, per_seconds = policy[dimension]
+            allowed, retry_after = await self._take(
+                policy_name, f"{policy_name}:{dimension}:{value}", capacity, per_seconds
+            )
+            if not allowed:
+                self.metrics[policy_name]["limited"] += 1
+                return retry_after
+
+        self.metrics[policy_name]["allowed"] += 1
+        return None
+
+    def get_metrics(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "store": type(self.store).__name__,
+            "tracked_keys": len(self.memory_store.buckets),
+            "policies": {
+                name: {
+                    "ip": policy.get("ip"),
+                    "email": policy.get("email"),
+                    **self.metrics[name]
+                }
+                for name, policy in self.policies.items()
+            }
+        }
+
+def _build_limiter() -> RateLimiter:
+    if RATE_LIMIT_STORE == "mongo":
+        from database import rate_limits_collection
+        return RateLimiter(POLICIES, MongoBucketStore(rate_limits_collection))
+    return RateLimiter(POLICIES)
+
+limiter = _build_limiter()
+
+def get_client_ip(request: Request) -> str:
+    """Client IP, honouring X-Forwarded-For only behind a trusted proxy"""
+    if TRUST_PROXY:
+        forwarded_for = request.headers.get("X-Forwarded-For")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def rate_limit(policy_name: str):
+    """FastAPI dependency factory enforcing the named policy"""
+    if policy_name not in POLICIES:
+        raise ValueError(f"Unknown rate limit policy: {policy_name}")
+
+    async def dependency(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        email = None
+        email_field = POLICIES[policy_name].get("email_field")
+        if email_field:
+            # FastAPI has already read the body, so this is served from cache
+            try:
+                body = await request.json()
+                if isinstance(body, dict) and isinstance(body.get(email_field), str):
+                    email = body[email_field]
+            except ValueError:
+                pass
+
+        retry_after = await limiter.check(policy_name, get_client_ip(request), email)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
+    return dependency
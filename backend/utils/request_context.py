@@ -0,0 +1,24 @@
+"""
+The ASGI scope of the request being handled, for code that has no Request
+object (e.g. pymongo command listeners). RequestContextMiddleware sets it;
+Motor copies the context into its executor threads, so it is visible there
+too.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+
+def describe_scope(scope: Optional[dict]) -> Optional[str]:
+    """'METHOD /route/{template}' for a request scope"""
+    if scope is None:
+        return None
+    # The router stores the matched route in the scope
+    route = scope.get("route")
+    return f"{scope.get('method', '')} {getattr(route, 'path', None) or scope.get('path', '')}"
+
+
+def current_route() -> Optional[str]:
+    """The route of the request being handled, if any"""
+    return describe_scope(current_scope.get())
@@ -0,0 +1,53 @@
+"""
+Fast JSON responses.
+
+FastJSONResponse is the app-wide default response class: it renders with
+orjson when installed and falls back to the stdlib json module otherwise.
+
+trusted_response() is the per-endpoint opt-in fast path. When a handler
+returns a Response object FastAPI skips its response_model validation and
+jsonable_encoder pass entirely, so data that is already shaped correctly
+(plain dicts built to the response schema, or models built with
+model_construct) is serialized exactly once. Keep response_model on the
+decorator for the OpenAPI docs.
+"""
+from fastapi.responses import JSONResponse, Response
+from functools import lru_cache
+from pydantic import TypeAdapter
+from typing import Any, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """Cached TypeAdapter, so each response type's serializer is built once"""
+    return TypeAdapter(response_type)
+
+
+def trusted_response(content: Any, response_type: Optional[Any] = None, status_code: int = 200) -> Response:
+    """
+    Serialize already-shaped data without validating it.
+
+    If response_type is given (e.g. ClientProjectResponse or
+    List[ClientProjectResponse]) the pydantic-core serializer for that type
+    is used, which also handles model_construct instances. Otherwise the
+    content must be plain JSON-compatible data.
+    """
+    if response_type is not None:
+        body = get_type_adapter(response_type).dump_json(content, warnings=False)
+        return Response(body, status_code=status_code, media_type="application/json")
+    return FastJSONResponse(content, status_code=status_code)
@@ -0,0 +1,130 @@
+"""
+Revenue report over client-project budgets in any one currency.
+
+Budgets are stored per project in their own currency (budget.currency with
+total_amount, paid_amount and pending_amount). The report loads every
+project's budget fields in one projected query, converts all amounts at once
+through the currency x currency RATE_MATRIX (utils/currency_converter.py) and
+sums them per project status, client, month created and original currency
+with numpy bincounts, so thousands of projects take a few milliseconds.
+
+Projects without a budget are counted but not summed; budgets in a currency
+missing from EXCHANGE_RATES are listed under "unconverted" rather than
+guessed at.
+
+Reports are cached per target currency. server.py mounts the admin
+client-project router with invalidate_revenue_report, which drops them after
+any write there (budgets, status, new or deleted projects); other workers
+follow within CACHE_TTL_SECONDS (utils/cache.py).
+"""
+from fastapi import Request
+from typing import Dict, List
+from database import client_projects_collection, clients_collection
+from utils.cache import LocalCache
+from utils.currency_converter import CURRENCY_CODES, CURRENCY_INDEX, convert_amounts
+import asyncio
+import numpy as np
+import pandas as pd
+
+AMOUNTS = ["total_amount", "paid_amount", "pending_amount"]
+# What the project endpoints assume when a budget has no currency
+DEFAULT_CURRENCY = "USD"
+
+revenue_report_cache = LocalCache("revenue_report", maxsize=len(CURRENCY_CODES))
+
+
+def _budget_columns(projects: List[dict]) -> Dict[str, np.ndarray]:
+    budgets = [project["budget"] for project in projects]
+    total = np.array([float(budget.get("total_amount") or 0) for budget in budgets])
+    paid = np.array([float(budget.get("paid_amount") or 0) for budget in budgets])
+    pending = np.array([np.nan if budget.get("pending_amount") is None else float(budget["pending_amount"]) for budget in budgets])
+    created = pd.to_datetime(
+        pd.Series([project.get("created_at") for project in projects], dtype=object),
+        utc=True, errors="coerce", format="mixed"
+    )
+    return {
+        "status": np.array([project.get("status") or "pending" for project in projects], dtype=object),
+        "client_id": np.array([project.get("client_id") or "unknown" for project in projects], dtype=object),
+        # yyyymm, or 0 when created_at is missing
+        "month": (created.dt.year * 100 + created.dt.month).fillna(0).to_numpy(dtype=np.int64),
+        "currency": np.array([str(budget.get("currency") or DEFAULT_CURRENCY).upper() for budget in budgets], dtype=object),
+        "amounts": np.column_stack([total, paid, np.where(np.isnan(pending), total - paid, pending)]).reshape(-1, len(AMOUNTS))
+    }
+
+
+def _groups(keys: np.ndarray, amounts: np.ndarray) -> List[dict]:
+    """Project counts and summed amounts per distinct key, keys in order"""
+    codes, uniques = pd.factorize(keys, sort=True)
+    projects = np.bincount(codes, minlength=len(uniques))
+    sums = np.round(np.column_stack([
+        np.bincount(codes, weights=amounts[:, i], minlength=len(uniques)) for i in range(len(AMOUNTS))
+    ]).reshape(-1, len(AMOUNTS)), 2)
+    return [
+        {"key": key, "projects": int(count), **dict(zip(AMOUNTS, row))}
+        for key, count, row in zip(uniques.tolist(), projects.tolist(), sums.tolist())
+    ]
+
+
+def build_report(projects: List[dict], client_names: Dict[str, str], currency: str) -> dict:
+    """The report for projects already loaded (CPU only; run in a thread)"""
+    with_budget = [project for project in projects if project.get("budget")]
+    columns = _budget_columns(with_budget)
+
+    known = np.isin(columns["currency"], CURRENCY_CODES)
+    unconverted = columns["currency"][~known]
+    columns = {name: values[known] for name, values in columns.items()}
+    indexes = np.array([CURRENCY_INDEX[code] for code in columns["currency"]], dtype=np.intp)
+    converted = convert_amounts(columns["amounts"], indexes, currency)
+
+    by_client = sorted(_groups(columns["client_id"], converted), key=lambda group: -group["total_amount"])
+    for group in by_client:
+        group["name"] = client_names.get(group["key"])
+
+    by_month = _groups(columns["month"], converted)
+    for group in by_month:
+        group["key"] = f"{group['key'] // 100:04d}-{group['key'] % 100:02d}" if group["key"] else "unknown"
+
+    # Per original currency, both converted and as budgeted
+    by_currency = _groups(columns["currency"], converted)
+    for group, native in zip(by_currency, _groups(columns["currency"], columns["amounts"])):
+        group["native"] = {column: native[column] for column in AMOUNTS}
+
+    codes, counts = np.unique(unconverted.astype(str), return_counts=True)
+    return {
+        "currency": currency,
+        "projects": int(known.sum()),
+        "without_budget": len(projects) - len(with_budget),
+        "totals": dict(zip(AMOUNTS, np.round(converted.sum(axis=0), 2).tolist())),
+        "by_status": _groups(columns["status"], converted),
+        "by_client": by_client,
+        "by_month": by_month,
+        "by_currency": by_currency,
+        "unconverted": [
+            {"currency": code, "projects": int(count)} for code, count in zip(codes.tolist(), counts.tolist())
+        ]
+    }
+
+
+async def _load_report(currency: str) -> dict:
+    projects = await client_projects_collection.find({}, {
+        "_id": 0, "status": 1, "client_id": 1, "created_at": 1,
+        **{f"budget.{field}": 1 for field in ["currency", *AMOUNTS]}
+    }).to_list(length=None)
+    client_ids = list({project.get("client_id") for project in projects if project.get("budget")})
+    clients = await clients_collection.find({"id": {"$in": client_ids}}, {"_id": 0, "id": 1, "name": 1}).to_list(length=None)
+    client_names = {client["id"]: client.get("name") for client in clients}
+    return await asyncio.to_thread(build_report, projects, client_names, currency)
+
+
+async def revenue_report(currency: str = "INR") -> dict:
+    """Cached budget totals across client projects, converted to currency"""
+    return await revenue_report_cache.get_or_load(currency, lambda: _load_report(currency))
+
+
+async def invalidate_revenue_report(request: Request):
+    """Router dependency: drop cached reports after any write on client projects"""
+    try:
+        yield
+    finally:
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            revenue_report_cache.invalidate()
@@ -0,0 +1,317 @@
+"""
+Sitemap and blog feed snapshot.
+
+Crawlers and feed readers poll these documents far more often than the
+content changes, so they are rendered from an in-memory snapshot rather
+than from MongoDB per request:
+
+    sitemap index      lists the sitemap files below with their lastmod
+    pages-1            the static public pages; /blogs, /portfolio,
+                       /services and / carry the newest change under them
+    blogs-N, projects-N   one URL per published post / public project,
+                       SITEMAP_CHUNK_SIZE per file (the protocol allows
+                       50,000), oldest first so new content only touches
+                       the last file
+    rss, atom          the FEED_SIZE newest published posts
+
+Every rendered file keeps its bytes, a strong ETag (content hash) and a
+Last-Modified date.
+
+The first request loads everything. After that a refresh is incremental:
+per collection it fetches only documents with updated_at at or after the
+last one seen (native or legacy ISO-string dates alike), applies them (a post that was unpublished or a project
+made private drops out), and re-checks the matching count to catch
+deletions, reloading that collection only if the count disagrees. Only
+files whose entries changed are re-rendered. A refresh runs on the next
+request after mark_stale() (called after writes through the blog,
+project and service routers) or at most CACHE_TTL_SECONDS after the
+previous one, which is how other workers catch up.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+from xml.sax.saxutils import escape
+from database import blogs_collection, projects_collection, services_collection, settings_collection
+from utils.cache import CACHE_TTL_SECONDS
+from utils.dates import date_range_filter, to_datetime
+import asyncio
+import hashlib
+import os
+import time
+
+SITE_URL = (os.environ.get("SITE_URL") or os.environ.get("NEXT_PUBLIC_BASE_URL", "http://localhost:3000")).rstrip("/")
+SITEMAP_CHUNK_SIZE = min(int(os.environ.get("SITEMAP_CHUNK_SIZE", 5000)), 50000)
+FEED_SIZE = int(os.environ.get("FEED_SIZE", 20))
+# Frontend route of a single project; {id} and {slug} are filled in
+PROJECT_PATH = os.environ.get("SITEMAP_PROJECT_PATH", "/portfolio/{id}")
+
+STATIC_PAGES = ["/", "/about", "/services", "/portfolio", "/blogs", "/contact", "/submit-testimonial"]
+
+# kind -> (collection, filter for public documents, fields kept per entry)
+SOURCES = {
+    "blogs": (
+        blogs_collection, {"status": "published"},
+        ("id", "slug", "title", "excerpt", "author", "category", "tags", "created_at", "updated_at")
+    ),
+    "projects": (projects_collection, {"is_private": {"$ne": True}}, ("id", "slug", "created_at", "updated_at")),
+    "services": (services_collection, {}, ("id", "created_at", "updated_at")),
+}
+
+
+def _is_public(kind: str, doc: dict) -> bool:
+    if kind == "blogs":
+        return doc.get("status") == "published"
+    if kind == "projects":
+        return not doc.get("is_private")
+    return True
+
+
+def _timestamp(value) -> Optional[datetime]:
+    """Naive UTC datetime from a stored date, native or a legacy ISO string"""
+    value = to_datetime(value)
+    return value if isinstance(value, datetime) else None
+
+
+def _entry(doc: dict, fields: tuple) -> dict:
+    entry = {field: doc.get(field) for field in fields if field in doc}
+    for field in ("created_at", "updated_at"):
+        if field in entry:
+            entry[field] = _timestamp(entry[field])
+    return entry
+
+
+def _utc(value) -> Optional[datetime]:
+    value = _timestamp(value)
+    return value.replace(tzinfo=timezone.utc) if value is not None else None
+
+
+def _modified(entry: dict) -> Optional[datetime]:
+    return _utc(entry.get("updated_at") or entry.get("created_at"))
+
+
+def _w3c(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FeedDocument:
+    """One rendered file"""
+
+    def __init__(self, body: str, last_modified: Optional[datetime], media_type: str):
+        self.body = body.encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        # HTTP dates have whole seconds
+        self.last_modified = (last_modified or datetime(1970, 1, 1, tzinfo=timezone.utc)).replace(microsecond=0)
+        self.media_type = media_type
+
+
+class SiteFeeds:
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, dict]] = {kind: {} for kind in SOURCES}
+        self.watermarks: Dict[str, Optional[datetime]] = {kind: None for kind in SOURCES}
+        self.site_name = "MSPN DEV"
+        self.documents: Dict[str, FeedDocument] = {}
+        self._chunk_keys: Dict[str, tuple] = {}
+        self._index: Dict[str, FeedDocument] = {}
+        self._built = False
+        self._stale = True
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def mark_stale(self):
+        self._stale = True
+
+    async def current(self) -> "SiteFeeds":
+        if self._stale or time.monotonic() - self._refreshed_at > CACHE_TTL_SECONDS:
+            async with self._lock:
+                if self._stale or time.monotonic() - self._refreshed_at > CACHE_TTL_SECONDS:
+                    self._stale = False
+                    try:
+                        await self._refresh()
+                    except Exception:
+                        self._stale = True
+                        raise
+                    self._refreshed_at = time.monotonic()
+        return self
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def _load(self, kind: str):
+        collection, query, fields = SOURCES[kind]
+        docs = await collection.find(query, {"_id": 0, **{field: 1 for field in fields}}).to_list(length=None)
+        self.entries[kind] = {doc["id"]: _entry(doc, fields) for doc in docs}
+        self.watermarks[kind] = max(
+            filter(None, (entry.get("updated_at") or entry.get("created_at") for entry in self.entries[kind].values())),
+            default=None
+        )
+
+    async def _apply_changes(self, kind: str) -> bool:
+        """Fold in documents changed since the watermark; True if anything changed"""
+        collection, query, fields = SOURCES[kind]
+        watermark = self.watermarks[kind]
+        if watermark is None:
+            await self._load(kind)
+            return bool(self.entries[kind])
+
+        projection = {"_id": 0, "status": 1, "is_private": 1, **{field: 1 for field in fields}}
+        changed = await collection.find(date_range_filter("updated_at", gte=watermark), projection).to_list(length=None)
+        entries = self.entries[kind]
+        before = {doc["id"]: entries.get(doc["id"]) for doc in changed}
+        for doc in changed:
+            if _is_public(kind, doc):
+                entries[doc["id"]] = _entry(doc, fields)
+            else:
+                entries.pop(doc["id"], None)
+            updated_at = _timestamp(doc.get("updated_at"))
+            if updated_at and updated_at > self.watermarks[kind]:
+                self.watermarks[kind] = updated_at
+        modified = any(before[doc_id] != entries.get(doc_id) for doc_id in before)
+
+        # Deletions leave no document behind; a count mismatch reveals them
+        if await collection.count_documents(query) != len(entries):
+            await self._load(kind)
+            modified = True
+        return modified
+
+    async def _refresh(self):
+        settings = await settings_collection.find_one({"id": "global_settings"}, {"agency_name": 1})
+        site_name = (settings or {}).get("agency_name") or "MSPN DEV"
+        site_name_changed = site_name != self.site_name
+        self.site_name = site_name
+
+        if not self._built:
+            await asyncio.gather(*(self._load(kind) for kind in SOURCES))
+            changed = set(SOURCES)
+        else:
+            results = await asyncio.gather(*(self._apply_changes(kind) for kind in SOURCES))
+            changed = {kind for kind, modified in zip(SOURCES, results) if modified}
+        self._built = True
+
+        if changed:
+            self._render_sitemaps()
+        if "blogs" in changed or site_name_changed or "rss" not in self.documents:
+            self._render_feeds()
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _newest(self, kind: str) -> Optional[datetime]:
+        return max(filter(None, (_modified(entry) for entry in self.entries[kind].values())), default=None)
+
+    def _url_entries(self):
+        """{file name: [(location, lastmod)]} for every sitemap file"""
+        newest = {kind: self._newest(kind) for kind in SOURCES}
+        section_lastmod = {"/blogs": newest["blogs"], "/portfolio": newest["projects"], "/services": newest["services"]}
+        section_lastmod["/"] = max(filter(None, newest.values()), default=None)
+        files = {"pages-1": [(SITE_URL + path, section_lastmod.get(path)) for path in STATIC_PAGES]}
+
+        locations = {
+            "blogs": lambda entry: f"{SITE_URL}/blogs/{entry['slug']}",
+            "projects": lambda entry: SITE_URL + PROJECT_PATH.format(id=entry["id"], slug=entry.get("slug", "")),
+        }
+        for kind, location in locations.items():
+            ordered = sorted(
+                self.entries[kind].values(),
+                key=lambda entry: (_utc(entry.get("created_at")) or datetime.min.replace(tzinfo=timezone.utc), entry["id"])
+            )
+            for start in range(0, len(ordered), SITEMAP_CHUNK_SIZE):
+                chunk = ordered[start:start + SITEMAP_CHUNK_SIZE]
+                files[f"{kind}-{start // SITEMAP_CHUNK_SIZE + 1}"] = [(location(entry), _modified(entry)) for entry in chunk]
+        return files
+
+    def _render_sitemaps(self):
+        files = self._url_entries()
+        for name in [name for name in self._chunk_keys if name not in files]:
+            del self._chunk_keys[name]
+            self.documents.pop(name, None)
+
+        rerendered = False
+        for name, urls in files.items():
+            key = tuple(urls)
+            if self._chunk_keys.get(name) == key:
+                continue
+            lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                     '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+            for location, lastmod in urls:
+                lastmod_tag = f"<lastmod>{_w3c(lastmod)}</lastmod>" if lastmod else ""
+                lines.append(f"<url><loc>{escape(location)}</loc>{lastmod_tag}</url>")
+            lines.append("</urlset>")
+            last_modified = max(filter(None, (lastmod for _, lastmod in urls)), default=None)
+            self.documents[name] = FeedDocument("\n".join(lines), last_modified, "application/xml")
+            self._chunk_keys[name] = key
+            rerendered = True
+
+        if rerendered:
+            self._index.clear()
+
+    def sitemap_index(self, base_url: str) -> FeedDocument:
+        """The index, pointing at this API's sitemap files"""
+        document = self._index.get(base_url)
+        if document is None:
+            lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                     '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+            for name in self._chunk_keys:
+                chunk = self.documents[name]
+                lines.append(
+                    f"<sitemap><loc>{escape(base_url)}/sitemaps/{name}.xml</loc>"
+                    f"<lastmod>{_w3c(chunk.last_modified)}</lastmod></sitemap>"
+                )
+            lines.append("</sitemapindex>")
+            last_modified = max((self.documents[name].last_modified for name in self._chunk_keys), default=None)
+            document = FeedDocument("\n".join(lines), last_modified, "application/xml")
+            self._index = {base_url: document}
+        return document
+
+    def _render_feeds(self):
+        posts = sorted(
+            self.entries["blogs"].values(),
+            key=lambda entry: (_utc(entry.get("created_at")) or datetime.min.replace(tzinfo=timezone.utc), entry["id"]),
+            reverse=True
+        )[:FEED_SIZE]
+        updated = max(filter(None, (_modified(post) for post in posts)), default=datetime.now(timezone.utc))
+        title = escape(f"{self.site_name} Blog")
+        blog_url = escape(f"{SITE_URL}/blogs")
+
+        rss = ['<?xml version="1.0" encoding="UTF-8"?>',
+               '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">',
+               f"<channel><title>{title}</title><link>{blog_url}</link>"
+               f"<description>{title}</description><lastBuildDate>{format_datetime(updated)}</lastBuildDate>"]
+        atom = ['<?xml version="1.0" encoding="UTF-8"?>',
+                '<feed xmlns="http://www.w3.org/2005/Atom">',
+                f'<title>{title}</title><id>{blog_url}</id><link href="{blog_url}"/>'
+                f"<updated>{_w3c(updated)}</updated>"]
+
+        for post in posts:
+            link = escape(f"{SITE_URL}/blogs/{post['slug']}")
+            post_title = escape(post.get("title") or "")
+            summary = escape(post.get("excerpt") or "")
+            author = escape(post.get("author") or self.site_name)
+            published = _utc(post.get("created_at")) or updated
+            categories = [escape(tag) for tag in post.get("tags") or []]
+
+            rss.append(
+                f"<item><title>{post_title}</title><link>{link}</link>"
+                f'<guid isPermaLink="false">{escape(post["id"])}</guid>'
+                f"<pubDate>{format_datetime(published)}</pubDate><dc:creator>{author}</dc:creator>"
+                f"<description>{summary}</description>"
+                + "".join(f"<category>{tag}</category>" for tag in categories)
+                + "</item>"
+            )
+            atom.append(
+                f'<entry><title>{post_title}</title><link href="{link}"/>'
+                f"<id>urn:uuid:{escape(post['id'])}</id>"
+                f"<published>{_w3c(published)}</published><updated>{_w3c(_modified(post) or published)}</updated>"
+                f"<author><name>{author}</name></author><summary>{summary}</summary>"
+                + "".join(f'<category term="{tag}"/>' for tag in categories)
+                + "</entry>"
+            )
+
+        rss.append("</channel></rss>")
+        atom.append("</feed>")
+        self.documents["rss"] = FeedDocument("\n".join(rss), updated, "application/rss+xml")
+        self.documents["atom"] = FeedDocument("\n".join(atom), updated, "application/atom+xml")
+
+
+site_feeds = SiteFeeds()
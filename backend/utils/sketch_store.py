@@ -0,0 +1,122 @@
+"""
+Per-day analytics sketches, buffered per worker and merged into MongoDB.
+
+Ingest adds to in-memory sketches keyed by (UTC day, name). Every
+flush_seconds each one is merged into its document {_id: "day:name", day,
+name, sketch, version} in the given collection: read, merge, write back
+only if the version is unchanged, retrying otherwise, so any number of
+workers can flush into the same documents without losing each other's
+data. Memory is bounded by max_keys sketches between flushes and storage by
+days x names, whatever the traffic.
+
+Sketches provide merge(other) and stored() (a BSON value); load_sketch
+turns a stored value back into a sketch.
+"""
+from pymongo.errors import DuplicateKeyError
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+CAS_ATTEMPTS = 5
+
+
+def _raw(value):
+    # Binary never equals the plain bytes Motor reads back, so compare the bytes
+    return bytes(value) if isinstance(value, (bytes, bytearray)) else value
+
+
+class DailySketches:
+    def __init__(self, collection, new_sketch: Callable, load_sketch: Callable, flush_seconds: float, max_keys: int):
+        self.collection = collection
+        self.new_sketch = new_sketch
+        self.load_sketch = load_sketch
+        self.flush_seconds = flush_seconds
+        self.max_keys = max_keys
+        self.pending: Dict[Tuple[str, str], object] = {}
+        self._task = None
+        self._flushing = asyncio.Lock()
+
+    def get(self, day: str, name: str):
+        """The buffered sketch for (day, name), or None once max_keys are buffered"""
+        sketch = self.pending.get((day, name))
+        if sketch is None:
+            if len(self.pending) >= self.max_keys:
+                return None
+            sketch = self.pending[(day, name)] = self.new_sketch()
+        return sketch
+
+    async def _merge_into(self, day: str, name: str, sketch):
+        doc_id = f"{day}:{name}"
+        for _ in range(CAS_ATTEMPTS):
+            doc = await self.collection.find_one({"_id": doc_id}, {"sketch": 1, "version": 1})
+            if doc is None:
+                try:
+                    await self.collection.insert_one({
+                        "_id": doc_id, "day": day, "name": name, "sketch": sketch.stored(), "version": 1
+                    })
+                    return
+                except DuplicateKeyError:
+                    continue
+            merged = self.load_sketch(doc["sketch"])
+            merged.merge(sketch)
+            stored = merged.stored()
+            if _raw(stored) == _raw(doc["sketch"]):
+                return
+            result = await self.collection.update_one(
+                {"_id": doc_id, "version": doc["version"]},
+                {"$set": {"sketch": stored}, "$inc": {"version": 1}}
+            )
+            if result.modified_count:
+                return
+        raise RuntimeError(f"Sketch {doc_id} kept changing during merge")
+
+    async def flush(self):
+        async with self._flushing:
+            pending, self.pending = self.pending, {}
+            for (day, name), sketch in pending.items():
+                try:
+                    await self._merge_into(day, name, sketch)
+                except Exception as e:
+                    # Keep it for the next flush, merged with anything newer
+                    current = self.pending.get((day, name))
+                    if current is not None:
+                        sketch.merge(current)
+                    self.pending[(day, name)] = sketch
+                    logger.warning(f"Sketch flush to {self.collection.name} failed: {str(e)}")
+
+    async def load(self, start_day: str, end_day: str, names: Optional[list] = None) -> Dict[str, Dict[str, object]]:
+        """{name: {day: sketch}} stored for the days start_day..end_day"""
+        query = {"day": {"$gte": start_day, "$lte": end_day}}
+        if names is not None:
+            query["name"] = {"$in": list(names)}
+        docs = await self.collection.find(query, {"day": 1, "name": 1, "sketch": 1}).to_list(length=None)
+        by_name: Dict[str, Dict[str, object]] = {}
+        for doc in docs:
+            by_name.setdefault(doc["name"], {})[doc["day"]] = self.load_sketch(doc["sketch"])
+        return by_name
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                # A failed flush must not stop the flusher
+                logger.error(f"Sketch flusher for {self.collection.name} failed: {str(e)}")
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write what is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
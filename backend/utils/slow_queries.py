@@ -0,0 +1,256 @@
+"""
+Slow-query log with automatic explain plans.
+
+SlowQueryListener (a pymongo CommandListener on the shared client) times
+every query-type command. Commands slower than SLOW_QUERY_MS are reduced to
+their *shape*: the filter, sort and pipeline with every literal value
+replaced by "?", so no user data is stored. Each shape is aggregated in the
+`slow_queries` collection (count, total/max time, calling routes). The first
+time a shape is seen the command is re-run as
+explain("executionStats") and a value-free summary of the plan is kept in
+the capped `slow_query_explains` collection.
+
+Listener callbacks run on Motor's executor threads, so they only hand work
+to the loop; the writes and explains happen in one background task.
+"""
+from pymongo import monitoring
+from pymongo.errors import CollectionInvalid, PyMongoError
+from datetime import datetime
+from typing import Any, Optional
+from utils.request_context import current_route
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_LOG_ENABLED = os.environ.get("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+SLOW_QUERY_EXPLAIN_CAP_BYTES = int(os.environ.get("SLOW_QUERY_EXPLAIN_CAP_BYTES", 10 * 1024 * 1024))
+
+SLOW_QUERIES = "slow_queries"
+SLOW_QUERY_EXPLAINS = "slow_query_explains"
+
+# Commands with a filter worth explaining -> the keys that make up the shape
+QUERY_COMMANDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+
+# Keys kept from the original command when re-running it under explain
+EXPLAIN_KEYS = {
+    "find": ("find", "filter", "sort", "projection", "limit", "skip", "hint"),
+    "aggregate": ("aggregate", "pipeline", "cursor", "hint"),
+    "count": ("count", "query", "limit", "skip", "hint"),
+    "distinct": ("distinct", "key", "query"),
+    "findAndModify": ("findAndModify", "query", "sort", "update", "remove", "upsert", "new"),
+    "update": ("update", "updates"),
+    "delete": ("delete", "deletes"),
+}
+
+# Field names whose values are structure, not data
+STRUCTURAL_KEYS = {"key", "$sort", "sort", "projection", "$project", "$group", "$unwind", "$lookup"}
+
+
+def redact(value: Any, structural: bool = False) -> Any:
+    """Replace every literal in a filter/pipeline with '?', keeping operators and field names"""
+    if isinstance(value, dict):
+        return {key: redact(item, structural or key in STRUCTURAL_KEYS) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(not isinstance(item, (dict, list)) for item in value):
+            # $in / $nin lists collapse to one placeholder so shapes don't multiply
+            return value if structural else ["?"]
+        return [redact(item, structural) for item in value]
+    if structural:
+        return value
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> dict:
+    shape = {}
+    for key in QUERY_COMMANDS[command_name]:
+        if key not in command:
+            continue
+        if key in ("updates", "deletes"):
+            # Bulk write batches: the filter (and sort) of each statement
+            shape["q"] = [redact(statement.get("q", {})) for statement in command[key][:1]]
+        else:
+            shape[key] = redact(command[key], structural=key in ("sort", "projection", "key"))
+    return shape
+
+
+def summarize_plan(explain: dict) -> dict:
+    """Value-free summary of an explain result: stages, indexes and work done"""
+    planner = explain.get("queryPlanner")
+    stats = explain.get("executionStats")
+    if planner is None and explain.get("stages"):
+        cursor_stage = explain["stages"][0].get("$cursor", {})
+        planner = cursor_stage.get("queryPlanner")
+        stats = cursor_stage.get("executionStats")
+    planner = planner or {}
+    stats = stats or {}
+
+    stages = []
+    node = planner.get("winningPlan")
+    while isinstance(node, dict):
+        stages.append({
+            key: node[key] for key in ("stage", "indexName", "keyPattern", "isMultiKey") if key in node
+        })
+        node = node.get("inputStage") or (node.get("inputStages") or [None])[0] or node.get("queryPlan")
+
+    stage_names = {stage.get("stage") for stage in stages}
+    return {
+        "stages": stages,
+        "uses_collection_scan": "COLLSCAN" in stage_names,
+        "indexes_used": sorted({stage["indexName"] for stage in stages if "indexName" in stage}),
+        "n_returned": stats.get("nReturned"),
+        "total_keys_examined": stats.get("totalKeysExamined"),
+        "total_docs_examined": stats.get("totalDocsExamined"),
+        "execution_time_ms": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    def __init__(self, log: "SlowQueryLog"):
+        self.log = log
+        self._pending = {}
+
+    def started(self, event):
+        if event.command_name not in QUERY_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str) or collection in (SLOW_QUERIES, SLOW_QUERY_EXPLAINS):
+            return
+        self._pending[(event.connection_id, event.request_id)] = (
+            collection, event.database_name, event.command, current_route()
+        )
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms >= self.log.threshold_ms:
+            collection, database, command, route = pending
+            self.log.submit(collection, database, event.command_name, command, duration_ms, route)
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, explain: bool = SLOW_QUERY_EXPLAIN):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.listener = SlowQueryListener(self)
+        self.db = None
+        self.loop = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker = None
+        self.dropped = 0
+
+    async def start(self, db):
+        """Start the background writer; call once the loop is running"""
+        self.db = db
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=1000)
+        try:
+            await db.create_collection(SLOW_QUERY_EXPLAINS, capped=True, size=SLOW_QUERY_EXPLAIN_CAP_BYTES)
+        except CollectionInvalid:
+            pass  # already exists
+        await db[SLOW_QUERIES].create_index([("total_ms", -1)])
+        await db[SLOW_QUERY_EXPLAINS].create_index("shape_id")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+    def submit(self, collection, database, command_name, command, duration_ms, route):
+        """Called from executor threads; never blocks"""
+        if self.loop is None:
+            return
+        item = (collection, database, command_name, command, duration_ms, route)
+        self.loop.call_soon_threadsafe(self._enqueue, item)
+
+    def _enqueue(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self._record(*item)
+            except PyMongoError as e:
+                logger.warning(f"Slow query log write failed: {str(e)}")
+            except Exception as e:
+                # One odd command must not stop slow-query capture
+                logger.error(f"Slow query log could not record a {item[2]} on {item[0]}: {str(e)}")
+
+    async def _record(self, collection, database, command_name, command, duration_ms, route):
+        shape = command_shape(command_name, command)
+        shape_json = json.dumps(shape, sort_keys=True, default=str)
+        shape_id = hashlib.sha1(f"{collection}:{command_name}:{shape_json}".encode()).hexdigest()[:16]
+
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "collection": collection,
+            "command": command_name,
+            "shape": shape_json,
+            "duration_ms": round(duration_ms, 1),
+            "route": route
+        }))
+
+        now = datetime.utcnow()
+        update = {
+            "$inc": {"count": 1, "total_ms": duration_ms},
+            "$max": {"max_ms": duration_ms},
+            "$set": {"last_seen": now},
+            "$setOnInsert": {
+                "collection": collection,
+                "command": command_name,
+                "shape": shape_json,
+                "first_seen": now
+            }
+        }
+        if route:
+            update["$addToSet"] = {"routes": route}
+        result = await self.db[SLOW_QUERIES].update_one({"_id": shape_id}, update, upsert=True)
+
+        if result.upserted_id is not None and self.explain:
+            await self._explain(shape_id, database, command_name, command, collection)
+
+    async def _explain(self, shape_id, database, command_name, command, collection):
+        target = {key: command[key] for key in EXPLAIN_KEYS[command_name] if key in command}
+        try:
+            explain = await self.db.client[database].command(
+                {"explain": target, "verbosity": "executionStats"}
+            )
+        except PyMongoError as e:
+            logger.info(f"Could not explain slow {command_name} on {collection}: {str(e)}")
+            return
+        await self.db[SLOW_QUERY_EXPLAINS].insert_one({
+            "shape_id": shape_id,
+            "collection": collection,
+            "command": command_name,
+            "plan": summarize_plan(explain),
+            "explained_at": datetime.utcnow()
+        })
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,111 @@
+"""
+Top pages, referrers and campaigns.
+
+Ingest feeds per-day space-saving summaries (utils/heavy_hitters.py), one
+per dimension:
+
+    page           page_name of page views
+    referrer       host of the external page a visit came from
+    utm_source, utm_medium, utm_campaign
+
+buffered per worker and merged into analytics_top every TOP_K_FLUSH_SECONDS
+(utils/sketch_store.py). Each document is one day's summary of at most
+TOP_K_CAPACITY entries, so top_items() for today / 7 days / 30 days merges
+at most 30 small documents whatever the traffic, and the merged snapshot
+is cached for CACHE_TTL_SECONDS.
+"""
+from datetime import datetime, timedelta
+from pymongo.errors import BulkWriteError
+from typing import List, Optional
+from urllib.parse import urlparse
+from database import analytics_collection, analytics_top_collection
+from utils.analytics_store import event_field
+from utils.cache import LocalCache
+from utils.heavy_hitters import SpaceSaving
+from utils.sketch_store import DailySketches
+import os
+
+TOP_K_FLUSH_SECONDS = float(os.environ.get("TOP_K_FLUSH_SECONDS", 10))
+TOP_K_CAPACITY = int(os.environ.get("TOP_K_CAPACITY", 100))
+
+DIMENSIONS = ("page", "referrer", "utm_source", "utm_medium", "utm_campaign")
+PERIODS = {"today": 1, "7days": 7, "30days": 30}
+MAX_KEY_LENGTH = 100
+
+top_sketches = DailySketches(
+    analytics_top_collection,
+    lambda: SpaceSaving(TOP_K_CAPACITY),
+    lambda stored: SpaceSaving.from_stored(stored, TOP_K_CAPACITY),
+    TOP_K_FLUSH_SECONDS,
+    # Every dimension for today, and for yesterday around midnight
+    max_keys=2 * len(DIMENSIONS)
+)
+
+top_cache = LocalCache("analytics_top", maxsize=len(DIMENSIONS) * len(PERIODS))
+
+
+def referrer_host(referrer: Optional[str], own_host: Optional[str] = None) -> Optional[str]:
+    """The referring site's host, or None for direct and internal visits"""
+    if not referrer:
+        return None
+    host = (urlparse(referrer).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    own_host = (own_host or "").lower()
+    if own_host.startswith("www."):
+        own_host = own_host[4:]
+    if not host or host == own_host:
+        return None
+    return host[:MAX_KEY_LENGTH]
+
+
+def record(dimension: str, key: Optional[str], now: Optional[datetime] = None):
+    if not key:
+        return
+    sketch = top_sketches.get((now or datetime.utcnow()).strftime("%Y-%m-%d"), dimension)
+    if sketch is not None:
+        sketch.add(key.strip()[:MAX_KEY_LENGTH])
+
+
+async def _load_top(dimension: str, period: str) -> list:
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=PERIODS[period] - 1)
+    days = (await top_sketches.load(start.strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d"), [dimension])).get(dimension, {})
+    merged = SpaceSaving.union(days.values(), TOP_K_CAPACITY)
+    return [{"key": key, "count": count, "error": error} for key, count, error in merged.top(TOP_K_CAPACITY)]
+
+
+async def top_items(dimension: str, period: str = "7days", limit: int = 10) -> List[dict]:
+    """Largest entries of a dimension over today, 7days or 30days"""
+    items = await top_cache.get_or_load((dimension, period), lambda: _load_top(dimension, period))
+    return items[:limit]
+
+
+async def backfill_top_pages(days: int = 30):
+    """Seed page summaries from raw page views once, so the dashboard isn't empty after upgrading (startup)"""
+    if await analytics_top_collection.estimated_document_count():
+        return
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    pipeline = [
+        {"$match": {
+            event_field("event_type"): "page_view",
+            event_field("page_name"): {"$ne": None},
+            "timestamp": {"$gte": datetime(since.year, since.month, since.day)}
+        }},
+        {"$group": {
+            "_id": {"day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}, "page": "$" + event_field("page_name")},
+            "count": {"$sum": 1}
+        }},
+    ]
+    summaries = {}
+    async for row in analytics_collection.aggregate(pipeline):
+        summary = summaries.setdefault(row["_id"]["day"], SpaceSaving(TOP_K_CAPACITY))
+        summary.add(str(row["_id"]["page"])[:MAX_KEY_LENGTH], row["count"])
+    if summaries:
+        try:
+            await analytics_top_collection.insert_many([
+                {"_id": f"{day}:page", "day": day, "name": "page", "sketch": summary.stored(), "version": 1}
+                for day, summary in summaries.items()
+            ], ordered=False)
+        except BulkWriteError:
+            pass  # another worker seeded the same days
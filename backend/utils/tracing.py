@@ -0,0 +1,174 @@
+"""
+Optional OpenTelemetry tracing.
+
+With TRACING_ENABLED=true and the opentelemetry packages installed, one
+trace covers a request end to end: the FastAPI server span, every MongoDB
+command (Motor runs pymongo underneath), outgoing `requests` calls such as
+the Brevo email API, and spans for our own helpers decorated with
+@traced (project conversion, activity logging, the booking availability
+engine).
+
+Exporters (TRACING_EXPORTERS, comma separated):
+    otlp     OTLP/HTTP; endpoint and headers from the standard
+             OTEL_EXPORTER_OTLP_* variables
+    console  pretty-printed spans on stdout
+    jsonl    one JSON span per line in TRACING_FILE, for offline inspection
+
+Sampling is head based: TRACING_SAMPLE_RATIO of new traces are kept, and
+child spans follow their parent's decision (including a sampled
+`traceparent` from an upstream caller).
+
+configure_tracing() must run before the Mongo client is created, since the
+pymongo instrumentation registers a global command listener; database.py
+calls it. server.py then calls instrument_app(app).
+"""
+from pathlib import Path
+from typing import Callable, Optional
+import functools
+import inspect
+import logging
+import os
+import threading
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:  # optional dependency
+    trace = None
+    SpanExporter = object
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() == "true" and trace is not None
+TRACING_EXPORTERS = [
+    name.strip().lower() for name in os.environ.get("TRACING_EXPORTERS", "jsonl").split(",") if name.strip()
+]
+TRACING_FILE = Path(os.environ.get("TRACING_FILE", Path(__file__).parent.parent / "traces.jsonl"))
+TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", 1.0))
+TRACING_SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "mspn-dev-api")
+
+_configured = False
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON line"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, self.path.open("a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError as e:
+            logger.warning(f"Could not write spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _exporter(name: str):
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "jsonl":
+        return JsonLinesSpanExporter(TRACING_FILE)
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("TRACING_EXPORTERS includes otlp but opentelemetry-exporter-otlp-proto-http is not installed")
+            return None
+        return OTLPSpanExporter()
+    logger.warning(f"Unknown tracing exporter: {name}")
+    return None
+
+
+def configure_tracing():
+    """Install the tracer provider and the pymongo/requests instrumentation (idempotent)"""
+    global _configured
+    if not TRACING_ENABLED or _configured:
+        return
+    _configured = True
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO))
+    )
+    for name in TRACING_EXPORTERS:
+        exporter = _exporter(name)
+        if exporter is not None:
+            provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    try:
+        from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+        PymongoInstrumentor().instrument()
+    except ImportError:
+        logger.warning("opentelemetry-instrumentation-pymongo is not installed; MongoDB commands are not traced")
+
+    try:
+        from opentelemetry.instrumentation.requests import RequestsInstrumentor
+        RequestsInstrumentor().instrument()
+    except ImportError:
+        logger.warning("opentelemetry-instrumentation-requests is not installed; outgoing HTTP is not traced")
+
+    logger.info(
+        f"Tracing enabled (exporters: {', '.join(TRACING_EXPORTERS)}, sample ratio {TRACING_SAMPLE_RATIO})"
+    )
+
+
+def instrument_app(app):
+    """Add server spans for every request, skipping the metrics scrape"""
+    if not TRACING_ENABLED:
+        return
+    configure_tracing()
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        logger.warning("opentelemetry-instrumentation-fastapi is not installed; requests are not traced")
+        return
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="/metrics")
+
+
+def shutdown_tracing():
+    """Flush buffered spans on shutdown"""
+    if _configured:
+        trace.get_tracer_provider().shutdown()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Run the decorated function (sync or async) in its own span. Without
+    tracing the function is returned unchanged, so there is no overhead.
+    """
+    def decorator(func):
+        if not TRACING_ENABLED:
+            return func
+
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+        tracer = trace.get_tracer(func.__module__)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,139 @@
+"""
+Buffered view counters for blog posts and portfolio projects.
+
+A view only bumps an in-process counter. A background task flushes the
+counters every VIEW_FLUSH_SECONDS as one unordered bulk_write per
+collection, with one update per viewed document that maintains two fields
+on it:
+
+    views      total views
+    trending   a time-decayed popularity score (0 before the first view):
+               the log of the sum of 2^(age / TRENDING_HALF_LIFE_HOURS)
+               over all views, measured from a fixed epoch. Every view's
+               weight doubles each half-life, which ranks documents exactly
+               as if every older view had halved instead, without ever
+               rewriting the stored scores. Keeping the log makes the sum
+               stay in range forever.
+
+Both are plain indexed fields, so sort=-views / sort=-trending on the list
+endpoints is an index walk and reading a document's popularity is free.
+The updates run server-side (an aggregation-pipeline update), so any
+number of workers can flush concurrently. Counts still buffered when a
+worker dies are lost, at most VIEW_FLUSH_SECONDS worth; a failed flush
+keeps its counts for the next one.
+"""
+from collections import Counter
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from database import blogs_collection, projects_collection
+import asyncio
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNTERS_ENABLED = os.environ.get("VIEW_COUNTERS_ENABLED", "true").lower() == "true"
+VIEW_FLUSH_SECONDS = float(os.environ.get("VIEW_FLUSH_SECONDS", 10))
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get("TRENDING_HALF_LIFE_HOURS", 72))
+
+TRENDING_EPOCH = datetime(2024, 1, 1)
+
+COLLECTIONS = {
+    "blogs": blogs_collection,
+    "projects": projects_collection,
+}
+
+
+def trending_weight(count: int, now: datetime) -> float:
+    """log(count * 2^(hours since the epoch / half-life))"""
+    hours = (now - TRENDING_EPOCH).total_seconds() / 3600
+    return math.log(count) + hours / TRENDING_HALF_LIFE_HOURS * math.log(2)
+
+
+def view_update(count: int, now: datetime) -> list:
+    """Pipeline update adding count views at now to views and trending"""
+    weight = trending_weight(count, now)
+    # log(e^a + e^b) = max + log(1 + e^(min - max)), which cannot overflow
+    high = {"$max": ["$$score", weight]}
+    low = {"$min": ["$$score", weight]}
+    trending = {"$let": {
+        "vars": {"score": {"$ifNull": ["$trending", 0]}},
+        "in": {"$cond": [
+            # 0 means no views yet; real scores are positive after the epoch
+            {"$lte": ["$$score", 0]},
+            weight,
+            {"$add": [high, {"$ln": {"$add": [1, {"$exp": {"$subtract": [low, high]}}]}}]}
+        ]}
+    }}
+    return [{"$set": {
+        "views": {"$add": [{"$ifNull": ["$views", 0]}, count]},
+        "trending": trending,
+    }}]
+
+
+async def ensure_view_fields():
+    """Give documents from before view counting views=0 and trending=0 (startup)
+
+    Keyset pagination cannot step past nulls in a descending sort, so both
+    fields must always be numbers.
+    """
+    for collection in COLLECTIONS.values():
+        await collection.update_many({"views": {"$exists": False}}, {"$set": {"views": 0}})
+        await collection.update_many({"trending": {"$exists": False}}, {"$set": {"trending": 0.0}})
+
+
+class ViewCounters:
+    def __init__(self):
+        self.pending = {kind: Counter() for kind in COLLECTIONS}
+        self._task = None
+        self._flushing = asyncio.Lock()
+
+    def record(self, kind: str, doc_id: str, count: int = 1):
+        if VIEW_COUNTERS_ENABLED and doc_id:
+            self.pending[kind][doc_id] += count
+
+    async def flush(self):
+        async with self._flushing:
+            now = datetime.utcnow()
+            for kind, collection in COLLECTIONS.items():
+                counts, self.pending[kind] = self.pending[kind], Counter()
+                if not counts:
+                    continue
+                try:
+                    await collection.bulk_write([
+                        UpdateOne({"id": doc_id}, view_update(count, now))
+                        for doc_id, count in counts.items()
+                    ], ordered=False)
+                except PyMongoError as e:
+                    # Retry with the next flush; views recorded meanwhile add up
+                    self.pending[kind].update(counts)
+                    logger.warning(f"View counter flush failed for {kind}: {str(e)}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(VIEW_FLUSH_SECONDS)
+            try:
+                await self.flush()
+            except Exception as e:
+                # A failed flush must not stop the flusher
+                logger.error(f"View counter flusher failed: {str(e)}")
+
+    async def start(self):
+        if VIEW_COUNTERS_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write what is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+view_counters = ViewCounters()
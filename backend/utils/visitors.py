@@ -0,0 +1,114 @@
+"""
+Anonymous unique-visitor counting.
+
+Visitor id: the first 16 bytes of sha256(daily salt, client IP, user
+agent). The salt is random, shared by all workers through the
+analytics_salts collection and deleted by a TTL index after two days, so
+an id cannot be traced back to an IP or linked across days. Neither the
+IP nor the user agent is stored anywhere.
+
+Unique visitors: every event adds its visitor id to a HyperLogLog sketch
+for (UTC day, "*") and page views also to (day, page name). Sketches are
+buffered per worker and merged into analytics_visitors every
+VISITOR_FLUSH_SECONDS (see utils/sketch_store.py). A document holds one
+4 KB sketch, so storage grows with days x pages, never with traffic. Any
+date range is answered by merging its daily sketches. Documents written
+before the shared sketch store kept the page in "page" and the registers in
+"registers"; migrate_visitor_sketches() renames them at startup.
+"""
+from datetime import date, datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, List, Optional
+from database import analytics_salts_collection, analytics_visitors_collection
+from utils.hyperloglog import HyperLogLog
+from utils.sketch_store import DailySketches
+import hashlib
+import logging
+import os
+import secrets
+
+logger = logging.getLogger(__name__)
+
+VISITOR_FLUSH_SECONDS = float(os.environ.get("VISITOR_FLUSH_SECONDS", 10))
+# Sketches buffered between flushes; pages beyond that only count towards "*"
+MAX_TRACKED_PAGES = int(os.environ.get("VISITOR_MAX_PAGES", 200))
+
+ALL_PAGES = "*"
+
+_salts: Dict[str, bytes] = {}
+
+
+def day_key(value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+async def daily_salt(day: str) -> bytes:
+    """The day's salt, created by whichever worker asks first"""
+    salt = _salts.get(day)
+    if salt is None:
+        try:
+            doc = await analytics_salts_collection.find_one_and_update(
+                {"_id": day},
+                {"$setOnInsert": {"salt": secrets.token_hex(16), "created_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another worker created it first
+            doc = await analytics_salts_collection.find_one({"_id": day})
+        salt = bytes.fromhex(doc["salt"])
+        _salts.clear()
+        _salts[day] = salt
+    return salt
+
+
+async def visitor_id(ip: str, user_agent: str, now: Optional[datetime] = None) -> str:
+    day = day_key(now or datetime.utcnow())
+    salt = await daily_salt(day)
+    digest = hashlib.sha256(salt + ip.encode("utf-8") + b"\0" + user_agent.encode("utf-8")).digest()
+    return digest[:16].hex()
+
+
+async def migrate_visitor_sketches():
+    """Move sketches stored as page/registers to name/sketch, and drop their old index (startup)"""
+    result = await analytics_visitors_collection.update_many(
+        {"registers": {"$exists": True}},
+        {"$rename": {"page": "name", "registers": "sketch"}}
+    )
+    if result.modified_count:
+        logger.info(f"Migrated {result.modified_count} visitor sketches to the shared sketch layout")
+    if "page_1_day_1" in await analytics_visitors_collection.index_information():
+        await analytics_visitors_collection.drop_index("page_1_day_1")
+
+
+visitor_sketches = DailySketches(
+    analytics_visitors_collection, HyperLogLog, HyperLogLog.from_stored, VISITOR_FLUSH_SECONDS, MAX_TRACKED_PAGES
+)
+
+
+def add_visitor(visitor: str, page: Optional[str] = None, now: Optional[datetime] = None):
+    """Count visitor towards the day and, if given, the page"""
+    day = day_key(now or datetime.utcnow())
+    value = int(visitor[:16], 16)
+    for name in (ALL_PAGES, page[:100] if page else None):
+        sketch = visitor_sketches.get(day, name) if name else None
+        if sketch is not None:
+            sketch.add_hash(value)
+
+
+async def unique_visitors(start: date, end: date, pages: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    {page: {"unique_visitors": n, "days": {day: n}}} for "*" and the given
+    pages (every page with a sketch when pages is None), from start to end
+    inclusive.
+    """
+    names = None if pages is None else [ALL_PAGES] + list(pages)
+    by_page = await visitor_sketches.load(day_key(start), day_key(end), names)
+    return {
+        page: {
+            "unique_visitors": HyperLogLog.union(days.values()).count(),
+            "days": {day: sketch.count() for day, sketch in sorted(days.items())},
+        }
+        for page, days in by_page.items()
+    }
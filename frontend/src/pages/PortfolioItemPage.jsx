@@ -22,6 +22,7 @@ import {
 } from 'lucide-react';
 import projectService from '../services/projectService';
 import settingsService from '../services/settingsService';
+import { trackProjectView } from '../services/analytics';
 import { Button } from '../components/ui/button';
 import { Card } from '../components/ui/card';
 import ImageGallery from '../components/portfolio/ImageGallery';
@@ -75,6 +76,9 @@ const PortfolioItemPage = () => {
           };
           setProject(transformedProject);
           
+          // Track project view
+          trackProjectView(currentProject.id);
+          
           // Find related projects (same category, excluding current)
           const related = allProjects
             .filter(p => p.category === currentProject.category && p.id !== currentProject.id)
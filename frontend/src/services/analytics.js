@@ -3,6 +3,34 @@ import { getBackendURL } from '../lib/utils';
 
 const API_URL = getBackendURL();
 
+const LANDING_KEY = 'analytics_landing_sent';
+const UTM_PARAMS = ['utm_source', 'utm_medium', 'utm_campaign'];
+
+/**
+ * Referrer and UTM parameters, sent once per visit (with its first event)
+ */
+const landingData = () => {
+  try {
+    if (sessionStorage.getItem(LANDING_KEY)) {
+      return {};
+    }
+    sessionStorage.setItem(LANDING_KEY, '1');
+    const params = new URLSearchParams(window.location.search);
+    const data = {};
+    if (document.referrer) {
+      data.referrer = document.referrer;
+    }
+    UTM_PARAMS.forEach((param) => {
+      if (params.get(param)) {
+        data[param] = params.get(param);
+      }
+    });
+    return data;
+  } catch (error) {
+    return {};
+  }
+};
+
 /**
  * Track analytics event - fails silently to not block user actions
  */
@@ -11,6 +39,7 @@ const trackEvent = async (eventType, data = {}) => {
     // Non-blocking async call
     await axios.post(`${API_URL}/analytics/event`, {
       event_type: eventType,
+      ...landingData(),
       ...data
     }, {
       timeout: 2000 // 2 second timeout
@@ -59,6 +88,15 @@ export const trackBlogView = (blogId, blogTitle) => {
   });
 };
 
+/**
+ * Track portfolio project view
+ */
+export const trackProjectView = (projectId) => {
+  trackEvent('project_view', {
+    project_id: projectId
+  });
+};
+
 /**
  * Get analytics summary (admin only)
  */
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+MongoDB round trips per request
+
+Runs the app in-process against a throwaway database, counts the MongoDB
+commands each handler sends and fails when one goes over its budget, so
+find -> update -> find sequences don't creep back into handlers that were
+reduced to a single find_one_and_update / upsert. Also checks that
+concurrent first requests (newsletter signup, chat message) create exactly
+one document, which the unique indexes guarantee.
+
+Needs a MongoDB server (not a running backend):
+    MONGODB_URI=mongodb://localhost:27017 python tests/backend/mongo_round_trips_test.py
+The database (--db-name, default mspn_round_trips_test) is dropped before
+and after the run.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from pymongo import monitoring
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Commands that are connection housekeeping rather than handler round trips
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "buildInfo", "saslStart", "saslContinue"}
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Records every command sent by clients created after registration"""
+
+    def __init__(self):
+        self.commands = []
+
+    def reset(self):
+        self.commands = []
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        if not isinstance(target, str):
+            target = event.command.get("collection", "")
+        self.commands.append(f"{event.command_name}:{target}")
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class RoundTripTester:
+    def __init__(self, client, counter, db):
+        self.client = client
+        self.counter = counter
+        self.db = db
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.failed_tests = []
+
+    def log_result(self, test_name, success, error=None):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {test_name} - PASSED")
+        else:
+            self.failed_tests.append({"test": test_name, "error": error})
+            print(f"❌ {test_name} - FAILED: {error}")
+
+    async def run_test(self, name, method, endpoint, budget, expected_status=200, data=None):
+        """Send one request and check its status and MongoDB command count"""
+        self.counter.reset()
+        response = await self.client.request(method, f"/api/{endpoint.lstrip('/')}", json=data)
+        commands = list(self.counter.commands)
+
+        if response.status_code != expected_status:
+            self.log_result(name, False, f"expected {expected_status}, got {response.status_code}: {response.text[:200]}")
+        elif len(commands) > budget:
+            self.log_result(name, False, f"{len(commands)} MongoDB commands, budget {budget}: {commands}")
+        else:
+            self.log_result(f"{name} ({len(commands)} command{'s' if len(commands) != 1 else ''})", True)
+        return response
+
+    def check(self, name, condition, error):
+        self.log_result(name, bool(condition), None if condition else error)
+
+    async def test_contacts(self):
+        created = await self.client.post("/api/contacts/", json={
+            "name": "Round Trip", "email": "round.trip@example.com", "message": "Hello"
+        })
+        contact_id = created.json()["id"]
+
+        response = await self.run_test("Mark contact read", "PATCH", f"/contacts/{contact_id}/read", 1, data={"read": True})
+        self.check("Mark contact read returns the updated contact", response.json().get("read") is True, response.text)
+
+        response = await self.run_test("Update contact", "PUT", f"/contacts/{contact_id}", 1, data={
+            "name": "Round Trip", "email": "round.trip@example.com", "message": "Updated"
+        })
+        self.check("Update contact returns the updated contact", response.json().get("message") == "Updated", response.text)
+
+        await self.run_test("Mark missing contact read", "PATCH", f"/contacts/{uuid.uuid4()}/read", 1,
+                            expected_status=404, data={"read": True})
+
+    async def test_bookings(self):
+        booking_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        await self.db.bookings.insert_one({
+            "id": booking_id, "name": "Round Trip", "email": "round.trip@example.com", "phone": "1234567890",
+            "preferred_date": "2030-01-07", "preferred_time_slot": "10:00 AM", "message": None,
+            "status": "pending", "meeting_type": "google_meet", "meeting_link": None,
+            "created_at": now, "updated_at": now, "confirmed_at": None, "cancelled_at": None, "admin_notes": None
+        })
+
+        response = await self.run_test("Confirm booking", "PUT", f"/bookings/admin/{booking_id}", 1,
+                                       data={"status": "confirmed", "admin_notes": "$50 deposit"})
+        first = response.json()
+        self.check("Confirmed booking is stamped and notes kept literally",
+                   first.get("confirmed_at") and first.get("admin_notes") == "$50 deposit", response.text)
+
+        response = await self.run_test("Confirm booking again", "PUT", f"/bookings/admin/{booking_id}", 1,
+                                       data={"status": "confirmed"})
+        self.check("confirmed_at is only stamped once",
+                   response.json().get("confirmed_at") == first.get("confirmed_at"), response.text)
+
+        await self.run_test("Update missing booking", "PUT", f"/bookings/admin/{uuid.uuid4()}", 1,
+                            expected_status=404, data={"status": "cancelled"})
+
+    async def test_settings_and_content(self):
+        response = await self.run_test("Create settings", "PUT", "/settings/", 1, data={"agency_name": "Round Trip"})
+        self.check("Created settings get defaults", response.json().get("owner_name") == "Admin", response.text)
+        response = await self.run_test("Update settings", "PUT", "/settings/", 1, data={"tagline": "Fewer round trips"})
+        body = response.json()
+        self.check("Updated settings keep earlier fields",
+                   body.get("agency_name") == "Round Trip" and body.get("tagline") == "Fewer round trips", response.text)
+
+        await self.run_test("Get content (creates defaults)", "GET", "/content/", 2)
+        await self.run_test("Get content", "GET", "/content/", 1)
+        response = await self.run_test("Update content", "PUT", "/content/", 1, data={"hero_headline": "Round Trip"})
+        self.check("Updated content returned", response.json().get("hero_headline") == "Round Trip", response.text)
+
+    async def test_newsletter(self):
+        email = "subscriber@example.com"
+        response = await self.run_test("Subscribe", "POST", "/newsletter/subscribe", 1, data={"email": email})
+        self.check("New subscriber", response.json().get("status") == "subscribed", response.text)
+        response = await self.run_test("Subscribe again", "POST", "/newsletter/subscribe", 1, data={"email": email})
+        self.check("Already subscribed", response.json().get("status") == "already_subscribed", response.text)
+
+        await self.db.newsletter.update_one({"email": email}, {"$set": {"status": "unsubscribed"}})
+        response = await self.run_test("Resubscribe", "POST", "/newsletter/subscribe", 1, data={"email": email})
+        self.check("Resubscribed", response.json().get("status") == "resubscribed", response.text)
+
+        email = "concurrent@example.com"
+        await asyncio.gather(*(
+            self.client.post("/api/newsletter/subscribe", json={"email": email}) for _ in range(5)
+        ))
+        count = await self.db.newsletter.count_documents({"email": email})
+        self.check("Concurrent subscribes create one subscriber", count == 1, f"{count} documents")
+
+    async def test_chat(self):
+        message = {"customer_name": "Round Trip", "customer_email": "chat@example.com", "message": "Hi"}
+        response = await self.run_test("Start conversation", "POST", "/chat/messages", 1, data=message)
+        conversation_id = response.json()["id"]
+        response = await self.run_test("Add message", "POST", "/chat/messages", 1, data=message)
+        self.check("Message added to the same conversation", response.json().get("id") == conversation_id, response.text)
+
+        response = await self.run_test("Admin reply", "POST", f"/chat/conversations/{conversation_id}/reply", 1,
+                                       data={"message": "Hello"})
+        messages = response.json()["conversation"]["messages"]
+        self.check("Reply returns the updated conversation", len(messages) == 3, response.text)
+
+        await self.run_test("Reply to missing conversation", "POST", f"/chat/conversations/{uuid.uuid4()}/reply", 1,
+                            expected_status=404, data={"message": "Hello"})
+
+        message = {**message, "customer_email": "concurrent.chat@example.com"}
+        await asyncio.gather(*(self.client.post("/api/chat/messages", json=message) for _ in range(5)))
+        conversation = await self.db.conversations.find_one({"customer_email": message["customer_email"]})
+        count = await self.db.conversations.count_documents({"customer_email": message["customer_email"]})
+        self.check("Concurrent first messages share one conversation",
+                   count == 1 and len(conversation["messages"]) == 5 and conversation["unread_count"] == 5,
+                   f"{count} conversations")
+
+    async def run_all_tests(self):
+        print("🚀 Counting MongoDB commands per request")
+        print("=" * 60)
+        await self.test_contacts()
+        await self.test_bookings()
+        await self.test_settings_and_content()
+        await self.test_newsletter()
+        await self.test_chat()
+
+        print("\n" + "=" * 60)
+        print(f"📊 Tests passed: {self.tests_passed}/{self.tests_run}")
+        for failed in self.failed_tests:
+            print(f"   ❌ {failed['test']}: {failed['error']}")
+        return not self.failed_tests
+
+
+async def run(db_name):
+    counter = CommandCounter()
+    # Applies to every client created from here on, including database.py's
+    monitoring.register(counter)
+
+    import httpx
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from auth.admin_auth import get_current_admin
+    from server import app
+
+    # Admin auth is not what is being measured
+    app.dependency_overrides[get_current_admin] = lambda: {
+        "id": "round-trips", "username": "round-trips", "role": "super_admin", "permissions": {}
+    }
+
+    mongo = AsyncIOMotorClient(os.environ["MONGODB_URI"])
+    await mongo.drop_database(db_name)
+    for handler in app.router.on_startup:
+        await handler()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://round-trips") as client:
+            return await RoundTripTester(client, counter, mongo[db_name]).run_all_tests()
+    finally:
+        for handler in app.router.on_shutdown:
+            await handler()
+        await mongo.drop_database(db_name)
+        mongo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=os.environ.get("MONGODB_URI"))
+    parser.add_argument("--db-name", default="mspn_round_trips_test", help="dropped before and after the run")
+    args = parser.parse_args()
+    if not args.mongo_uri:
+        sys.exit("Set MONGODB_URI or pass --mongo-uri")
+
+    # Must be in place before the app (and database.py) is imported
+    os.environ.update({
+        "MONGODB_URI": args.mongo_uri,
+        "DB_NAME": args.db_name,
+        "RATE_LIMIT_ENABLED": "false",
+        "BREVO_API_KEY": "",
+        "LOOP_MONITOR_ENABLED": "false",
+        "PROFILING_ENABLED": "false",
+        "SLOW_QUERY_LOG_ENABLED": "false",
+        "TRACING_ENABLED": "false",
+    })
+
+    return 0 if asyncio.run(run(args.db_name)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination over optional sort fields
+
+Pages through a collection where most documents have the sort field null
+or missing, in every direction and page size, and checks that the pages
+together return each document exactly once and in the order a single
+sorted find() returns them. MongoDB sorts nulls first ascending and last
+descending, range operators never match null or cross types, and legacy
+ISO-string dates sort apart from native ones, so this is where a keyset
+filter loses documents.
+
+Needs a MongoDB server (not a running backend):
+    MONGODB_URI=mongodb://localhost:27017 python tests/backend/pagination_test.py
+The database (--db-name, default mspn_pagination_test) is dropped before
+and after the run.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+SORTS = [
+    "company", "-company", "-company,name", "company,-name", "-rating", "rating,-company",
+    "-created_at", "created_at", "-created_at,name"
+]
+PAGE_SIZES = [1, 2, 3, 7]
+
+
+def documents():
+    """
+    Ten clients, half without a company (null or missing), with repeated
+    values, and created_at as a native date, a legacy ISO string or missing
+    """
+    docs = []
+    for i in range(10):
+        doc = {"id": f"client-{i:02d}", "name": f"Client {i % 3}"}
+        if i % 2 == 0:
+            doc["company"] = f"Company {i % 4}"
+        elif i % 4 == 1:
+            doc["company"] = None
+        if i % 3 == 0:
+            doc["rating"] = i % 5
+        if i % 3 == 1:
+            doc["created_at"] = datetime(2025, 1, 1 + i % 4)
+        elif i % 3 == 2:
+            doc["created_at"] = f"2024-06-{1 + i % 2:02d}T00:00:00"
+        docs.append(doc)
+    return docs
+
+
+class PaginationTester:
+    def __init__(self, collection):
+        self.collection = collection
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.failed_tests = []
+
+    def log_result(self, test_name, success, error=None):
+        """Log test results"""
+        self.tests_run += 1
+        if success:
+            self.tests_passed += 1
+            print(f"✅ {test_name} - PASSED")
+        else:
+            self.failed_tests.append({"test": test_name, "error": error})
+            print(f"❌ {test_name} - FAILED: {error}")
+
+    async def page_through(self, sort_spec, limit):
+        from utils.pagination import PageRequest
+
+        sort = [(part.lstrip("-"), -1 if part.startswith("-") else 1) for part in sort_spec.split(",")]
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = PageRequest(None, sort, sort_spec, limit, cursor, None, False, "id", {})
+            docs = await page.fetch(self.collection, {})
+            ids.extend(doc["id"] for doc in docs)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None or pages > 100:
+                return ids, page.sort
+
+    async def run_all_tests(self):
+        await self.collection.insert_many(documents())
+        for sort_spec in SORTS:
+            for limit in PAGE_SIZES:
+                ids, sort = await self.page_through(sort_spec, limit)
+                expected = [doc["id"] async for doc in self.collection.find({}, {"id": 1}).sort(sort)]
+                self.log_result(
+                    f"sort={sort_spec} limit={limit}",
+                    ids == expected,
+                    f"got {ids}, expected {expected}"
+                )
+
+        print(f"📊 Tests passed: {self.tests_passed}/{self.tests_run}")
+        for failed in self.failed_tests:
+            print(f"   ❌ {failed['test']}: {failed['error']}")
+        return not self.failed_tests
+
+
+async def run(db_name):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    mongo = AsyncIOMotorClient(os.environ["MONGODB_URI"])
+    await mongo.drop_database(db_name)
+    try:
+        return await PaginationTester(mongo[db_name].clients).run_all_tests()
+    finally:
+        await mongo.drop_database(db_name)
+        mongo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-uri", default=os.environ.get("MONGODB_URI"))
+    parser.add_argument("--db-name", default="mspn_pagination_test", help="dropped before and after the run")
+    args = parser.parse_args()
+    if not args.mongo_uri:
+        sys.exit("Set MONGODB_URI or pass --mongo-uri")
+
+    os.environ.update({"MONGODB_URI": args.mongo_uri, "DB_NAME": args.db_name})
+    return 0 if asyncio.run(run(args.db_name)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())